@@ -0,0 +1,117 @@
+# benchmarks/bench_auth_rps.py
+# 로컬 DB에 붙은 서버를 대상으로 인증 API(login / refresh / logout) 처리량 측정
+#
+# 1) 서버 실행:  uvicorn main:app --port 8000
+# 2) 측정:      python -m benchmarks.bench_auth_rps --base-url http://127.0.0.1:8000
+#
+# 워커마다 자기 계정을 하나씩 만들어서 (같은 계정의 토큰끼리 경합하지 않도록)
+# refresh 는 계속 회전시키고, login/logout 은 그 사이사이 섞어서 호출한다.
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+async def ensure_account(client: httpx.AsyncClient, email: str, password: str) -> None:
+    resp = await client.post("/auth/register", json={
+        "site_type": "bench",
+        "site_name": "bench",
+        "site_url": "https://bench.example.com",
+        "site_tz": "Asia/Seoul",
+        "first_name": "bench",
+        "last_name": "user",
+        "email": email,
+        "password": password,
+        "agree_privacy": True,
+    })
+    if resp.status_code not in (201, 400):   # 400 = 이미 가입됨
+        resp.raise_for_status()
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    email: str,
+    password: str,
+    deadline: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+    refreshes_per_login: int,
+) -> None:
+    async def call(op: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        resp = await client.request(method, url, **kwargs)
+        latencies[op].append((time.perf_counter() - started) * 1000)
+        if resp.status_code >= 400:
+            errors[op] += 1
+            return None
+        return resp.json()
+
+    while time.perf_counter() < deadline:
+        tokens = await call("login", "POST", "/auth/login", json={"email": email, "password": password})
+        if tokens is None:
+            continue
+
+        for _ in range(refreshes_per_login):
+            new_tokens = await call("refresh", "POST", "/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+            if new_tokens is None:
+                break
+            tokens = new_tokens
+
+        await call(
+            "logout", "POST", "/auth/logout",
+            json={"refresh_token": tokens["refresh_token"]},
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+
+
+def summarize(op: str, values: list[float], errors: int, seconds: float) -> str:
+    if not values:
+        return f"{op:8s} no requests"
+    values = sorted(values)
+    p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+    return (
+        f"{op:8s} {len(values) / seconds:8.1f} req/s  "
+        f"p50 {statistics.median(values):7.2f} ms  p99 {p99:7.2f} ms  errors {errors}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--refreshes-per-login", type=int, default=10)
+    args = parser.parse_args()
+
+    password = "bench-password-1"
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"bench-{run_id}-{i}@example.com" for i in range(args.concurrency)]
+
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        for email in emails:
+            await ensure_account(client, email, password)
+
+        latencies = {"login": [], "refresh": [], "logout": []}
+        errors = {"login": 0, "refresh": 0, "logout": 0}
+
+        started = time.perf_counter()
+        deadline = started + args.seconds
+        await asyncio.gather(*(
+            worker(client, email, password, deadline, latencies, errors, args.refreshes_per_login)
+            for email in emails
+        ))
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{total / elapsed:.1f} auth req/s total over {elapsed:.1f}s, concurrency {args.concurrency}")
+    for op in ("login", "refresh", "logout"):
+        print(summarize(op, latencies[op], errors[op], elapsed))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+# benchmarks/bench_columnar.py
+# 대시보드 집계 지연 비교: SQL(롤업 또는 원본 테이블) vs 인메모리 컬럼 엔진
+#
+# 실행: python -m benchmarks.bench_columnar --customer-id 1 [--repeat 20]
+# .env의 DATABASE_URL(MySQL)에 붙어서 해당 customer의 사이트 범위로 같은 집계를 반복 실행한다.
+# 캐시를 거치지 않도록 repository 함수를 직접 호출하고, 두 엔진 결과가 같은지도 확인한다.
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+
+from config.settings import settings
+from database.session import async_session, engine
+from repositories.dashboard import columnar_repository
+from repositories.dashboard import dashboard_repository as repo
+from services.dashboard.dashboard_service import month_range, sql_sales_repo
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, int(len(values) * pct / 100))
+    return values[index]
+
+
+def workload(site_ids):
+    """대시보드 첫 화면과 같은 집계 묶음: (이름, source -> 코루틴 팩토리)"""
+    today = date.today()
+    from_d = today - timedelta(days=29)
+    prev_from_d = from_d - timedelta(days=30)
+    months = month_range(12)
+
+    return [
+        ("kpi", lambda db, s: s.fetch_kpi_summary(db, site_ids, from_d, today, prev_from_d)),
+        ("monthly", lambda db, s: s.fetch_monthly_sales(db, site_ids, months[0], months[-1])),
+        ("top_products", lambda db, s: s.fetch_top_products(db, site_ids, 10, from_d, today, None)),
+        ("device_share", lambda db, s: s.fetch_device_share(db, site_ids, "amount")),
+        ("by_category", lambda db, s: s.fetch_orders_by_category(db, site_ids, "amount")),
+    ]
+
+
+def normalize(rows):
+    """SQL(Decimal/Row)과 columnar(int/dict) 결과를 비교할 수 있게 맞춘다."""
+    if hasattr(rows, "keys"):
+        rows = [rows]
+    return [
+        {k: (int(v) if hasattr(v, "as_integer_ratio") and not isinstance(v, bool) else v)
+         for k, v in dict(r).items()}
+        for r in rows
+    ]
+
+
+async def measure(source, name: str, factory, repeat: int) -> tuple[dict, object]:
+    latencies = []
+    result = None
+    for _ in range(repeat):
+        async with async_session() as db:
+            started = time.perf_counter()
+            result = await factory(db, source)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "query": name,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+    }, result
+
+
+async def run(customer_id: int, repeat: int) -> None:
+    # 적재 시간만 따로 재고, 측정 중에는 증분 갱신이 끼어들지 않게 한다
+    settings.DASHBOARD_COLUMNAR_REFRESH_SECONDS = 3600
+    engine.echo = False
+
+    async with async_session() as db:
+        site_ids = tuple(await repo.fetch_customer_site_ids(db, customer_id))
+        started = time.perf_counter()
+        store = await columnar_repository.refresh_store(db, site_ids)
+        load_ms = (time.perf_counter() - started) * 1000
+
+    if store is None:
+        print({"error": "columnar store unavailable (numpy missing or tenant too large)"})
+        return
+    print({"sites": site_ids, "rows": len(store), "load_ms": round(load_ms, 1), "bytes": store.nbytes})
+
+    sql = sql_sales_repo()
+    for name, factory in workload(site_ids):
+        sql_stats, sql_rows = await measure(sql, name, factory, repeat)
+        col_stats, col_rows = await measure(columnar_repository, name, factory, repeat)
+        print({
+            **sql_stats,
+            "engine": sql.__name__.rsplit(".", 1)[-1],
+            "columnar_p50_ms": col_stats["p50_ms"],
+            "columnar_p95_ms": col_stats["p95_ms"],
+            "same_result": normalize(sql_rows) == normalize(col_rows),
+        })
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customer-id", type=int, required=True)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.customer_id, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
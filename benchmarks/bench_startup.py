@@ -0,0 +1,85 @@
+# benchmarks/bench_startup.py
+# 워커 시작 시간: 새 프로세스에서 (import main -> create_app -> lifespan 시작)까지 단계별 소요 시간
+#
+# 실행: python -m benchmarks.bench_startup [--repeat 5] [--groups auth,dashboard] [--no-lifespan] [--top 15]
+# 매번 새 인터프리터를 띄워서 import 캐시 없이 잰다. --no-lifespan이면 DB 없이 import/create_app만.
+# 마지막 실행은 -X importtime으로 돌려서 누적 시간이 큰 모듈 상위 --top개를 같이 출력한다.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+app = main.create_app()
+t2 = time.perf_counter()
+result = {"import_ms": (t1 - t0) * 1000, "create_app_ms": (t2 - t1) * 1000}
+if sys.argv[1] == "1":
+    async def run():
+        async with app.router.lifespan_context(app):
+            result["lifespan_ms"] = (time.perf_counter() - t2) * 1000
+            result["startup"] = app.state.startup
+    asyncio.run(run())
+result["total_ms"] = (time.perf_counter() - t0) * 1000
+print(json.dumps(result, default=str))
+"""
+
+
+def run_probe(args, importtime: bool = False):
+    env = dict(os.environ)
+    if args.groups:
+        env["APP_ROUTER_GROUPS"] = json.dumps(args.groups.split(","))
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", PROBE, "0" if args.no_lifespan else "1"]
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def top_imports(stderr: str, top: int) -> list[tuple[str, float]]:
+    # "import time: self [us] | cumulative | imported package"
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        rows.append((name.strip(), int(cumulative_us) / 1000))
+    rows.sort(key=lambda r: r[1], reverse=True)
+    return rows[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--groups", default="", help="APP_ROUTER_GROUPS (쉼표 구분). 비우면 설정값")
+    parser.add_argument("--no-lifespan", action="store_true")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [run_probe(args)[0] for _ in range(args.repeat)]
+    summary = {
+        key: {
+            "median": round(statistics.median(r[key] for r in runs), 1),
+            "max": round(max(r[key] for r in runs), 1),
+        }
+        for key in ("import_ms", "create_app_ms", "lifespan_ms", "total_ms")
+        if key in runs[0]
+    }
+    summary["last_startup"] = runs[-1].get("startup")
+    print(json.dumps(summary, indent=2, default=str))
+
+    _, stderr = run_probe(args, importtime=True)
+    print(f"\ntop {args.top} imports by cumulative ms:")
+    for name, ms in top_imports(stderr, args.top):
+        print(f"  {ms:8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,32 @@
 # config/settings.py
 
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 from fastapi.middleware.cors import CORSMiddleware
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_ECHO: bool = False                    # True면 모든 SQL을 stdout에 출력 (디버깅용, 느려짐)
+
+    # 커넥션 풀: 배포 환경별 프로필(POOL_PROFILES) + 개별 값 덮어쓰기 (None이면 프로필 값)
+    DATABASE_POOL_PROFILE: str = "default"         # small / default / high
+    DATABASE_POOL_SIZE: Optional[int] = None
+    DATABASE_MAX_OVERFLOW: Optional[int] = None
+    DATABASE_POOL_TIMEOUT: Optional[float] = None      # 커넥션을 기다리는 최대 시간 (초)
+    DATABASE_POOL_RECYCLE: Optional[int] = None        # 이보다 오래된 커넥션은 다시 연결 (MySQL wait_timeout보다 짧게)
+    DATABASE_POOL_PRE_PING: Optional[str] = None       # always / idle / never
+    DATABASE_POOL_PRE_PING_IDLE_SECONDS: float = 30    # idle 전략: 이만큼 놀던 커넥션만 체크아웃 때 ping
+    DATABASE_POOL_PREWARM: Optional[int] = None        # 시작 시 미리 열어둘 커넥션 수
+
+    # 읽기 전용 replica (대시보드 조회용). 비어 있으면 전부 primary
+    DATABASE_REPLICA_URLS: list[str] = []          # .env에는 JSON 배열로: ["mysql+aiomysql://...", ...]
+    DATABASE_REPLICA_STRATEGY: str = "round_robin"   # round_robin / least_busy
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5      # 복제 지연이 이보다 크면 그 replica는 건너뜀
+    DATABASE_REPLICA_CHECK_INTERVAL_SECONDS: float = 5
+    DATABASE_REPLICA_ALLOW_UNKNOWN_LAG: bool = False  # 복제 상태를 알 수 없는 replica(조회 권한 없음, 복제 정보 없는 프록시 등)도 지연 확인 없이 사용
+    DATABASE_REPLICA_ROUTE_TAGS: list[str] = ["dashboard"]   # 이 태그의 라우트만 replica로 (읽기 전용 라우트)
 
     # JWT 설정
     JWT_SECRET_KEY: str = "change_me_secret"
@@ -13,6 +34,91 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30     # Access 30분
     REFRESH_TOKEN_EXPIRE_DAYS: int = 14       # Refresh 14일
 
+    # 만료된 refresh token 정리
+    REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS: int = 3600
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 1000       # DELETE 한 번에 지우는 최대 행 수
+    REFRESH_TOKEN_SWEEP_PAUSE_SECONDS: float = 0.1   # 배치 사이 쉬는 시간
+
+    # 검증된 access token 캐시
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300        # 토큰 exp보다 늦게 만료되지는 않음
+
+    # 비밀번호 해싱(bcrypt) 워커 풀
+    PASSWORD_HASH_EXECUTOR: str = "thread"    # thread | process
+    PASSWORD_HASH_WORKERS: int = 4            # 동시에 실행할 bcrypt 작업 수
+    PASSWORD_HASH_MAX_QUEUE: int = 200        # 이보다 많이 대기 중이면 503
+
+    # 대시보드 롤업 설정
+    DASHBOARD_USE_ROLLUP: bool = True              # False면 원본 order_products 직접 집계
+    ROLLUP_REFRESH_INTERVAL_SECONDS: int = 60      # 증분 갱신 주기
+    ROLLUP_REFRESH_BATCH_SIZE: int = 50000         # 한 트랜잭션에서 처리할 order_products 행 수
+    ROLLUP_SETTLE_SECONDS: float = 60              # 새 id는 이만큼 지난 뒤 반영 (늦게 커밋되는 작은 id 대기, 적재 트랜잭션보다 길게)
+
+    # 대시보드 인메모리 컬럼 엔진 (numpy 필요)
+    DASHBOARD_ENGINE: str = "sql"                  # sql | columnar (columnar여도 큰 테넌트는 SQL로 집계)
+    DASHBOARD_COLUMNAR_MAX_ROWS: int = 5_000_000   # 테넌트 order_products가 이보다 많으면 메모리에 올리지 않음
+    DASHBOARD_COLUMNAR_MAX_TENANTS: int = 50       # 메모리에 올려둘 테넌트 수 (LRU)
+    DASHBOARD_COLUMNAR_REFRESH_SECONDS: float = 30  # 증분 갱신 간격
+
+    # customer -> site_id 목록 캐시
+    TENANT_SITE_CACHE_TTL_SECONDS: int = 300
+    TENANT_SITE_CACHE_MAX_CUSTOMERS: int = 10000
+
+    # 운영용 통계 엔드포인트(/dashboard/cache/stats, /events/stats)를 볼 수 있는 customer
+    ADMIN_CUSTOMER_IDS: list[int] = []
+
+    # 대시보드 번들(/dashboard/bundle) 동시 실행 위젯 수 (커넥션 풀 크기보다 작게)
+    DASHBOARD_BUNDLE_CONCURRENCY: int = 4
+
+    # 대시보드 응답 캐시
+    DASHBOARD_CACHE_ENABLED: bool = True
+    DASHBOARD_CACHE_BACKEND: str = "memory"          # 현재는 memory만 지원
+    DASHBOARD_CACHE_TTL_SECONDS: int = 300
+    DASHBOARD_CACHE_MAX_ENTRIES_PER_TENANT: int = 256   # 테넌트별 LRU 크기 (다른 테넌트 항목을 밀어내지 않음)
+    DASHBOARD_CACHE_MAX_TENANTS: int = 1000
+    DASHBOARD_CACHE_WATERMARK_TTL_SECONDS: float = 5  # 워터마크 재조회 간격
+    DASHBOARD_SINGLEFLIGHT_ENABLED: bool = True       # 동일 파라미터 동시 조회 합치기
+    DASHBOARD_CACHE_SWR_ENABLED: bool = True          # 만료된 값을 먼저 내주고 백그라운드에서 갱신
+    DASHBOARD_CACHE_STALE_TTL_SECONDS: int = 3600     # stale로 내줄 수 있는 최대 나이
+
+    # 대시보드 DB 서킷 브레이커
+    DASHBOARD_DB_TIMEOUT_SECONDS: float = 5
+    DASHBOARD_BREAKER_FAILURE_THRESHOLD: int = 5      # 연속 실패 횟수
+    DASHBOARD_BREAKER_SLOW_CALL_SECONDS: float = 2    # 이보다 느리면 실패로 셈
+    DASHBOARD_BREAKER_OPEN_SECONDS: float = 30
+
+    # 이벤트 수집 버퍼 (/api/v1/events)
+    EVENT_BUFFER_FLUSH_ROWS: int = 1000                # 키가 이만큼 쌓이면 바로 flush (upsert 한 번의 행 수)
+    EVENT_BUFFER_FLUSH_INTERVAL_SECONDS: float = 1.0
+    EVENT_BUFFER_MAX_PENDING: int = 100000             # 대기 중인 키가 이보다 많으면 503
+    EVENT_BUFFER_DRAIN_TIMEOUT_SECONDS: float = 10     # 종료 시 남은 이벤트를 쓰는 데 기다리는 최대 시간
+    EVENT_INGEST_KEY_CACHE_TTL_SECONDS: float = 60     # 수집 키 -> site_id 캐시 (키를 재발급하면 이전 키는 최대 이만큼 더 통과)
+    EVENT_INGEST_KEY_CACHE_MAX: int = 10000
+    EVENT_DAY_MAX_PAST_DAYS: int = 2                   # event_day 허용 범위 (오늘 기준, 태그 재전송/시간대 차이만큼)
+    EVENT_DAY_MAX_FUTURE_DAYS: int = 1
+
+    # 주문 대량 적재 (/api/v1/imports, scripts.import_orders)
+    IMPORT_CHUNK_ROWS: int = 5000                  # INSERT 한 번 + commit 한 번에 넣는 행 수
+    IMPORT_REJECTS_DIR: str = "import_rejects"     # 거부된 행을 {import_id}.ndjson으로 남기는 곳
+    IMPORT_MAX_REJECTED_ROWS: int = 10000          # 이보다 많이 거부되면 중단 (파일 형식이 잘못된 경우)
+
+    # 느린 쿼리 로그 (logger "slow_query", 한 줄에 JSON 하나)
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200           # 이보다 오래 걸린 쿼리는 항상 기록
+    SLOW_QUERY_SAMPLE_RATE: float = 0.001          # 나머지 쿼리 중 무작위로 기록할 비율 (기준선 비교용, INFO 레벨)
+    SLOW_QUERY_EXPLAIN_ENABLED: bool = True        # 대시보드 쿼리는 백그라운드로 EXPLAIN 해서 실행 계획도 남김
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 3600   # 같은 쿼리(형태)는 이 주기에 한 번만 EXPLAIN
+
+    # 앱 시작 (main.create_app)
+    APP_ROUTER_GROUPS: list[str] = ["auth", "dashboard", "tracking", "imports", "monitoring"]   # 워커 역할별로 필요한 것만
+    APP_WARMUP_ENABLED: bool = True                # 시작 시 쿼리 컴파일 캐시 / 인증 스택 준비
+    APP_WARMUP_TIMEOUT_SECONDS: float = 20         # 준비 작업이 이보다 길면 포기하고 시작
+    APP_WARMUP_AUTH: bool = True
+    APP_WARMUP_PRIME_CUSTOMER_IDS: list[int] = []  # 기본 대시보드를 미리 캐시에 올릴 customer
+
+    # 대시보드 테이블 내보내기 (/api/v1/exports)
+    EXPORT_CHUNK_ROWS: int = 2000                  # 서버 사이드 커서에서 한 번에 받아서 응답 청크 하나로 보내는 행 수
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -20,6 +126,39 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
+# 배포 환경별 커넥션 풀 기본값
+POOL_PROFILES = {
+    # 로컬 / 테스트: 커넥션 적게, 항상 ping
+    "small": {
+        "pool_size": 2, "max_overflow": 3, "pool_timeout": 10,
+        "pool_recycle": 1800, "pre_ping": "always", "prewarm": 0,
+    },
+    "default": {
+        "pool_size": 10, "max_overflow": 10, "pool_timeout": 10,
+        "pool_recycle": 1800, "pre_ping": "idle", "prewarm": 5,
+    },
+    # 트래픽 많은 워커: 풀을 크게 잡고 빨리 실패 (대기가 길어지면 503이 낫다)
+    "high": {
+        "pool_size": 30, "max_overflow": 20, "pool_timeout": 5,
+        "pool_recycle": 900, "pre_ping": "idle", "prewarm": 20,
+    },
+}
+
+
+def pool_options() -> dict:
+    """선택한 프로필에 DATABASE_POOL_* 개별 설정을 덮어쓴 풀 옵션"""
+    options = dict(POOL_PROFILES[settings.DATABASE_POOL_PROFILE])
+    overrides = {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "prewarm": settings.DATABASE_POOL_PREWARM,
+    }
+    options.update({k: v for k, v in overrides.items() if v is not None})
+    return options
+
 # 프론트 도메인들
 # 개발 중이면 일단 * 로 다 열어도 됨
 CORS_ORIGINS = [
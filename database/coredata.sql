@@ -25,6 +25,7 @@ CREATE TABLE pages (
   site_name     VARCHAR(50)  NULL,
   site_category VARCHAR(50)  NULL,
   site_tz       VARCHAR(50)  NULL,
+  ingest_key_hash BINARY(32) NULL UNIQUE, --sha256(이벤트 수집 키 원문), 원문은 저장하지 않음
   CONSTRAINT pages_ibfk_1
   FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
 )
@@ -47,6 +48,7 @@ CREATE TABLE products (
   device       VARCHAR(20)  NULL,
   site_id      BIGINT       NOT NULL,
   category_id  BIGINT       NOT NULL,
+  KEY idx_products_site_category (site_id, category_id),
   CONSTRAINT products_pages_site_id_fk
     FOREIGN KEY (site_id) REFERENCES pages(site_id),
   CONSTRAINT products_categories_category_id_fk
@@ -72,6 +74,7 @@ CREATE TABLE order_products (
   order_product_count INT NULL,   --판매 물품수
   order_product_amount INT NULL,  --매출액
   order_id           BIGINT  NOT NULL,
+  KEY idx_order_products_product_date (product_id, order_product_date),
   CONSTRAINT order_products_products_product_id_fk
     FOREIGN KEY (product_id) REFERENCES products(product_id),
   CONSTRAINT fk_order_products_orders_id_fk
@@ -83,7 +86,11 @@ CREATE TABLE visit_sources (
   source_id  BIGINT PRIMARY KEY AUTO_INCREMENT ,
   source_type VARCHAR(20)  NULL, --광고매체, URL, 키워드
   visit_count INT       NULL, --유입자 수
+  visit_day   DATE         NULL, --방문 일자 (NULL이면 일자 구분 전 데이터)
   site_id     BIGINT       NOT NULL,
+  updated_at  DATETIME(6)  NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),  --캐시 워터마크용
+  UNIQUE KEY uq_visit_sources_site_day_type (site_id, visit_day, source_type),
+  KEY idx_visit_sources_updated_at (updated_at),
   CONSTRAINT visit_sources_pages_site_id_fk
     FOREIGN KEY (site_id) REFERENCES pages(site_id)
 )
@@ -96,6 +103,11 @@ CREATE TABLE events (
   event_count  INT  NULL, --일별 클릭수, 장바구니 추가수
   product_id   BIGINT  NULL,
   user_id      BIGINT  NULL,
+  product_key  BIGINT AS (COALESCE(product_id, 0)) STORED,  --유니크 키용 (NULL -> 0)
+  user_key     BIGINT AS (COALESCE(user_id, 0)) STORED,
+  KEY idx_events_product_day (product_id, event_day),
+  KEY idx_events_user_day (user_id, event_day),
+  UNIQUE KEY uq_events_day_category_product_user (event_day, event_category, product_key, user_key),
   CONSTRAINT events_products_product_id_fk
     FOREIGN KEY (product_id) REFERENCES products(product_id),
   CONSTRAINT events_users_user_id_fk
@@ -106,10 +118,64 @@ CREATE TABLE events (
 CREATE TABLE refresh_tokens (
     refresh_token_id BIGINT AUTO_INCREMENT PRIMARY KEY,
     customer_id BIGINT NOT NULL,
-    token VARCHAR(512) NOT NULL UNIQUE,
+    token_hash BINARY(32) NOT NULL UNIQUE, --sha256(토큰 원문), 원문은 저장하지 않음
+    expires_at DATETIME NOT NULL,
     created_at DATETIME NOT NULL,
+    KEY idx_refresh_tokens_expires_at (expires_at),
     CONSTRAINT refresh_tokens_ibfk_1
      FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
 );
 
+-- 일별 매출 롤업(daily_sales_rollup) : 대시보드 집계용
+CREATE TABLE daily_sales_rollup (
+  site_id       BIGINT       NOT NULL,
+  day           DATE         NOT NULL,                 --주문일이 없는 행은 1000-01-01
+  product_id    BIGINT       NOT NULL,
+  device        VARCHAR(20)  NOT NULL DEFAULT '',  --NULL 디바이스는 ''로 저장
+  category_id   BIGINT       NOT NULL,
+  sales_amount  BIGINT       NOT NULL DEFAULT 0,   --매출액 합계
+  sales_count   BIGINT       NOT NULL DEFAULT 0,   --판매 물품수 합계
+  PRIMARY KEY (site_id, day, product_id, device, category_id),
+  KEY idx_daily_sales_rollup_product (product_id, day)
+);
+
+-- 월별 매출 롤업(monthly_sales_rollup) : 월별 차트용, daily_sales_rollup과 같은 배치에서 갱신
+CREATE TABLE monthly_sales_rollup (
+  site_id       BIGINT  NOT NULL,
+  month         DATE    NOT NULL,  --그 달 1일
+  sales_amount  BIGINT  NOT NULL DEFAULT 0,
+  sales_count   BIGINT  NOT NULL DEFAULT 0,
+  PRIMARY KEY (site_id, month)
+);
+
+-- 상품별 매출 롤업(product_sales_rollup) : 상위 상품(top-K) 조회용
+CREATE TABLE product_sales_rollup (
+  site_id          BIGINT      NOT NULL,
+  bucket           VARCHAR(7)  NOT NULL,  --'all'(전체 기간) 또는 'YYYY-MM'
+  product_id       BIGINT      NOT NULL,
+  category_id      BIGINT      NOT NULL,
+  total_sales      BIGINT      NOT NULL DEFAULT 0,
+  total_qty        BIGINT      NOT NULL DEFAULT 0,
+  last_order_date  DATE        NULL,
+  PRIMARY KEY (site_id, bucket, product_id),
+  KEY idx_product_sales_rollup_rank (site_id, bucket, total_sales, product_id),
+  KEY idx_product_sales_rollup_category_rank (site_id, bucket, category_id, total_sales, product_id)
+);
+
+-- 롤업 증분 갱신 위치(rollup_watermarks)
+CREATE TABLE rollup_watermarks (
+  rollup_name            VARCHAR(50) PRIMARY KEY,
+  last_order_product_id  BIGINT   NOT NULL DEFAULT 0,  --여기까지 반영된 order_product_id
+  pending_order_product_id BIGINT NULL,                --커밋이 다 끝나기를 기다리는 상한 후보
+  pending_seen_at        DATETIME NULL,                --후보를 기록한 시각
+  updated_at             DATETIME NOT NULL
+);
+
+-- 데이터 변경 카운터(data_versions) : id 최대값으로 알 수 없는 변경을 대시보드 캐시에 알림
+CREATE TABLE data_versions (
+  name        VARCHAR(50) PRIMARY KEY,   --events, ...
+  version     BIGINT   NOT NULL DEFAULT 0,
+  updated_at  DATETIME NOT NULL
+);
+
 SET FOREIGN_KEY_CHECKS = 1;
@@ -0,0 +1,37 @@
+# database/instrumentation.py : SQLAlchemy 이벤트 훅으로 SQL 수 / DB 시간 기록 (+ 느린 쿼리 로그). 커넥션 대기 시간은 database/pool.py
+
+from time import perf_counter
+
+from sqlalchemy import event
+
+from database import slow_query
+from services.monitoring import metrics
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["query_started"].pop()
+    metrics.db_statements_total.inc((metrics.route_label(),))
+    stats = metrics.current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+    slow_query.observe(conn, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(exception_context):
+    # 실패한 쿼리는 after_cursor_execute가 안 불리므로 시작 시간만 치운다
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine) -> None:
+    slow_query.attach(engine)
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,131 @@
+# database/pool.py : 커넥션 풀 (대기 시간 기록 + 통계 + 유휴 커넥션만 ping + 시작 시 미리 연결)
+
+import asyncio
+import logging
+from collections import deque
+from time import monotonic, perf_counter
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config.settings import settings
+from services.monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+WAIT_SAMPLES = 2048   # 백분위 계산에 쓰는 최근 체크아웃 수
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """풀에서 커넥션을 얻기까지 걸린 시간(대기 + 필요시 새 연결)과 실패를 기록"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_samples: deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.connect_failures = 0
+        self.connections_created = 0
+        self.pings = 0
+        self.ping_failures = 0
+
+    def _create_connection(self):
+        self.connections_created += 1
+        return super()._create_connection()
+
+    def connect(self):
+        started = perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        except Exception:
+            self.connect_failures += 1
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            self.checkouts += 1
+            self.wait_samples.append(elapsed)
+            metrics.db_pool_checkout_seconds.observe((metrics.route_label(),), elapsed)
+
+    def stats(self) -> dict:
+        waits = sorted(self.wait_samples)
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            # overflow()는 pool_size를 넘겨 연 커넥션 수 (아직 다 안 채웠으면 음수)
+            "overflow_in_use": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "connect_failures": self.connect_failures,
+            "connections_created": self.connections_created,
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+            "wait_ms_p50": round(_percentile(waits, 0.50) * 1000, 3) if waits else None,
+            "wait_ms_p95": round(_percentile(waits, 0.95) * 1000, 3) if waits else None,
+            "wait_ms_p99": round(_percentile(waits, 0.99) * 1000, 3) if waits else None,
+            "wait_ms_max": round(waits[-1] * 1000, 3) if waits else None,
+        }
+
+
+# ---------- pre-ping: idle ----------
+# pool_pre_ping은 체크아웃마다 왕복이 하나 더 생긴다.
+# "idle" 전략은 풀에 DATABASE_POOL_PRE_PING_IDLE_SECONDS 이상 놀던 커넥션만 확인한다.
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    connection_record.info["checked_in_at"] = monotonic()
+
+
+def _ping_if_idle(pool, dbapi_connection, connection_record) -> None:
+    checked_in_at = connection_record.info.get("checked_in_at")
+    if checked_in_at is None or monotonic() - checked_in_at < settings.DATABASE_POOL_PRE_PING_IDLE_SECONDS:
+        return
+
+    pool.pings += 1
+    try:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+    except Exception as e:
+        pool.ping_failures += 1
+        # 풀이 이 커넥션을 버리고 새로 연결해서 다시 체크아웃한다
+        raise exc.DisconnectionError() from e
+
+
+def enable_idle_pre_ping(sync_engine) -> None:
+    """
+    엔진에 등록한다. 통계는 엔진의 현재 풀에 쌓는다.
+    (dispose()로 풀이 새로 만들어져도 리스너는 옮겨가므로 등록 시점의 풀을 붙잡아 두지 않는다)
+    """
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        _ping_if_idle(sync_engine.pool, dbapi_connection, connection_record)
+
+    event.listen(sync_engine, "checkin", _on_checkin)
+    event.listen(sync_engine, "checkout", on_checkout)
+
+
+# ---------- 미리 연결 ----------
+async def prewarm(engine, count: int) -> int:
+    """시작 시 count개까지 커넥션을 미리 열어서 첫 요청이 연결 비용을 내지 않게 한다. 연 개수를 반환."""
+    count = min(count, engine.pool.size())
+    if count <= 0:
+        return 0
+
+    results = await asyncio.gather(*(engine.connect() for _ in range(count)), return_exceptions=True)
+    opened = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning("pool prewarm connect failed: %s", result)
+            continue
+        await result.close()   # 풀로 반환
+        opened += 1
+    return opened
@@ -0,0 +1,130 @@
+# database/replica.py : 읽기 전용 replica 선택 (라운드로빈 / 가장 한가한 것), 상태·지연 확인
+
+import itertools
+import logging
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# MySQL 8.0.22+ / 이전 버전
+_LAG_QUERIES = (
+    ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+    ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    healthy: bool = False                 # 첫 상태 확인 전까지는 primary 사용
+    lag_seconds: Optional[float] = None
+    checked_at: Optional[float] = None
+    failures: int = field(default=0)
+
+
+class ReplicaRouter:
+    """
+    replica 목록 중 하나를 고른다. 상태 확인에 실패했거나 지연이 max_lag_seconds를 넘은 replica는 건너뛰고,
+    쓸 수 있는 replica가 없으면 None → 호출하는 쪽이 primary를 쓴다.
+    복제 상태를 조회할 수 없으면 지연을 모르는 것이므로 unhealthy로 본다. (allow_unknown_lag면 지연 None으로 사용)
+    """
+
+    def __init__(self, replicas: list[Replica], strategy: str, max_lag_seconds: float, allow_unknown_lag: bool = False):
+        self.replicas = replicas
+        self.strategy = strategy
+        self.max_lag_seconds = max_lag_seconds
+        self.allow_unknown_lag = allow_unknown_lag
+        self._rr = itertools.count()
+        self.routed = 0
+        self.fallbacks = 0
+
+    def _usable(self, replica: Replica) -> bool:
+        if not replica.healthy:
+            return False
+        return replica.lag_seconds is None or replica.lag_seconds <= self.max_lag_seconds
+
+    def pick(self) -> Optional[AsyncEngine]:
+        candidates = [r for r in self.replicas if self._usable(r)]
+        if not candidates:
+            if self.replicas:
+                self.fallbacks += 1
+            return None
+
+        self.routed += 1
+        if self.strategy == "least_busy":
+            # 체크아웃된 커넥션 수가 가장 적은 replica
+            return min(candidates, key=lambda r: r.engine.pool.checkedout()).engine
+        return candidates[next(self._rr) % len(candidates)].engine
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                lag = None
+                errors = []
+                for query, column in _LAG_QUERIES:
+                    try:
+                        row = (await conn.execute(text(query))).mappings().first()
+                    except Exception as e:
+                        errors.append(f"{query}: {e}")
+                        continue
+                    if row is None:
+                        # 복제가 설정돼 있지 않거나 멈춘 뒤 초기화된 경우: 지연을 알 수 없다
+                        if not self.allow_unknown_lag:
+                            raise RuntimeError(f"replication is not configured ({query} returned no row)")
+                    elif row.get(column) is None:
+                        raise RuntimeError("replication is not running")
+                    else:
+                        lag = float(row[column])
+                    break
+                else:
+                    if not self.allow_unknown_lag:
+                        raise RuntimeError("replication lag unknown (" + "; ".join(errors) + ")")
+                    await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            # 처음 확인에서 실패한 경우도 남긴다 (시작부터 primary만 쓰는 이유를 알 수 있게)
+            if replica.healthy or replica.checked_at is None:
+                logger.warning("replica %s marked unhealthy: %s", replica.name, e)
+            replica.healthy = False
+            replica.failures += 1
+        else:
+            if not replica.healthy:
+                logger.info("replica %s is healthy again", replica.name)
+            replica.healthy = True
+            replica.lag_seconds = lag
+            if lag is not None and lag > self.max_lag_seconds:
+                logger.warning("replica %s lag %.1fs exceeds %.1fs, reading from primary", replica.name, lag, self.max_lag_seconds)
+        replica.checked_at = monotonic()
+
+    async def check_health(self) -> None:
+        """스케줄러용: 모든 replica의 상태와 지연을 갱신"""
+        for replica in self.replicas:
+            await self._check(replica)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "max_lag_seconds": self.max_lag_seconds,
+            "allow_unknown_lag": self.allow_unknown_lag,
+            "routed": self.routed,
+            "fallbacks": self.fallbacks,
+            **{
+                r.name: {
+                    "healthy": r.healthy,
+                    "usable": self._usable(r),
+                    "lag_seconds": r.lag_seconds,
+                    "failures": r.failures,
+                    "checked_out": r.engine.pool.checkedout(),
+                }
+                for r in self.replicas
+            },
+        }
@@ -1,16 +1,48 @@
 # db연결/세션 생성하는 곳
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
-from config.settings import settings
+from config.settings import settings, pool_options
+from database.instrumentation import instrument_engine
+from database.pool import TimedAsyncQueuePool, enable_idle_pre_ping, prewarm
+from database.replica import Replica, ReplicaRouter
 
 
 DATABASE_URL = settings.DATABASE_URL
 
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,  # SQL 로그 출력
-    pool_pre_ping=True  # 연결 유지
+POOL_OPTIONS = pool_options()
+
+
+def _create_engine(url: str):
+    engine = create_async_engine(
+        url,
+        echo=settings.DATABASE_ECHO,  # SQL 로그 출력 (지표는 /metrics)
+        poolclass=TimedAsyncQueuePool,  # 커넥션 대기 시간 / 실패 기록
+        pool_size=POOL_OPTIONS["pool_size"],
+        max_overflow=POOL_OPTIONS["max_overflow"],
+        pool_timeout=POOL_OPTIONS["pool_timeout"],
+        pool_recycle=POOL_OPTIONS["pool_recycle"],
+        pool_pre_ping=POOL_OPTIONS["pre_ping"] == "always",  # 체크아웃마다 왕복 1회
+    )
+    if POOL_OPTIONS["pre_ping"] == "idle":
+        enable_idle_pre_ping(engine.sync_engine)
+    instrument_engine(engine)
+    return engine
+
+
+# primary: 쓰기와 인증, 적재, 롤업 갱신은 항상 여기
+engine = _create_engine(DATABASE_URL)
+
+# replica: 대시보드 읽기 전용
+replica_router = ReplicaRouter(
+    [
+        Replica(name=f"replica_{i}", engine=_create_engine(url))
+        for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+    ],
+    strategy=settings.DATABASE_REPLICA_STRATEGY,
+    max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    allow_unknown_lag=settings.DATABASE_REPLICA_ALLOW_UNKNOWN_LAG,
 )
 
 async_session = sessionmaker(
@@ -19,8 +51,40 @@ async_session = sessionmaker(
     class_=AsyncSession
 )
 
+Base = declarative_base()
+
+
+async def prewarm_pools() -> dict:
+    """앱 시작 시 primary와 replica 풀을 미리 채운다. 엔진별로 연 커넥션 수를 반환."""
+    count = POOL_OPTIONS["prewarm"]
+    opened = {"primary": await prewarm(engine, count)}
+    for replica in replica_router.replicas:
+        opened[replica.name] = await prewarm(replica.engine, count)
+    return opened
+
+
+def pool_stats() -> dict:
+    return {
+        "profile": settings.DATABASE_POOL_PROFILE,
+        "pre_ping": POOL_OPTIONS["pre_ping"],
+        "primary": engine.pool.stats(),
+        **{r.name: r.engine.pool.stats() for r in replica_router.replicas},
+    }
+
+
+def read_session() -> AsyncSession:
+    """읽기 전용 세션: 쓸 수 있는 replica가 있으면 거기로, 없으면(지연/장애/미설정) primary"""
+    replica = replica_router.pick()
+    return async_session(bind=replica) if replica is not None else async_session()
+
+
+def _is_read_only_route(request: Request) -> bool:
+    tags = getattr(request.scope.get("route"), "tags", None) or ()
+    return any(tag in settings.DATABASE_REPLICA_ROUTE_TAGS for tag in tags)
+
 
-# 세션 의존성
-async def get_db():
-    async with async_session() as session:
+# 세션 의존성: 읽기 전용 라우트(대시보드)는 replica, 나머지(인증 등 쓰기)는 primary
+async def get_db(request: Request):
+    factory = read_session if _is_read_only_route(request) else async_session
+    async with factory() as session:
         yield session
@@ -0,0 +1,172 @@
+# database/slow_query.py : 느린 쿼리 + 일부 샘플을 구조화된 JSON으로 기록
+# 대시보드 라우트에서 나온 SELECT는 백그라운드로 EXPLAIN 해서 실행 계획을 남기고,
+# 같은 쿼리 형태의 계획 구조(테이블/접근 방식/인덱스)가 바뀌면 WARNING으로 알린다.
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from config.settings import settings
+from services.monitoring import metrics
+
+logger = logging.getLogger("slow_query")
+
+# EXPLAIN 실행 중에는 그 쿼리 자체를 다시 기록하지 않음
+_capturing: contextvars.ContextVar[bool] = contextvars.ContextVar("slow_query_capturing", default=False)
+
+# fingerprint -> 계획 구조 해시, fingerprint -> 마지막 EXPLAIN 시도 시각
+MAX_PLANS = 500
+_plans: OrderedDict[str, str] = OrderedDict()
+_explained_at: dict[str, float] = {}
+# sync Engine -> AsyncEngine (primary / replica 중 쿼리가 실행된 곳에서 EXPLAIN)
+_engines: dict = {}
+
+_IN_LIST = re.compile(r"(%s|\?)(?:\s*,\s*(?:%s|\?))+")
+_SPACES = re.compile(r"\s+")
+# 계획 비교에 쓰는 키 (rows/cost 같은 추정치는 데이터가 늘면 항상 바뀌므로 제외)
+_PLAN_KEYS = ("table_name", "access_type", "key", "using_filesort", "using_temporary_table", "using_index")
+
+
+def fingerprint(statement: str) -> str:
+    """IN 목록 길이나 공백이 달라도 같은 쿼리로 본다"""
+    normalized = _IN_LIST.sub(r"\1...", _SPACES.sub(" ", statement.strip()))
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def _redact(value):
+    # id/날짜/숫자는 재현에 필요해서 남기고, 문자열/바이트(이메일, 토큰 해시 등)는 길이만
+    if value is None or isinstance(value, (bool, int, float, Decimal, date, datetime)):
+        return value if not isinstance(value, (Decimal, date, datetime)) else str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return f"<bytes:{len(value)}>"
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters, executemany: bool, limit: int = 50):
+    if executemany:
+        return {"executemany_rows": len(parameters)}
+    if isinstance(parameters, dict):
+        return {k: _redact(v) for k, v in list(parameters.items())[:limit]}
+    if isinstance(parameters, (list, tuple)):
+        redacted = [_redact(v) for v in parameters[:limit]]
+        if len(parameters) > limit:
+            redacted.append(f"<+{len(parameters) - limit} more>")
+        return redacted
+    return _redact(parameters)
+
+
+def observe(conn, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+    """after_cursor_execute 훅에서 호출 (동기)"""
+    if not settings.SLOW_QUERY_LOG_ENABLED or _capturing.get():
+        return
+
+    slow = elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS
+    if not slow and random.random() >= settings.SLOW_QUERY_SAMPLE_RATE:
+        return
+
+    stats = metrics.current_request.get()
+    fp = fingerprint(statement)
+    # 샘플은 평범한 쿼리라 INFO로 (WARNING 알림은 기준을 넘은 쿼리만)
+    log = logger.warning if slow else logger.info
+    log(json.dumps({
+        "event": "slow_query" if slow else "sampled_query",
+        "fingerprint": fp,
+        "duration_ms": round(elapsed * 1000, 2),
+        "route": metrics.route_label(),
+        "statement": statement,
+        "parameters": redact_parameters(parameters, executemany),
+    }, ensure_ascii=False, default=str))
+
+    if (
+        settings.SLOW_QUERY_EXPLAIN_ENABLED
+        and not executemany
+        and stats is not None
+        and "dashboard" in stats.tags
+        and statement.lstrip()[:6].upper() == "SELECT"
+    ):
+        _schedule_explain(_engines.get(conn.engine), fp, statement, parameters)
+
+
+def _schedule_explain(engine, fp: str, statement: str, parameters) -> None:
+    if engine is None:
+        return
+    now = time.monotonic()
+    last = _explained_at.get(fp)
+    if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _explained_at[fp] = now
+    if len(_explained_at) > MAX_PLANS * 2:
+        _explained_at.pop(next(iter(_explained_at)))
+    # 요청과 별개 task: 응답을 기다리게 하지 않고, 요청 지표에도 섞이지 않게
+    loop.create_task(_capture_explain(engine, fp, statement, parameters), context=contextvars.Context())
+
+
+def _plan_shape(plan) -> list:
+    shape = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            picked = {k: node[k] for k in _PLAN_KEYS if k in node}
+            if picked:
+                shape.append(picked)
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(plan)
+    return shape
+
+
+async def _capture_explain(engine, fp: str, statement: str, parameters) -> None:
+    _capturing.set(True)
+    try:
+        async with engine.connect() as conn:
+            if conn.dialect.name == "mysql":
+                row = (await conn.exec_driver_sql("EXPLAIN FORMAT=JSON " + statement, parameters)).first()
+                plan = json.loads(row[0])
+            else:
+                explain = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+                plan = [list(r) for r in (await conn.exec_driver_sql(explain + statement, parameters)).all()]
+    except Exception as e:
+        logger.info(json.dumps({"event": "explain_failed", "fingerprint": fp, "error": str(e)}))
+        return
+
+    # MySQL JSON 계획은 구조만 비교, 그 외 DB는 계획 텍스트 그대로
+    shape = _plan_shape(plan) if isinstance(plan, dict) else plan
+    shape_hash = hashlib.sha1(json.dumps(shape, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    previous = _plans.get(fp)
+    _plans[fp] = shape_hash
+    _plans.move_to_end(fp)
+    while len(_plans) > MAX_PLANS:
+        _plans.popitem(last=False)
+
+    changed = previous is not None and previous != shape_hash
+    log = logger.warning if changed else logger.info
+    log(json.dumps({
+        "event": "query_plan_changed" if changed else "query_plan",
+        "fingerprint": fp,
+        "plan_hash": shape_hash,
+        "previous_plan_hash": previous,
+        "shape": shape,
+        "plan": plan,
+    }, ensure_ascii=False, default=str))
+
+
+def attach(engine) -> None:
+    _engines[engine.sync_engine] = engine
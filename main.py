@@ -1,28 +1,182 @@
+# main.py : 앱 팩토리
+# uvicorn main:app 또는 uvicorn --factory main:create_app
+# 라우터와 서비스는 create_app()에서 켜진 그룹(APP_ROUTER_GROUPS)만 import 한다.
+
+import asyncio
+import importlib
+import logging
+from contextlib import asynccontextmanager
+from time import perf_counter
+
 from fastapi import FastAPI, Depends
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.session import get_db
-from sqlalchemy import text
-from routers.auth.register_router import router as register_router
-from routers.auth.login_router import router as login_router
-from routers.auth.logout_router import router as logout_router
-from config.settings import setup_cors
-from routers.dashboard.dashboard_router import router as dashboard_router
 
-app = FastAPI()
+from config.settings import settings, setup_cors
+from database.session import get_db, pool_stats, prewarm_pools, replica_router
+from services.monitoring.metrics import register_collector
+from services.monitoring.middleware import MetricsMiddleware
+from services.scheduler import start_periodic, stop_periodic_tasks
+
+logger = logging.getLogger(__name__)
+
+# 그룹 -> 라우터 모듈 (각 모듈의 router)
+ROUTER_GROUPS = {
+    "auth": (
+        "routers.auth.register_router",
+        "routers.auth.login_router",
+        "routers.auth.logout_router",
+    ),
+    "dashboard": (
+        "routers.dashboard.dashboard_router",
+        "routers.dashboard.export_router",
+    ),
+    "tracking": ("routers.tracking.event_router",),
+    "imports": ("routers.imports.import_router",),
+    "monitoring": (
+        "routers.monitoring.metrics_router",
+        "routers.monitoring.health_router",
+    ),
+}
+
+
+# ---------- 그룹별 시작 / 종료 ----------
+async def _start_group(group: str) -> None:
+    if group == "auth":
+        from services.auth.refresh_token_sweeper import sweep_expired_refresh_tokens
+
+        # 만료된 refresh token 정리
+        start_periodic(
+            "refresh-token-sweeper",
+            settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS,
+            sweep_expired_refresh_tokens,
+        )
+    elif group == "dashboard":
+        from services.dashboard.rollup_service import refresh_rollups
+
+        # 대시보드 롤업 증분 갱신
+        if settings.DASHBOARD_USE_ROLLUP:
+            start_periodic(
+                "rollup-refresh",
+                settings.ROLLUP_REFRESH_INTERVAL_SECONDS,
+                refresh_rollups,
+            )
+        # replica 상태/복제 지연 확인 (지연이 크면 대시보드도 primary로)
+        if replica_router.replicas:
+            await replica_router.check_health()
+            start_periodic(
+                "replica-health",
+                settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS,
+                replica_router.check_health,
+            )
+    elif group == "tracking":
+        from services.tracking.event_buffer import event_buffer
+
+        # 수집 이벤트 flush
+        event_buffer.start()
+
+
+async def _stop_group(group: str) -> None:
+    if group == "tracking":
+        from services.tracking.event_buffer import event_buffer
+
+        await event_buffer.stop(settings.EVENT_BUFFER_DRAIN_TIMEOUT_SECONDS)
+    elif group == "auth":
+        from services.auth.password_service import password_hasher
+
+        password_hasher.shutdown()
+
+
+def _register_collectors(group: str) -> None:
+    if group == "auth":
+        from services.auth.password_service import password_hasher
+        from services.auth.token_cache import access_token_cache
+
+        register_collector("token_cache", access_token_cache.stats)
+        register_collector("password_hasher", password_hasher.stats)
+    elif group == "dashboard":
+        from repositories.dashboard import columnar_repository
+        from services.dashboard.cache import dashboard_cache
+
+        register_collector("dashboard_cache", dashboard_cache.stats)
+        register_collector("columnar", columnar_repository.stats)
+    elif group == "tracking":
+        from services.tracking.event_buffer import event_buffer
+
+        register_collector("event_buffer", event_buffer.stats)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    groups = app.state.router_groups
+    started = perf_counter()
+
+    # 첫 요청이 연결 비용을 내지 않도록 풀을 미리 채움
+    app.state.startup["prewarmed_connections"] = await prewarm_pools()
+    for group in groups:
+        await _start_group(group)
+
+    # 쿼리 컴파일 / 인증 스택 / 캐시 준비. 끝나야 /health/ready가 200
+    if settings.APP_WARMUP_ENABLED:
+        from services.warmup import run_warmup
+
+        try:
+            app.state.startup["warmup_ms"] = await asyncio.wait_for(
+                run_warmup(groups), timeout=settings.APP_WARMUP_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning("warmup timed out after %ss", settings.APP_WARMUP_TIMEOUT_SECONDS)
+
+    app.state.startup["lifespan_ms"] = round((perf_counter() - started) * 1000, 1)
+    app.state.ready = True
+    logger.info("app ready: %s", app.state.startup)
+
+    yield
+
+    app.state.ready = False
+    for group in reversed(groups):
+        await _stop_group(group)
+    await stop_periodic_tasks()
+    await replica_router.dispose()
+
+
+def create_app() -> FastAPI:
+    started = perf_counter()
+    groups = [g for g in settings.APP_ROUTER_GROUPS if g in ROUTER_GROUPS]
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.router_groups = groups
+    app.state.ready = False
+    app.state.startup = {}
+
+    # ✅ CORS 설정
+    setup_cors(app)
+
+    # 요청별 지연 / SQL 수 / DB 시간 -> /metrics
+    app.add_middleware(MetricsMiddleware)
+    register_collector("db_replicas", replica_router.stats)
+    register_collector("db_pool", pool_stats)
+    register_collector("startup", lambda: {"ready": app.state.ready, **app.state.startup})
 
-# ✅ CORS 설정
-setup_cors(app)
+    # 헬스체크
+    @app.get("/")
+    async def test_connection(db: AsyncSession = Depends(get_db)):
+        now = (await db.execute(select(func.now()))).scalar_one()
+        return {"message": "Connected to AWS RDS!", "time": now}
 
-# 헬스체크
->>>>>>> origin/main
-@app.get("/")
-async def test_connection(db: AsyncSession = Depends(get_db)):
-    now = (await db.execute(select(func.now()))).scalar_one()
-    return {"message": "Connected to AWS RDS!", "time": now}
+    for group in groups:
+        for module in ROUTER_GROUPS[group]:
+            app.include_router(importlib.import_module(module).router)
+        _register_collectors(group)
 
+    app.state.startup["create_app_ms"] = round((perf_counter() - started) * 1000, 1)
+    return app
 
-app.include_router(register_router)
-app.include_router(login_router)
-app.include_router(logout_router)
-app.include_router(dashboard_router)
 
+def __getattr__(name: str):
+    # uvicorn main:app 호환: 처음 접근할 때 한 번만 만든다
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,7 @@
 #models/models.py
 
-from sqlalchemy import (Column, Integer, BigInteger, String, Text, Date, ForeignKey, DateTime)
+from sqlalchemy import (Column, Integer, BigInteger, String, Text, Date, ForeignKey, DateTime, Index, UniqueConstraint, Computed, BINARY, text)
+from sqlalchemy.dialects.mysql import DATETIME
 from sqlalchemy.orm import relationship
 from database.session import Base
 from datetime import datetime, timezone
@@ -51,6 +52,7 @@ class Site(Base):
     site_name = Column(String(50))
     site_category = Column(String(50))
     site_tz = Column(String(50))
+    ingest_key_hash = Column(BINARY(32), unique=True)   # sha256(이벤트 수집 키 원문), 원문은 저장하지 않음
 
     # relationships
     customer = relationship("Customer", back_populates="sites")
@@ -79,6 +81,9 @@ class User(Base):
 # -----------------------------
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("idx_products_site_category", "site_id", "category_id"),
+    )
 
     product_id = Column(BigInteger, primary_key=True, autoincrement=True)
     product_code = Column(String(50))
@@ -117,6 +122,10 @@ class Order(Base):
 # -----------------------------
 class OrderProduct(Base):
     __tablename__ = "order_products"
+    __table_args__ = (
+        # 테넌트 상품 목록 -> 기간 조회
+        Index("idx_order_products_product_date", "product_id", "order_product_date"),
+    )
 
     order_product_id = Column(BigInteger, primary_key=True, autoincrement=True)
     product_id = Column(BigInteger, ForeignKey("products.product_id"), nullable=False)
@@ -134,12 +143,26 @@ class OrderProduct(Base):
 # Visit Sources
 # -----------------------------
 class VisitSource(Base):
+    """
+    방문수는 (사이트, 일자, 유입경로) 단위로 쌓는다. visit_day가 없는 행은 일자 구분 전 데이터.
+    외부 적재가 쓰는 테이블이라 updated_at은 MySQL이 직접 갱신하고, 대시보드 캐시 워터마크가 그 최대값을 본다.
+    """
     __tablename__ = "visit_sources"
+    __table_args__ = (
+        UniqueConstraint("site_id", "visit_day", "source_type", name="uq_visit_sources_site_day_type"),
+        Index("idx_visit_sources_updated_at", "updated_at"),
+    )
 
     source_id = Column(BigInteger, primary_key=True, autoincrement=True)
     source_type = Column(String(20))   # 광고매체, URL, 키워드
     visit_count = Column(Integer)      # 유입자 수
+    visit_day = Column(Date)           # 방문 일자
     site_id = Column(BigInteger, ForeignKey("pages.site_id"), nullable=False)
+    updated_at = Column(
+        DATETIME(fsp=6),
+        server_default=text("CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"),
+        nullable=False,
+    )
 
     # relationships
     site = relationship("Site", back_populates="visit_sources")
@@ -149,7 +172,19 @@ class VisitSource(Base):
 # Events
 # -----------------------------
 class Event(Base):
+    """
+    (일자, 이벤트 종류, 상품, 사용자) 단위 카운터. 수집 API가 같은 키로 upsert 해서 event_count를 더한다.
+    product_id/user_id는 NULL일 수 있어서 0으로 바꾼 생성 컬럼으로 유니크 키를 건다. (NULL끼리는 중복 판정이 안 됨)
+    """
     __tablename__ = "events"
+    __table_args__ = (
+        Index("idx_events_product_day", "product_id", "event_day"),
+        Index("idx_events_user_day", "user_id", "event_day"),
+        UniqueConstraint(
+            "event_day", "event_category", "product_key", "user_key",
+            name="uq_events_day_category_product_user",
+        ),
+    )
 
     event_id = Column(BigInteger, primary_key=True, autoincrement=True)
     event_day = Column(Date)
@@ -157,6 +192,8 @@ class Event(Base):
     event_count = Column(Integer)         # 일별 클릭수, 장바구니 추가 수
     product_id = Column(BigInteger, ForeignKey("products.product_id"))
     user_id = Column(BigInteger, ForeignKey("users.user_id"))
+    product_key = Column(BigInteger, Computed("coalesce(product_id, 0)", persisted=True))
+    user_key = Column(BigInteger, Computed("coalesce(user_id, 0)", persisted=True))
 
     # relationships
     product = relationship("Product", back_populates="events")
@@ -168,6 +205,9 @@ class Event(Base):
 # -----------------------------
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index("idx_refresh_tokens_expires_at", "expires_at"),   # 만료 토큰 정리용
+    )
 
     refresh_token_id = Column(BigInteger, primary_key=True, autoincrement=True)
     customer_id = Column(
@@ -175,7 +215,8 @@ class RefreshToken(Base):
         ForeignKey("customers.customer_id"),
         nullable=False
     )
-    token = Column(String(512), nullable=False, unique=True)
+    token_hash = Column(BINARY(32), nullable=False, unique=True)   # sha256(토큰 원문)
+    expires_at = Column(DateTime, nullable=False)
     created_at = Column(
         DateTime,
         default=lambda: datetime.now(timezone.utc),
@@ -185,3 +226,106 @@ class RefreshToken(Base):
     # relationships
     customer = relationship("Customer", back_populates="refresh_tokens")
 
+
+# -----------------------------
+# Daily Sales Rollup (dashboard aggregates)
+# -----------------------------
+class DailySalesRollup(Base):
+    """
+    order_products를 (사이트, 일자, 상품, 디바이스, 카테고리) 단위로 미리 합산한 테이블.
+    테넌트별 조회가 PK 범위 스캔이 되도록 site_id가 PK 맨 앞.
+    device는 PK에 포함되므로 NULL 대신 빈 문자열로, 주문일이 없는 행은 day를 1000-01-01로 저장한다.
+    """
+    __tablename__ = "daily_sales_rollup"
+    __table_args__ = (
+        Index("idx_daily_sales_rollup_product", "product_id", "day"),
+    )
+
+    site_id = Column(BigInteger, primary_key=True)
+    day = Column(Date, primary_key=True)
+    product_id = Column(BigInteger, primary_key=True)
+    device = Column(String(20), primary_key=True, default="")
+    category_id = Column(BigInteger, primary_key=True)
+    sales_amount = Column(BigInteger, nullable=False, default=0)   # 매출액 합계
+    sales_count = Column(BigInteger, nullable=False, default=0)    # 판매 물품 수 합계
+
+
+# -----------------------------
+# Monthly Sales Rollup (monthly chart)
+# -----------------------------
+class MonthlySalesRollup(Base):
+    """
+    order_products를 (사이트, 월) 단위로 미리 합산한 테이블.
+    month는 그 달 1일. 월별 차트는 PK 범위 스캔으로 최대 36행 정도만 읽는다.
+    """
+    __tablename__ = "monthly_sales_rollup"
+
+    site_id = Column(BigInteger, primary_key=True)
+    month = Column(Date, primary_key=True)
+    sales_amount = Column(BigInteger, nullable=False, default=0)   # 매출액 합계
+    sales_count = Column(BigInteger, nullable=False, default=0)    # 판매 물품 수 합계
+
+
+# -----------------------------
+# Product Sales Rollup (top-K)
+# -----------------------------
+class ProductSalesRollup(Base):
+    """
+    상품별 누적 매출. bucket은 전체 기간('all') 또는 월('YYYY-MM').
+    (site_id, bucket[, category_id], total_sales, product_id) 인덱스를 역순으로 읽으면
+    상위 N개를 정렬 없이 바로 얻을 수 있다.
+    """
+    __tablename__ = "product_sales_rollup"
+    __table_args__ = (
+        Index("idx_product_sales_rollup_rank", "site_id", "bucket", "total_sales", "product_id"),
+        Index(
+            "idx_product_sales_rollup_category_rank",
+            "site_id", "bucket", "category_id", "total_sales", "product_id",
+        ),
+    )
+
+    site_id = Column(BigInteger, primary_key=True)
+    bucket = Column(String(7), primary_key=True)
+    product_id = Column(BigInteger, primary_key=True)
+    category_id = Column(BigInteger, nullable=False)
+    total_sales = Column(BigInteger, nullable=False, default=0)    # 매출액 합계
+    total_qty = Column(BigInteger, nullable=False, default=0)      # 판매 물품 수 합계
+    last_order_date = Column(Date)
+
+
+# -----------------------------
+# Rollup Watermarks
+# -----------------------------
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    rollup_name = Column(String(50), primary_key=True)
+    last_order_product_id = Column(BigInteger, nullable=False, default=0)   # 여기까지 반영됨
+    pending_order_product_id = Column(BigInteger)   # 커밋이 다 끝나기를 기다리는 상한 후보
+    pending_seen_at = Column(DateTime)              # 후보를 기록한 시각
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+
+# -----------------------------
+# Data Versions
+# -----------------------------
+class DataVersion(Base):
+    """
+    id 최대값으로는 알 수 없는 변경(기존 행 upsert, 과거 id로 적재 등)을 알리는 카운터.
+    쓰는 쪽이 같은 트랜잭션에서 version을 올리고, 대시보드 캐시 워터마크가 이 값을 본다.
+    """
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
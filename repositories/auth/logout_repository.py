@@ -1,9 +1,8 @@
 # repositories/auth/logout_repository.py
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
 
-from models.models import RefreshToken
+from repositories.auth.refresh_token_repository import RefreshTokenRepository
 
 
 class LogoutRepository:
@@ -15,21 +14,6 @@ class LogoutRepository:
     ) -> bool:
         """
         해당 customer가 소유한 refresh_token만 삭제.
-        삭제 성공 시 True, 없으면 False 반환.
+        삭제 성공 시 True, 없으면 False 반환. (SELECT 없이 DELETE 한 번, commit은 서비스에서)
         """
-        stmt = select(RefreshToken).where(
-            RefreshToken.token == token,
-            RefreshToken.customer_id == customer_id,
-        )
-        result = await db.execute(stmt)
-        refresh_token = result.scalars().first()
-
-        if not refresh_token:
-            return False
-
-        del_stmt = delete(RefreshToken).where(
-            RefreshToken.refresh_token_id == refresh_token.refresh_token_id
-        )
-        await db.execute(del_stmt)
-        await db.commit()
-        return True
+        return await RefreshTokenRepository.delete_by_token(db, token, customer_id)
@@ -1,43 +1,51 @@
 # repositories/auth/refresh_token_repository.py
+# commit은 서비스에서 한 번만 한다 (로그인/재발급 각각 하나의 트랜잭션)
+# 토큰 원문 대신 sha256 digest(32바이트)로 저장/조회
+
+import hashlib
+from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import insert, delete
 from models.models import RefreshToken
 
 
+def hash_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
 class RefreshTokenRepository:
     @staticmethod
     async def create(
         db: AsyncSession,
         customer_id: int,
         token: str,
-    ) -> RefreshToken:
-        refresh_token = RefreshToken(
+        expires_at: datetime,
+    ) -> None:
+        # ORM 객체를 만들지 않고 INSERT 한 번만 실행 (refresh용 SELECT 없음)
+        stmt = insert(RefreshToken).values(
             customer_id=customer_id,
-            token=token,
+            token_hash=hash_token(token),
+            expires_at=expires_at,
         )
-        db.add(refresh_token)
-        await db.commit()
-        await db.refresh(refresh_token)
-        return refresh_token
+        await db.execute(stmt)
 
     @staticmethod
-    async def get_by_token(
+    async def delete_by_token(
         db: AsyncSession,
         token: str,
-    ) -> RefreshToken | None:
-        stmt = select(RefreshToken).where(RefreshToken.token == token)
+        customer_id: int,
+    ) -> bool:
+        """
+        해당 customer 소유의 토큰을 DELETE 한 번으로 삭제.
+        삭제된 행이 있으면 True. (동시에 같은 토큰으로 요청해도 한 쪽만 True)
+        """
+        stmt = delete(RefreshToken).where(
+            RefreshToken.token_hash == hash_token(token),
+            RefreshToken.customer_id == customer_id,
+        )
         result = await db.execute(stmt)
-        return result.scalars().first()
-
-    @staticmethod
-    async def delete_by_id(
-        db: AsyncSession,
-        refresh_token_id: int,
-    ) -> None:
-        stmt = delete(RefreshToken).where(RefreshToken.refresh_token_id == refresh_token_id)
-        await db.execute(stmt)
-        await db.commit()
+        return result.rowcount > 0
 
     @staticmethod
     async def delete_all_by_customer(
@@ -46,4 +54,21 @@ class RefreshTokenRepository:
     ) -> None:
         stmt = delete(RefreshToken).where(RefreshToken.customer_id == customer_id)
         await db.execute(stmt)
-        await db.commit()
\ No newline at end of file
+
+    @staticmethod
+    async def delete_expired(
+        db: AsyncSession,
+        now: datetime,
+        limit: int,
+    ) -> int:
+        """
+        expires_at 인덱스로 만료된 행을 최대 limit개만 삭제 (DELETE ... LIMIT).
+        한 번에 잡는 락 범위를 작게 유지하기 위해 배치 크기를 제한한다.
+        """
+        stmt = (
+            delete(RefreshToken)
+            .where(RefreshToken.expires_at <= now)
+            .with_dialect_options(mysql_limit=limit)
+        )
+        result = await db.execute(stmt)
+        return result.rowcount
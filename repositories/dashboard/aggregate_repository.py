@@ -0,0 +1,155 @@
+# 범용 group-by 집계: (차원, 지표, 필터)를 SQL 한 문장으로 만든다
+# 어떤 테이블(원본/롤업)을 읽을지는 aggregate_service가 정하고, 여기서는 그 소스의 컬럼으로 쿼리만 조립
+
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import select, func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from models.models import (
+    OrderProduct, Product, Category,
+    DailySalesRollup, MonthlySalesRollup, ProductSalesRollup,
+)
+from repositories.dashboard.rollup_repository import UNDATED
+
+
+@dataclass(frozen=True)
+class Source:
+    """집계 소스 하나의 논리 컬럼 -> 실제 컬럼. 소스에 없는 컬럼은 None."""
+    name: str
+    table: Any
+    site_id: Any
+    amount: Any
+    count: Any
+    day: Any = None
+    dated: Any = None            # 주문일이 있는 행 조건 (시간 차원/기간 조건이 있을 때)
+    product_id: Any = None
+    device: Any = None           # 결과로 내보낼 값 (NULL 디바이스는 NULL)
+    device_column: Any = None    # 필터용 원본 컬럼 (인덱스를 그대로 타도록 함수 없이)
+    category_id: Any = None
+    conditions: tuple = field(default=())
+
+
+RAW = Source(
+    name="order_products",
+    table=OrderProduct.__table__.join(Product.__table__, Product.product_id == OrderProduct.product_id),
+    site_id=Product.site_id,
+    amount=OrderProduct.order_product_amount,
+    count=OrderProduct.order_product_count,
+    day=OrderProduct.order_product_date,
+    dated=OrderProduct.order_product_date.isnot(None),
+    product_id=OrderProduct.product_id,
+    device=Product.device,
+    device_column=Product.device,
+    category_id=Product.category_id,
+)
+
+DAILY = Source(
+    name="daily_sales_rollup",
+    table=DailySalesRollup.__table__,
+    site_id=DailySalesRollup.site_id,
+    amount=DailySalesRollup.sales_amount,
+    count=DailySalesRollup.sales_count,
+    day=DailySalesRollup.day,
+    dated=DailySalesRollup.day > UNDATED,
+    product_id=DailySalesRollup.product_id,
+    device=func.nullif(DailySalesRollup.device, ""),
+    device_column=DailySalesRollup.device,
+    category_id=DailySalesRollup.category_id,
+)
+
+MONTHLY = Source(
+    name="monthly_sales_rollup",
+    table=MonthlySalesRollup.__table__,
+    site_id=MonthlySalesRollup.site_id,
+    amount=MonthlySalesRollup.sales_amount,
+    count=MonthlySalesRollup.sales_count,
+    day=MonthlySalesRollup.month,
+    dated=MonthlySalesRollup.month.isnot(None),
+)
+
+
+def product_bucket_source(bucket: str) -> Source:
+    """product_sales_rollup의 bucket 하나 ('all' 또는 'YYYY-MM')"""
+    return Source(
+        name="product_sales_rollup",
+        table=ProductSalesRollup.__table__,
+        site_id=ProductSalesRollup.site_id,
+        amount=ProductSalesRollup.total_sales,
+        count=ProductSalesRollup.total_qty,
+        product_id=ProductSalesRollup.product_id,
+        category_id=ProductSalesRollup.category_id,
+        conditions=(ProductSalesRollup.bucket == bucket,),
+    )
+
+
+async def fetch_aggregate(
+    db: AsyncSession,
+    source: Source,
+    site_ids: Sequence[int],
+    dimensions: Sequence[str],
+    metrics: Sequence[str],
+    from_date: Optional[date],
+    to_date: Optional[date],
+    category_id: Optional[int],
+    device: Optional[str],
+    limit: int,
+):
+    columns, group_by, order_by, joins = [], [], [], []
+
+    for dim in dimensions:
+        if dim == "device":
+            columns.append(source.device.label("device"))
+            group_by.append(source.device)
+        elif dim == "category":
+            joins.append((Category, Category.category_id == source.category_id, True))
+            columns += [source.category_id.label("category_id"), Category.category_name]
+            group_by += [source.category_id, Category.category_name]
+        elif dim == "product":
+            # 원본 소스는 이미 products를 조인하고 있어서 별칭으로 한 번 더 붙인다
+            dim_product = aliased(Product, name="dim_product")
+            joins.append((dim_product, dim_product.product_id == source.product_id, False))
+            columns += [source.product_id.label("product_id"), dim_product.product_name]
+            group_by += [source.product_id, dim_product.product_name]
+        else:
+            if dim == "day":
+                bucket = source.day
+            elif dim == "week":
+                bucket = func.subdate(source.day, func.weekday(source.day))   # 그 주 월요일
+            else:
+                bucket = func.date_format(source.day, "%Y-%m")
+            columns.append(bucket.label(dim))
+            group_by.append(bucket)
+            order_by.append(bucket)
+
+    for metric in metrics:
+        value = source.amount if metric == "amount" else source.count
+        columns.append(func.coalesce(func.sum(value), 0).label(metric))
+
+    q = select(*columns).select_from(source.table)
+    for target, onclause, outer in joins:
+        q = q.join(target, onclause, isouter=outer)
+    q = q.where(source.site_id.in_(site_ids), *source.conditions)
+
+    if source.day is not None:
+        if from_date or to_date or any(d in ("day", "week", "month") for d in dimensions):
+            q = q.where(source.dated)
+        if from_date:
+            q = q.where(source.day >= from_date)
+        if to_date:
+            q = q.where(source.day <= to_date)
+    if category_id is not None:
+        q = q.where(source.category_id == category_id)
+    if device is not None:
+        q = q.where(source.device_column == device)
+
+    # 시간 차원이 있으면 시간순, 없으면 첫 번째 지표 내림차순
+    if not order_by:
+        order_by = [desc(metrics[0])]
+    q = q.group_by(*group_by).order_by(*order_by).limit(limit)
+
+    return (await db.execute(q)).mappings().all()
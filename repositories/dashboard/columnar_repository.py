@@ -0,0 +1,472 @@
+# 인메모리 컬럼 엔진: 테넌트의 order_products를 NumPy 배열로 올려두고 대시보드 집계를 메모리에서 계산
+# dashboard_repository / rollup_repository와 같은 시그니처 (방문수만 SQL로 조회)
+# order_product_id 기준 증분 갱신이라 기존 행의 수정/삭제는 테넌트를 다시 올려야 반영된다.
+# 롤업과 같은 settle 구간을 둬서, 늦게 커밋되는 작은 id가 있을 수 있는 끝부분은 확정될 때까지 매번 다시 읽는다.
+# 적재/갱신은 요청 밖의 백그라운드 task에서 하고, 준비되기 전까지 서비스는 SQL로 집계한다.
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Optional, Sequence
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from database.session import read_session
+from models.models import OrderProduct, Product, Category
+from repositories.dashboard import dashboard_repository as repo
+from repositories.dashboard import rollup_repository as rollup_repo
+from repositories.dashboard import visit_repository as visit_repo
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 columnar 엔진은 꺼지고 항상 SQL로 집계
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+LOAD_CHUNK_ROWS = 50000
+
+
+class ColumnarStore:
+    """
+    한 테넌트(site_ids)의 팩트 컬럼 + 상품 차원. 만든 뒤에는 바꾸지 않는다.
+    (갱신은 새 store를 만들어서 통째로 바꿔 끼우므로 조회 중인 요청은 이전 store를 끝까지 본다)
+    팩트 행의 디바이스/카테고리는 상품 인덱스(pidx)로 상품 차원에서 꺼내 쓴다. (조회 시점의 Product 기준, SQL 조인과 동일)
+    """
+
+    def __init__(self):
+        # 팩트는 id 순서. 앞쪽 settled_rows개(id <= last_id)는 확정, 나머지는 다음 갱신 때 다시 읽는다
+        self.last_id = 0
+        self.settled_rows = 0
+        self.pending_id: Optional[int] = None       # 확정 후보 id와 그걸 본 시각 (rollup_repository.advance_settle_mark와 같은 방식)
+        self.pending_seen_at: Optional[float] = None
+        self.version: Optional[int] = None   # 만들 때의 매출 version (다르면 과거 id 행이 생긴 것 → 전체 재적재)
+        self.refreshed_at: Optional[float] = None
+
+        # 팩트 (order_products)
+        self.product_id = np.empty(0, np.int64)
+        self.day = np.empty(0, "datetime64[D]")     # 주문일이 없으면 NaT
+        self.amount = np.empty(0, np.int64)
+        self.count = np.empty(0, np.int64)
+        self.pidx = np.empty(0, np.int64)
+
+        # 상품 차원 (product_id 오름차순)
+        self.product_ids = np.empty(0, np.int64)
+        self.product_codes: list = []
+        self.product_names: list = []
+        self.devices: list = []                      # 디바이스 값 목록 (None 포함)
+        self.product_device = np.empty(0, np.int64)  # devices 인덱스
+        self.category_ids = np.empty(0, np.int64)
+        self.category_names: list = []               # 카테고리 이름 목록 (같은 이름은 하나로 묶임)
+        self.product_category = np.empty(0, np.int64)  # category_names 인덱스, 카테고리 행이 없으면 -1
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.product_id, self.day, self.amount, self.count, self.pidx)
+        return sum(a.nbytes for a in arrays)
+
+    def set_products(self, rows, category_names: dict) -> None:
+        """rows: (product_id, code, name, device, category_id), product_id 오름차순"""
+        self.product_ids = np.array([r[0] for r in rows], np.int64)
+        self.product_codes = [r[1] for r in rows]
+        self.product_names = [r[2] for r in rows]
+        self.category_ids = np.array([r[4] for r in rows], np.int64)
+
+        self.devices = list(dict.fromkeys(r[3] for r in rows))
+        device_index = {d: i for i, d in enumerate(self.devices)}
+        self.product_device = np.array([device_index[r[3]] for r in rows], np.int64)
+
+        self.category_names = list(dict.fromkeys(category_names.values()))
+        name_index = {n: i for i, n in enumerate(self.category_names)}
+        self.product_category = np.array(
+            [name_index[category_names[r[4]]] if r[4] in category_names else -1 for r in rows],
+            np.int64,
+        )
+        self.pidx = np.searchsorted(self.product_ids, self.product_id)
+
+    def between(self, from_d: Optional[date], to_d: Optional[date]):
+        """[from_d, to_d] 구간 행 마스크. 날짜 조건이 있으면 주문일 없는 행(NaT)은 빠진다."""
+        mask = np.ones(len(self), bool)
+        if from_d:
+            mask &= self.day >= np.datetime64(from_d, "D")
+        if to_d:
+            mask &= self.day <= np.datetime64(to_d, "D")
+        return mask
+
+    def values(self, metric: str):
+        return self.amount if metric == "amount" else self.count
+
+
+def _sum_by(index, weights, size: int):
+    """그룹별 합계. 금액이라 float64(bincount)를 거치지 않고 int64로 그대로 더한다."""
+    out = np.zeros(size, np.int64)
+    np.add.at(out, index, weights)
+    return out
+
+
+def _to_arrays(rows):
+    """DB 행 한 청크 -> (id, product_id, day, amount, count) 배열. 스레드에서 실행."""
+    ids, product_ids, days, amounts, counts = zip(*rows)
+    return (
+        np.array(ids, np.int64),
+        np.array(product_ids, np.int64),
+        np.array(days, "datetime64[D]"),
+        np.array(amounts, np.int64),
+        np.array(counts, np.int64),
+    )
+
+
+def _assemble(
+    previous: Optional[ColumnarStore], products, categories: dict, chunks, settle_to: int
+) -> ColumnarStore:
+    """
+    이전 store의 확정된 팩트 + 새 청크로 새 store를 만든다. 배열 이어붙이기가 커서 스레드에서 실행.
+    청크는 이전 store의 last_id 이후 행이고, 그중 settle_to 이하가 새로 확정된다.
+    """
+    store = ColumnarStore()
+    n = previous.settled_rows if previous is not None else 0
+    base = [previous] if previous is not None else []
+    store.product_id = np.concatenate([s.product_id[:n] for s in base] + [c[1] for c in chunks])
+    store.day = np.concatenate([s.day[:n] for s in base] + [c[2] for c in chunks])
+    store.amount = np.concatenate([s.amount[:n] for s in base] + [c[3] for c in chunks])
+    store.count = np.concatenate([s.count[:n] for s in base] + [c[4] for c in chunks])
+    store.last_id = settle_to
+    store.settled_rows = n + sum(int(np.searchsorted(c[0], settle_to, side="right")) for c in chunks)
+    # 상품 차원은 작아서 매번 새로 읽는다 (상품 추가/디바이스·카테고리 변경 반영, pidx도 다시 계산)
+    store.set_products(products, categories)
+    return store
+
+
+# ---------- Store 관리 ----------
+# site_ids -> ColumnarStore (LRU). 너무 큰 테넌트는 기억해두고 SQL로 보낸다.
+_stores: OrderedDict[tuple[int, ...], ColumnarStore] = OrderedDict()
+_too_large: set[tuple[int, ...]] = set()
+_refreshing: dict[tuple[int, ...], asyncio.Task] = {}
+_failed_at: dict[tuple[int, ...], float] = {}     # 마지막으로 적재에 실패한 시각 (바로 다시 시도하지 않도록)
+
+
+async def _count_rows(db: AsyncSession, site_ids: Sequence[int]) -> int:
+    q = select(func.count()).select_from(OrderProduct).where(
+        OrderProduct.product_id.in_(repo.tenant_product_ids(site_ids))
+    )
+    return (await db.execute(q)).scalar_one()
+
+
+async def _fetch_products(db: AsyncSession, site_ids: Sequence[int]):
+    products = (await db.execute(
+        select(
+            Product.product_id,
+            Product.product_code,
+            Product.product_name,
+            Product.device,
+            Product.category_id,
+        )
+        .where(Product.site_id.in_(site_ids))
+        .order_by(Product.product_id)
+    )).all()
+    categories = (await db.execute(
+        select(Category.category_id, Category.category_name).where(
+            Category.category_id.in_(
+                select(Product.category_id).where(Product.site_id.in_(site_ids))
+            )
+        )
+    )).all()
+    return products, dict(categories)
+
+
+async def _fetch_facts(db: AsyncSession, site_ids: Sequence[int], after_id: int) -> list:
+    """after_id 이후 행을 청크 단위로 읽어서 청크별 배열 목록으로. 배열 변환은 스레드에서."""
+    q = (
+        select(
+            OrderProduct.order_product_id,
+            OrderProduct.product_id,
+            OrderProduct.order_product_date,
+            func.coalesce(OrderProduct.order_product_amount, 0),
+            func.coalesce(OrderProduct.order_product_count, 0),
+        )
+        .where(
+            OrderProduct.order_product_id > after_id,
+            OrderProduct.product_id.in_(repo.tenant_product_ids(site_ids)),
+        )
+        .order_by(OrderProduct.order_product_id)
+        .execution_options(yield_per=LOAD_CHUNK_ROWS)
+    )
+
+    chunks = []
+    result = await db.stream(q)
+    async for rows in result.partitions():
+        chunks.append(await asyncio.to_thread(_to_arrays, rows))
+    return chunks
+
+
+def _mark_too_large(key: tuple[int, ...]) -> None:
+    _too_large.add(key)
+    _stores.pop(key, None)
+
+
+async def refresh_store(
+    db: AsyncSession, site_ids: Sequence[int], version: Optional[int] = None
+) -> Optional[ColumnarStore]:
+    """
+    테넌트 store를 올리거나(처음) 증분 갱신해서 바꿔 끼운다. 요청 경로가 아니라 백그라운드/워밍업에서 호출.
+    매출 version이 store와 다르면 id 증분으로는 못 잡는 행이 있으므로 처음부터 다시 읽는다.
+    numpy가 없거나 테넌트가 DASHBOARD_COLUMNAR_MAX_ROWS보다 크면 None.
+    """
+    if np is None:
+        return None
+    key = tuple(site_ids)
+    if key in _too_large:
+        return None
+
+    previous = _stores.get(key)
+    if previous is not None and version is not None and previous.version != version:
+        previous = None
+    started = time.monotonic()
+    if previous is None and await _count_rows(db, site_ids) > settings.DASHBOARD_COLUMNAR_MAX_ROWS:
+        _mark_too_large(key)
+        return None
+
+    # 이번에 확정할 id: 이전 갱신 때 적어둔 후보가 settle 구간을 넘겼으면 그 후보까지.
+    # 처음 올릴 때는 롤업 워터마크(롤업이 같은 방식으로 확정한 id)까지만 확정으로 본다.
+    if previous is None:
+        settle_to = await rollup_repo.fetch_watermark(db, rollup_repo.DAILY_SALES) if settings.DASHBOARD_USE_ROLLUP else 0
+    elif previous.pending_id is not None and started - previous.pending_seen_at >= settings.ROLLUP_SETTLE_SECONDS:
+        settle_to = max(previous.pending_id, previous.last_id)
+    else:
+        settle_to = previous.last_id
+
+    products, categories = await _fetch_products(db, site_ids)
+    chunks = await _fetch_facts(db, site_ids, previous.last_id if previous is not None else 0)
+    store = await asyncio.to_thread(_assemble, previous, products, categories, chunks, settle_to)
+    store.refreshed_at = started
+    if previous is None or previous.pending_id is None or settle_to != previous.last_id:
+        # 후보를 썼거나 처음이면 지금 보이는 최대 id를 새 후보로
+        store.pending_id = max((int(c[0][-1]) for c in chunks), default=settle_to)
+        store.pending_seen_at = started
+    else:
+        store.pending_id, store.pending_seen_at = previous.pending_id, previous.pending_seen_at
+    store.version = version if version is not None or previous is None else previous.version
+
+    if len(store) > settings.DASHBOARD_COLUMNAR_MAX_ROWS:
+        _mark_too_large(key)
+        return None
+
+    _stores[key] = store
+    _stores.move_to_end(key)
+    while len(_stores) > settings.DASHBOARD_COLUMNAR_MAX_TENANTS:
+        _stores.popitem(last=False)
+    return store
+
+
+async def _refresh_in_background(key: tuple[int, ...], version: Optional[int]) -> None:
+    try:
+        async with read_session() as db:
+            await refresh_store(db, key, version)
+        _failed_at.pop(key, None)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        _failed_at[key] = time.monotonic()
+        logger.warning("columnar store refresh failed for sites %s", key, exc_info=True)
+
+
+def _schedule_refresh(key: tuple[int, ...], version: Optional[int]) -> None:
+    if key in _refreshing:
+        return
+    failed_at = _failed_at.get(key)
+    if failed_at is not None and time.monotonic() - failed_at < settings.DASHBOARD_COLUMNAR_REFRESH_SECONDS:
+        return
+    task = asyncio.create_task(_refresh_in_background(key, version), name=f"columnar-refresh-{key}")
+    _refreshing[key] = task
+    task.add_done_callback(lambda t: _refreshing.pop(key, None) if _refreshing.get(key) is t else None)
+
+
+def get_store(site_ids: Sequence[int], version: Optional[int] = None) -> Optional[ColumnarStore]:
+    """
+    요청 경로용: 준비된 store를 바로 반환하고 DB를 기다리지 않는다.
+    없거나 오래됐으면 백그라운드 적재/갱신을 걸어두고, 없는 동안은 None → SQL로 집계.
+    version은 현재 매출 version (모르면 None). store와 다르면 재적재가 끝날 때까지 None.
+    """
+    if np is None:
+        return None
+    key = tuple(site_ids)
+    if key in _too_large:
+        return None
+
+    store = _stores.get(key)
+    if store is not None and version is not None and store.version != version:
+        _schedule_refresh(key, version)
+        return None
+    if store is not None:
+        _stores.move_to_end(key)
+    if store is None or time.monotonic() - store.refreshed_at >= settings.DASHBOARD_COLUMNAR_REFRESH_SECONDS:
+        _schedule_refresh(key, version)
+    return store
+
+
+def _require(site_ids: Sequence[int]) -> ColumnarStore:
+    store = _stores.get(tuple(site_ids))
+    if store is None:
+        raise LookupError(f"columnar store unavailable for sites {tuple(site_ids)}")
+    return store
+
+
+def forget(site_ids: Sequence[int]) -> None:
+    """해당 사이트가 들어간 store를 버린다. (워밍업용 빈 테넌트 정리)"""
+    sites = set(site_ids)
+    for key in [k for k in _stores if sites.intersection(k)]:
+        _stores.pop(key, None)
+    for key in [k for k in _refreshing if sites.intersection(k)]:
+        _refreshing.pop(key).cancel()
+    _too_large.difference_update([k for k in _too_large if sites.intersection(k)])
+
+
+def stats() -> dict:
+    return {
+        "available": np is not None,
+        "tenants": len(_stores),
+        "rows": sum(len(s) for s in _stores.values()),
+        "bytes": sum(s.nbytes for s in _stores.values()),
+        "too_large": len(_too_large),
+        "refreshing": len(_refreshing),
+        "failed": len(_failed_at),
+    }
+
+
+# ---------- KPI Summary ----------
+async def fetch_kpi_summary(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    from_d: date,
+    to_d: date,
+    prev_from_d: Optional[date] = None,
+):
+    store = _require(site_ids)
+    current = store.between(from_d, to_d)
+
+    row = {
+        "sales": int(store.amount[current].sum()),
+        "items": int(store.count[current].sum()),
+        "visits": await visit_repo.fetch_visits(db, site_ids, from_d, to_d),
+    }
+    if prev_from_d is not None:
+        previous = store.between(prev_from_d, None) & (store.day < np.datetime64(from_d, "D"))
+        row["prev_sales"] = int(store.amount[previous].sum())
+        row["prev_items"] = int(store.count[previous].sum())
+        row["prev_visits"] = (await db.execute(
+            visit_repo.visits_between(site_ids, prev_from_d, before=from_d)
+        )).scalar_one()
+
+    return row
+
+
+# ---------- Monthly Sales ----------
+async def fetch_monthly_sales(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    from_month: date,
+    to_month: date,
+):
+    store = _require(site_ids)
+    first = np.datetime64(from_month, "M")
+    last = np.datetime64(to_month, "M")
+
+    months = store.day.astype("datetime64[M]")
+    mask = (months >= first) & (months <= last)
+    offset = (months[mask] - first).astype(np.int64)
+    size = int((last - first).astype(np.int64)) + 1
+
+    sales = _sum_by(offset, store.amount[mask], size)
+    present = np.bincount(offset, minlength=size) > 0
+
+    return [
+        {"ym": str(first + i), "sales": int(sales[i])}
+        for i in np.flatnonzero(present)
+    ]
+
+
+# ---------- Top Products ----------
+async def fetch_top_products(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    limit: int,
+    from_date: Optional[date],
+    to_date: Optional[date],
+    category_id: Optional[int],
+    after: Optional[tuple[int, int]] = None,
+):
+    store = _require(site_ids)
+    size = len(store.product_ids)
+    mask = store.between(from_date, to_date)
+    pidx = store.pidx[mask]
+
+    total_sales = _sum_by(pidx, store.amount[mask], size)
+    total_qty = _sum_by(pidx, store.count[mask], size)
+    last_day = np.full(size, np.iinfo(np.int64).min, np.int64)   # NaT
+    np.maximum.at(last_day, pidx, store.day[mask].view(np.int64))
+    last_day = last_day.view("datetime64[D]")
+
+    candidates = np.arange(size)
+    if category_id is not None:
+        candidates = candidates[store.category_ids == category_id]
+    if after is not None:
+        sales, pids = total_sales[candidates], store.product_ids[candidates]
+        candidates = candidates[(sales < after[0]) | ((sales == after[0]) & (pids < after[1]))]
+
+    # total_sales 내림차순, 같으면 product_id 내림차순 (SQL과 같은 순서)
+    order = np.lexsort((-store.product_ids[candidates], -total_sales[candidates]))
+    top = candidates[order[:limit]]
+
+    return [
+        {
+            "product_id": int(store.product_ids[i]),
+            "product_code": store.product_codes[i],
+            "product_name": store.product_names[i],
+            "device": store.devices[store.product_device[i]],
+            "total_qty": int(total_qty[i]),
+            "total_sales": int(total_sales[i]),
+            "last_order_date": None if np.isnat(last_day[i]) else last_day[i].item(),
+        }
+        for i in top
+    ]
+
+
+# ---------- Device Share ----------
+async def fetch_device_share(db: AsyncSession, site_ids: Sequence[int], metric: str):
+    store = _require(site_ids)
+    size = len(store.devices)
+    device = store.product_device[store.pidx]
+
+    value = _sum_by(device, store.values(metric), size)
+    present = np.bincount(device, minlength=size) > 0
+
+    rows = [
+        {"device": store.devices[i], "value": int(value[i])}
+        for i in np.flatnonzero(present)
+    ]
+    return sorted(rows, key=lambda r: r["value"], reverse=True)
+
+
+# ---------- Orders By Category ----------
+async def fetch_orders_by_category(db: AsyncSession, site_ids: Sequence[int], metric: str):
+    store = _require(site_ids)
+    size = len(store.category_names)
+    category = store.product_category[store.pidx]
+    mask = category >= 0   # 카테고리 행이 없는 상품은 SQL의 내부 조인처럼 제외
+
+    value = _sum_by(category[mask], store.values(metric)[mask], size)
+    present = np.bincount(category[mask], minlength=size) > 0
+
+    rows = [
+        {"category_name": store.category_names[i], "value": int(value[i])}
+        for i in np.flatnonzero(present)
+    ]
+    return sorted(rows, key=lambda r: r["value"], reverse=True)
@@ -3,121 +3,203 @@
 
 
 from datetime import date
-from typing import Optional
+from typing import Optional, Sequence
 
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, case, or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.models import (
-    OrderProduct, VisitSource, Product, Category, Event
+    OrderProduct, Product, Category, Event, User, Site, RollupWatermark, VisitSource
 )
+from repositories.dashboard import data_version_repository as version_repo
+from repositories.dashboard import visit_repository as visit_repo
+from repositories.dashboard.rollup_repository import DAILY_SALES
 
 
-# ---------- KPI Summary ----------
-async def fetch_kpi_summary(db: AsyncSession, from_d: date, to_d: date):
-    q_sales = (
-        select(func.coalesce(func.sum(OrderProduct.order_product_amount), 0))
-        .where(
-            OrderProduct.order_product_date >= from_d,
-            OrderProduct.order_product_date <= to_d,
-        )
+# ---------- Tenant ----------
+# 모든 대시보드 쿼리는 로그인한 customer의 site_id 목록으로 범위를 좁힌다.
+async def fetch_customer_site_ids(db: AsyncSession, customer_id: int) -> list[int]:
+    q = (
+        select(Site.site_id)
+        .where(Site.customer_id == customer_id)
+        .order_by(Site.site_id)
     )
+    return list((await db.execute(q)).scalars().all())
+
+
+def tenant_product_ids(site_ids: Sequence[int]):
+    return select(Product.product_id).where(Product.site_id.in_(site_ids))
+
+
+def tenant_event_filter(site_ids: Sequence[int]):
+    """상품 이벤트는 Product.site_id로, 상품이 없는 이벤트는 User.site_id로 테넌트 판별"""
+    return or_(
+        Event.product_id.in_(tenant_product_ids(site_ids)),
+        and_(
+            Event.product_id.is_(None),
+            Event.user_id.in_(select(User.user_id).where(User.site_id.in_(site_ids))),
+        ),
+    )
+
+
+# ---------- KPI Summary ----------
+async def fetch_kpi_summary(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    from_d: date,
+    to_d: date,
+    prev_from_d: Optional[date] = None,
+):
+    """
+    매출/판매수/방문수를 쿼리 한 번으로 조회.
+    prev_from_d가 있으면 [prev_from_d, from_d) 구간을 조건부 집계로 같이 계산한다.
+    """
+    in_current = OrderProduct.order_product_date >= from_d
+    visits = visit_repo.visits_between(site_ids, from_d, to_d).scalar_subquery()
+
+    columns = [
+        func.coalesce(func.sum(case(
+            (in_current, OrderProduct.order_product_amount)
+        )), 0).label("sales"),
+        func.coalesce(func.sum(case(
+            (in_current, OrderProduct.order_product_count)
+        )), 0).label("items"),
+        visits.label("visits"),
+    ]
+    if prev_from_d is not None:
+        columns += [
+            func.coalesce(func.sum(case(
+                (~in_current, OrderProduct.order_product_amount)
+            )), 0).label("prev_sales"),
+            func.coalesce(func.sum(case(
+                (~in_current, OrderProduct.order_product_count)
+            )), 0).label("prev_items"),
+            visit_repo.visits_between(
+                site_ids, prev_from_d, before=from_d
+            ).scalar_subquery().label("prev_visits"),
+        ]
 
-    q_items = (
-        select(func.coalesce(func.sum(OrderProduct.order_product_count), 0))
+    q = (
+        select(*columns)
+        .select_from(OrderProduct)
+        .join(Product, Product.product_id == OrderProduct.product_id)
         .where(
-            OrderProduct.order_product_date >= from_d,
+            Product.site_id.in_(site_ids),
+            OrderProduct.order_product_date >= (prev_from_d or from_d),
             OrderProduct.order_product_date <= to_d,
         )
     )
 
-    q_visits = select(func.coalesce(func.sum(VisitSource.visit_count), 0))
-
-    sales = (await db.execute(q_sales)).scalar_one()
-    items = (await db.execute(q_items)).scalar_one()
-    visits = (await db.execute(q_visits)).scalar_one()
-
-    return sales, items, visits
+    return (await db.execute(q)).mappings().one()
 
 
 # ---------- Monthly Sales ----------
-async def fetch_monthly_sales(db: AsyncSession, months: int):
+async def fetch_monthly_sales(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    from_month: date,
+    to_month: date,
+):
+    """
+    [from_month, to_month] 구간의 월별 매출. 매출이 없는 달은 행이 없다.
+    주문일에 함수를 씌우지 않고 날짜 범위로 먼저 거른 뒤(인덱스 사용) 월로 묶는다.
+    """
     ym = func.date_format(OrderProduct.order_product_date, "%Y-%m")
+    # to_month가 속한 달의 다음 달 1일 (미만 조건)
+    next_month = date(to_month.year + to_month.month // 12, to_month.month % 12 + 1, 1)
 
     q = (
         select(
             ym.label("ym"),
-            func.round(
-                func.sum(OrderProduct.order_product_amount), 0
-            ).label("sales"),
+            func.sum(OrderProduct.order_product_amount).label("sales"),
+        )
+        .join(Product, Product.product_id == OrderProduct.product_id)
+        .where(
+            Product.site_id.in_(site_ids),
+            OrderProduct.order_product_date >= from_month,
+            OrderProduct.order_product_date < next_month,
         )
         .group_by(ym)
-        .order_by(desc("ym"))
-        .limit(months)
     )
 
     return (await db.execute(q)).mappings().all()
 
 
 # ---------- Top Products ----------
-async def fetch_top_products(
-    db: AsyncSession,
-    limit: int,
+def top_products_query(
+    site_ids: Sequence[int],
     from_date: Optional[date],
     to_date: Optional[date],
     category_id: Optional[int],
+    after: Optional[tuple[int, int]] = None,
 ):
-    amount_sum = func.coalesce(
-        func.sum(OrderProduct.order_product_amount), 0
-    ).label("total_sales")
-    qty_sum = func.coalesce(
-        func.sum(OrderProduct.order_product_count), 0
-    ).label("total_qty")
-    last_dt = func.max(
-        OrderProduct.order_product_date
-    ).label("last_order_date")
+    """
+    order_products를 먼저 product_id 단위로 합산한 뒤(서브쿼리) 상품과 붙인다.
+    날짜 조건은 서브쿼리 안에 있어서 외부 조인이 유지됨 → 기간 내 판매가 없는 상품은 0으로 나온다.
+    limit 없이 (total_sales, product_id) 역순. 내보내기는 이걸 그대로 스트리밍한다.
+    after=(total_sales, product_id)면 그 행 다음부터 (키셋 페이지네이션).
+    """
+    products = tenant_product_ids(site_ids)
+    if category_id is not None:
+        products = products.where(Product.category_id == category_id)
 
-    q = (
+    agg = (
         select(
-            Product.product_id.label("product_id"),
-            Product.product_code,
-            Product.product_name,
-            Product.device,
-            qty_sum,
-            amount_sum,
-            last_dt,
-        )
-        .select_from(Product)
-        .join(
-            OrderProduct,
-            OrderProduct.product_id == Product.product_id,
-            isouter=True,
+            OrderProduct.product_id,
+            func.sum(OrderProduct.order_product_count).label("total_qty"),
+            func.sum(OrderProduct.order_product_amount).label("total_sales"),
+            func.max(OrderProduct.order_product_date).label("last_order_date"),
         )
+        .where(OrderProduct.product_id.in_(products))
     )
-
     if from_date:
-        q = q.where(OrderProduct.order_product_date >= from_date)
+        agg = agg.where(OrderProduct.order_product_date >= from_date)
     if to_date:
-        q = q.where(OrderProduct.order_product_date <= to_date)
-    if category_id is not None:
-        q = q.where(Product.category_id == category_id)
+        agg = agg.where(OrderProduct.order_product_date <= to_date)
+    agg = agg.group_by(OrderProduct.product_id).subquery()
+
+    total_sales = func.coalesce(agg.c.total_sales, 0).label("total_sales")
 
     q = (
-        q.group_by(
-            Product.product_id,
+        select(
+            Product.product_id.label("product_id"),
             Product.product_code,
             Product.product_name,
             Product.device,
+            func.coalesce(agg.c.total_qty, 0).label("total_qty"),
+            total_sales,
+            agg.c.last_order_date,
         )
-        .order_by(desc("total_sales"))
-        .limit(limit)
+        .select_from(Product)
+        .join(agg, agg.c.product_id == Product.product_id, isouter=True)
+        .where(Product.site_id.in_(site_ids))
     )
+    if category_id is not None:
+        q = q.where(Product.category_id == category_id)
+    if after is not None:
+        q = q.where(or_(
+            total_sales < after[0],
+            and_(total_sales == after[0], Product.product_id < after[1]),
+        ))
 
+    return q.order_by(desc("total_sales"), desc(Product.product_id))
+
+
+async def fetch_top_products(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    limit: int,
+    from_date: Optional[date],
+    to_date: Optional[date],
+    category_id: Optional[int],
+    after: Optional[tuple[int, int]] = None,
+):
+    q = top_products_query(site_ids, from_date, to_date, category_id, after).limit(limit)
     return (await db.execute(q)).mappings().all()
 
 
 # ---------- Device Share ----------
-async def fetch_device_share(db: AsyncSession, metric: str):
+async def fetch_device_share(db: AsyncSession, site_ids: Sequence[int], metric: str):
     value = (
         func.coalesce(func.sum(OrderProduct.order_product_amount), 0)
         if metric == "amount"
@@ -127,6 +209,7 @@ async def fetch_device_share(db: AsyncSession, metric: str):
     q = (
         select(Product.device, value)
         .join(OrderProduct, OrderProduct.product_id == Product.product_id)
+        .where(Product.site_id.in_(site_ids))
         .group_by(Product.device)
         .order_by(desc("value"))
     )
@@ -135,7 +218,7 @@ async def fetch_device_share(db: AsyncSession, metric: str):
 
 
 # ---------- Orders By Category ----------
-async def fetch_orders_by_category(db: AsyncSession, metric: str):
+async def fetch_orders_by_category(db: AsyncSession, site_ids: Sequence[int], metric: str):
     value = (
         func.coalesce(func.sum(OrderProduct.order_product_amount), 0)
         if metric == "amount"
@@ -146,6 +229,7 @@ async def fetch_orders_by_category(db: AsyncSession, metric: str):
         select(Category.category_name, value)
         .join(Product, Product.category_id == Category.category_id)
         .join(OrderProduct, OrderProduct.product_id == Product.product_id)
+        .where(Product.site_id.in_(site_ids))
         .group_by(Category.category_name)
         .order_by(desc("value"))
     )
@@ -156,13 +240,18 @@ async def fetch_orders_by_category(db: AsyncSession, metric: str):
 # ---------- Funnel ----------
 async def fetch_funnel(
     db: AsyncSession,
+    site_ids: Sequence[int],
     from_date: Optional[date],
     to_date: Optional[date],
 ):
-    q = select(
-        Event.event_category.label("step"),
-        func.coalesce(func.sum(Event.event_count), 0).label("count"),
-    ).group_by(Event.event_category)
+    q = (
+        select(
+            Event.event_category.label("step"),
+            func.coalesce(func.sum(Event.event_count), 0).label("count"),
+        )
+        .where(tenant_event_filter(site_ids))
+        .group_by(Event.event_category)
+    )
 
     if from_date:
         q = q.where(Event.event_day >= from_date)
@@ -172,6 +261,29 @@ async def fetch_funnel(
     return (await db.execute(q)).mappings().all()
 
 
-async def fetch_visits(db: AsyncSession):
-    q = select(func.coalesce(func.sum(VisitSource.visit_count), 0))
-    return (await db.execute(q)).scalar_one()
+# ---------- Data Watermark (캐시 무효화용) ----------
+async def fetch_data_watermark(db: AsyncSession, use_rollup: bool):
+    """
+    (매출 워터마크, 매출 version, 이벤트 version, 방문수 변경 시각) 반환.
+    롤업을 읽는 경우엔 롤업에 반영된 위치를 써야 롤업 갱신 전에 캐시가 다시 채워지지 않는다.
+    과거 id로 적재한 매출은 워터마크가 그대로라서 적재 쪽이 올리는 매출 version으로 알린다.
+    이벤트는 같은 키에 upsert 되어 event_id가 안 늘어나므로 수집 버퍼가 올리는 version을 본다.
+    최대값들은 인덱스 끝만 읽으므로 테이블 스캔 없음.
+    """
+    if use_rollup:
+        sales_mark = select(
+            func.coalesce(func.max(RollupWatermark.last_order_product_id), 0)
+        ).where(RollupWatermark.rollup_name == DAILY_SALES)
+    else:
+        sales_mark = select(func.coalesce(func.max(OrderProduct.order_product_id), 0))
+    sales_version = version_repo.version_of(version_repo.SALES)
+    event_mark = version_repo.version_of(version_repo.EVENTS)
+    visit_mark = select(func.max(VisitSource.updated_at))
+
+    q = select(
+        sales_mark.scalar_subquery(),
+        sales_version.scalar_subquery(),
+        event_mark.scalar_subquery(),
+        visit_mark.scalar_subquery(),
+    )
+    return tuple((await db.execute(q)).one())
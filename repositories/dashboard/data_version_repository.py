@@ -0,0 +1,33 @@
+# 데이터 변경 카운터(data_versions): 기존 행을 고치는 쓰기(이벤트 upsert 등)는 id 최대값이 안 바뀌어서
+# 쓰는 쪽이 같은 트랜잭션에서 version을 올리고, 대시보드 캐시 워터마크가 그 값을 읽는다.
+
+
+from datetime import datetime, timezone
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import DataVersion
+
+
+# 이벤트 카운터 upsert (수집 버퍼 flush)
+EVENTS = "events"
+# 증분 갱신으로 잡히지 않는 매출 변경 (과거 id로 적재, 사이트 롤업 재구축)
+SALES = "sales"
+
+
+async def bump_version(db: AsyncSession, name: str) -> None:
+    """version += 1. commit은 호출하는 쪽에서 (데이터 변경과 같은 트랜잭션으로)"""
+    now = datetime.now(timezone.utc)
+    stmt = mysql_insert(DataVersion).values(name=name, version=1, updated_at=now)
+    stmt = stmt.on_duplicate_key_update(
+        version=DataVersion.version + 1,
+        updated_at=now,
+    )
+    await db.execute(stmt)
+
+
+def version_of(name: str):
+    """워터마크 쿼리에 스칼라 서브쿼리로 끼워 쓰는 version select (행이 없으면 0)"""
+    return select(func.coalesce(func.max(DataVersion.version), 0)).where(DataVersion.name == name)
@@ -0,0 +1,596 @@
+# 매출 롤업(daily_sales_rollup, monthly_sales_rollup, product_sales_rollup) 갱신 + 롤업 기반 대시보드 조회
+# dashboard_repository와 같은 시그니처를 유지해서 서비스에서 그대로 바꿔 끼울 수 있게 함
+
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy import select, func, desc, delete, update, case, cast, literal, Date, or_, and_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import (
+    OrderProduct, Product, Category,
+    DailySalesRollup, MonthlySalesRollup, ProductSalesRollup, RollupWatermark,
+)
+from repositories.dashboard import visit_repository as visit_repo
+
+
+# 매출 롤업들은 같은 배치·같은 트랜잭션에서 갱신하므로 워터마크 하나를 같이 쓴다
+DAILY_SALES = "daily_sales"
+
+# product_sales_rollup의 전체 기간 bucket
+ALL_BUCKET = "all"
+
+# 주문일이 없는 행의 daily_sales_rollup.day (PK라 NULL을 못 넣음). 날짜 조건이 없는 조회에만 포함된다.
+UNDATED = date(1000, 1, 1)
+
+
+# ---------- Watermark ----------
+async def lock_watermark(db: AsyncSession, rollup_name: str) -> int:
+    """
+    워터마크 행을 FOR UPDATE로 잠그고 현재 값을 반환.
+    행이 없으면 0으로 만든다. (동시에 도는 갱신 작업끼리 직렬화)
+    """
+    q = (
+        select(RollupWatermark.last_order_product_id)
+        .where(RollupWatermark.rollup_name == rollup_name)
+        .with_for_update()
+    )
+    last_id = (await db.execute(q)).scalar_one_or_none()
+    if last_id is not None:
+        return last_id
+
+    ins = mysql_insert(RollupWatermark).values(
+        rollup_name=rollup_name,
+        last_order_product_id=0,
+        updated_at=datetime.now(timezone.utc),
+    ).prefix_with("IGNORE")
+    await db.execute(ins)
+    return (await db.execute(q)).scalar_one()
+
+
+async def fetch_watermark(db: AsyncSession, rollup_name: str) -> int:
+    """잠그지 않고 현재 워터마크만 읽는다 (없으면 0). 이 id까지는 settle 구간이 지나 확정된 행."""
+    q = select(func.coalesce(func.max(RollupWatermark.last_order_product_id), 0)).where(
+        RollupWatermark.rollup_name == rollup_name
+    )
+    return (await db.execute(q)).scalar_one()
+
+
+async def set_watermark(db: AsyncSession, rollup_name: str, last_id: int) -> None:
+    stmt = (
+        update(RollupWatermark)
+        .where(RollupWatermark.rollup_name == rollup_name)
+        .values(
+            last_order_product_id=last_id,
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+    await db.execute(stmt)
+
+
+async def advance_settle_mark(db: AsyncSession, rollup_name: str, settle_seconds: float) -> Optional[int]:
+    """
+    이번 갱신에서 반영해도 되는 order_product_id 상한 (없으면 None). lock_watermark 다음에 호출.
+    AUTO_INCREMENT id는 커밋 순서와 다르게 보일 수 있어서 (작은 id가 나중에 커밋됨)
+    지금 보이는 최대 id를 후보로 적어두고, settle_seconds가 지난 뒤에야 상한으로 쓴다.
+    그때까지 그 이하 id를 가진 트랜잭션은 끝났다고 보고, 후보를 쓰면 새 후보를 다시 적는다.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    pending_id, seen_at = (await db.execute(
+        select(RollupWatermark.pending_order_product_id, RollupWatermark.pending_seen_at)
+        .where(RollupWatermark.rollup_name == rollup_name)
+    )).one()
+
+    settled = None
+    if pending_id is not None and now - seen_at >= timedelta(seconds=settle_seconds):
+        settled = pending_id
+    if pending_id is None or settled is not None:
+        current_max = (await db.execute(select(func.max(OrderProduct.order_product_id)))).scalar_one()
+        await db.execute(
+            update(RollupWatermark)
+            .where(RollupWatermark.rollup_name == rollup_name)
+            .values(pending_order_product_id=current_max or 0, pending_seen_at=now)
+        )
+    return settled
+
+
+# ---------- Refresh ----------
+async def fetch_batch_upper_bound(
+    db: AsyncSession,
+    after_id: int,
+    batch_size: int,
+    limit_id: int,
+) -> Optional[int]:
+    """(after_id, limit_id] 구간의 앞쪽 batch_size개 행 중 가장 큰 order_product_id (없으면 None)"""
+    ids = (
+        select(OrderProduct.order_product_id)
+        .where(
+            OrderProduct.order_product_id > after_id,
+            OrderProduct.order_product_id <= limit_id,
+        )
+        .order_by(OrderProduct.order_product_id)
+        .limit(batch_size)
+        .subquery()
+    )
+    q = select(func.max(ids.c.order_product_id))
+    return (await db.execute(q)).scalar_one()
+
+
+def _batch_conditions(after_id: int, upper_id: int, site_ids: Optional[Sequence[int]]) -> list:
+    """(after_id, upper_id] 구간, site_ids가 있으면 그 사이트 상품만 (사이트 재구축용)"""
+    conditions = [
+        OrderProduct.order_product_id > after_id,
+        OrderProduct.order_product_id <= upper_id,
+    ]
+    if site_ids is not None:
+        conditions.append(Product.site_id.in_(site_ids))
+    return conditions
+
+
+async def upsert_daily_sales(
+    db: AsyncSession,
+    after_id: int,
+    upper_id: int,
+    site_ids: Optional[Sequence[int]] = None,
+) -> None:
+    """
+    (after_id, upper_id] 구간의 order_products를 사이트/일별로 묶어서 롤업에 더한다.
+    주문일이 없는 행은 UNDATED 일자로 모아서, 원본 집계처럼 기간 조건이 없는 조회(디바이스/카테고리 등)에는 포함되게 한다.
+    """
+    device = func.coalesce(Product.device, "")
+    day = func.coalesce(OrderProduct.order_product_date, UNDATED)
+
+    src = (
+        select(
+            Product.site_id,
+            day,
+            OrderProduct.product_id,
+            device,
+            Product.category_id,
+            func.coalesce(func.sum(OrderProduct.order_product_amount), 0),
+            func.coalesce(func.sum(OrderProduct.order_product_count), 0),
+        )
+        .join(Product, Product.product_id == OrderProduct.product_id)
+        .where(*_batch_conditions(after_id, upper_id, site_ids))
+        .group_by(
+            Product.site_id,
+            day,
+            OrderProduct.product_id,
+            device,
+            Product.category_id,
+        )
+    )
+
+    stmt = mysql_insert(DailySalesRollup).from_select(
+        ["site_id", "day", "product_id", "device", "category_id", "sales_amount", "sales_count"],
+        src,
+    )
+    stmt = stmt.on_duplicate_key_update(
+        sales_amount=DailySalesRollup.sales_amount + stmt.inserted.sales_amount,
+        sales_count=DailySalesRollup.sales_count + stmt.inserted.sales_count,
+    )
+    await db.execute(stmt)
+
+
+async def upsert_monthly_sales(
+    db: AsyncSession,
+    after_id: int,
+    upper_id: int,
+    site_ids: Optional[Sequence[int]] = None,
+) -> None:
+    """(after_id, upper_id] 구간의 order_products를 사이트/월별로 묶어서 월별 롤업에 더한다."""
+    # 쓰기 쪽은 id 구간으로 이미 범위가 좁혀져 있어서 함수로 묶어도 괜찮다
+    month = cast(func.date_format(OrderProduct.order_product_date, "%Y-%m-01"), Date)
+
+    src = (
+        select(
+            Product.site_id,
+            month,
+            func.coalesce(func.sum(OrderProduct.order_product_amount), 0),
+            func.coalesce(func.sum(OrderProduct.order_product_count), 0),
+        )
+        .join(Product, Product.product_id == OrderProduct.product_id)
+        .where(
+            *_batch_conditions(after_id, upper_id, site_ids),
+            OrderProduct.order_product_date.isnot(None),
+        )
+        .group_by(Product.site_id, month)
+    )
+
+    stmt = mysql_insert(MonthlySalesRollup).from_select(
+        ["site_id", "month", "sales_amount", "sales_count"],
+        src,
+    )
+    stmt = stmt.on_duplicate_key_update(
+        sales_amount=MonthlySalesRollup.sales_amount + stmt.inserted.sales_amount,
+        sales_count=MonthlySalesRollup.sales_count + stmt.inserted.sales_count,
+    )
+    await db.execute(stmt)
+
+
+async def _upsert_product_bucket(
+    db: AsyncSession,
+    after_id: int,
+    upper_id: int,
+    bucket,
+    *conditions,
+    site_ids: Optional[Sequence[int]] = None,
+    group_by_bucket: bool = True,
+) -> None:
+    keys = [Product.site_id, OrderProduct.product_id, Product.category_id]
+    if group_by_bucket:
+        keys.append(bucket)
+
+    src = (
+        select(
+            Product.site_id,
+            bucket,
+            OrderProduct.product_id,
+            Product.category_id,
+            func.coalesce(func.sum(OrderProduct.order_product_amount), 0),
+            func.coalesce(func.sum(OrderProduct.order_product_count), 0),
+            func.max(OrderProduct.order_product_date),
+        )
+        .join(Product, Product.product_id == OrderProduct.product_id)
+        .where(*_batch_conditions(after_id, upper_id, site_ids), *conditions)
+        .group_by(*keys)
+    )
+
+    stmt = mysql_insert(ProductSalesRollup).from_select(
+        ["site_id", "bucket", "product_id", "category_id", "total_sales", "total_qty", "last_order_date"],
+        src,
+    )
+    last = ProductSalesRollup.last_order_date
+    # GREATEST는 인자 중 NULL이 있으면 NULL이라서 양쪽을 서로로 채워서 비교
+    # category_id는 갱신 시점의 상품 카테고리로 맞춘다 (조회는 현재 Product.category_id 기준)
+    stmt = stmt.on_duplicate_key_update(
+        category_id=stmt.inserted.category_id,
+        total_sales=ProductSalesRollup.total_sales + stmt.inserted.total_sales,
+        total_qty=ProductSalesRollup.total_qty + stmt.inserted.total_qty,
+        last_order_date=func.greatest(
+            func.coalesce(last, stmt.inserted.last_order_date),
+            func.coalesce(stmt.inserted.last_order_date, last),
+        ),
+    )
+    await db.execute(stmt)
+
+
+async def upsert_product_sales(
+    db: AsyncSession,
+    after_id: int,
+    upper_id: int,
+    site_ids: Optional[Sequence[int]] = None,
+) -> None:
+    """(after_id, upper_id] 구간을 상품별 월 bucket과 전체 기간 bucket에 더한다."""
+    await _upsert_product_bucket(
+        db, after_id, upper_id,
+        func.date_format(OrderProduct.order_product_date, "%Y-%m"),
+        OrderProduct.order_product_date.isnot(None),
+        site_ids=site_ids,
+    )
+    # 전체 기간은 원본 쿼리처럼 주문일이 없는 행도 포함
+    await _upsert_product_bucket(
+        db, after_id, upper_id, literal(ALL_BUCKET), site_ids=site_ids, group_by_bucket=False
+    )
+
+
+async def clear_sites(db: AsyncSession, site_ids: Sequence[int]) -> None:
+    """사이트 재구축용: 그 사이트의 매출 롤업만 지운다. commit 전까지 다른 세션은 이전 값을 그대로 본다."""
+    for model in (DailySalesRollup, MonthlySalesRollup, ProductSalesRollup):
+        await db.execute(delete(model).where(model.site_id.in_(site_ids)))
+
+
+# ---------- KPI Summary ----------
+async def fetch_kpi_summary(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    from_d: date,
+    to_d: date,
+    prev_from_d: Optional[date] = None,
+):
+    in_current = DailySalesRollup.day >= from_d
+    visits = visit_repo.visits_between(site_ids, from_d, to_d).scalar_subquery()
+
+    columns = [
+        func.coalesce(func.sum(case(
+            (in_current, DailySalesRollup.sales_amount)
+        )), 0).label("sales"),
+        func.coalesce(func.sum(case(
+            (in_current, DailySalesRollup.sales_count)
+        )), 0).label("items"),
+        visits.label("visits"),
+    ]
+    if prev_from_d is not None:
+        columns += [
+            func.coalesce(func.sum(case(
+                (~in_current, DailySalesRollup.sales_amount)
+            )), 0).label("prev_sales"),
+            func.coalesce(func.sum(case(
+                (~in_current, DailySalesRollup.sales_count)
+            )), 0).label("prev_items"),
+            visit_repo.visits_between(
+                site_ids, prev_from_d, before=from_d
+            ).scalar_subquery().label("prev_visits"),
+        ]
+
+    q = select(*columns).where(
+        DailySalesRollup.site_id.in_(site_ids),
+        DailySalesRollup.day >= (prev_from_d or from_d),
+        DailySalesRollup.day <= to_d,
+    )
+
+    return (await db.execute(q)).mappings().one()
+
+
+# ---------- Monthly Sales ----------
+async def fetch_monthly_sales(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    from_month: date,
+    to_month: date,
+):
+    """[from_month, to_month] 구간의 월별 매출. 매출이 없는 달은 행이 없다."""
+    q = (
+        select(
+            func.date_format(MonthlySalesRollup.month, "%Y-%m").label("ym"),
+            func.sum(MonthlySalesRollup.sales_amount).label("sales"),
+        )
+        .where(
+            MonthlySalesRollup.site_id.in_(site_ids),
+            MonthlySalesRollup.month >= from_month,
+            MonthlySalesRollup.month <= to_month,
+        )
+        .group_by(MonthlySalesRollup.month)
+    )
+
+    return (await db.execute(q)).mappings().all()
+
+
+# ---------- Top Products ----------
+def top_products_bucket(from_date: Optional[date], to_date: Optional[date]) -> Optional[str]:
+    """기간이 product_sales_rollup의 bucket 하나와 정확히 맞으면 그 bucket, 아니면 None"""
+    if not from_date and not to_date:
+        return ALL_BUCKET
+    if (
+        from_date and to_date
+        and from_date.day == 1
+        and (from_date.year, from_date.month) == (to_date.year, to_date.month)
+        and (to_date + timedelta(days=1)).day == 1
+    ):
+        return from_date.strftime("%Y-%m")
+    return None
+
+
+async def fetch_ranked_products(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    bucket: str,
+    limit: int,
+    category_id: Optional[int],
+    after: Optional[tuple[int, int]] = None,
+):
+    """
+    product_sales_rollup의 순위 인덱스를 역순으로 limit개만 읽고 상품 정보를 붙인다. (판매액이 양수인 상품만)
+    after가 있으면 인덱스의 그 위치부터 읽으므로 뒤 페이지도 비용이 같다.
+    카테고리는 원본 쿼리처럼 현재 Product.category_id로 확인한다.
+    """
+    top = (
+        select(
+            ProductSalesRollup.product_id,
+            ProductSalesRollup.total_qty,
+            ProductSalesRollup.total_sales,
+            ProductSalesRollup.last_order_date,
+        )
+        .where(
+            ProductSalesRollup.site_id.in_(site_ids),
+            ProductSalesRollup.bucket == bucket,
+            ProductSalesRollup.total_sales > 0,
+        )
+    )
+    if category_id is not None:
+        # 인덱스는 롤업의 category_id로 타고, 카테고리가 바뀐 상품은 limit 안에서 걸러지도록 여기서 확인
+        top = (
+            top.join(Product, Product.product_id == ProductSalesRollup.product_id)
+            .where(ProductSalesRollup.category_id == category_id, Product.category_id == category_id)
+        )
+    if after is not None:
+        top = top.where(or_(
+            ProductSalesRollup.total_sales < after[0],
+            and_(ProductSalesRollup.total_sales == after[0], ProductSalesRollup.product_id < after[1]),
+        ))
+    top = (
+        top.order_by(desc(ProductSalesRollup.total_sales), desc(ProductSalesRollup.product_id))
+        .limit(limit)
+        .subquery()
+    )
+
+    q = (
+        select(
+            Product.product_id.label("product_id"),
+            Product.product_code,
+            Product.product_name,
+            Product.device,
+            top.c.total_qty,
+            top.c.total_sales,
+            top.c.last_order_date,
+        )
+        .join(top, top.c.product_id == Product.product_id)
+        .order_by(desc(top.c.total_sales), desc(top.c.product_id))
+    )
+
+    return (await db.execute(q)).mappings().all()
+
+
+async def fetch_unranked_products(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    bucket: str,
+    limit: int,
+    category_id: Optional[int],
+    after: Optional[tuple[int, int]] = None,
+):
+    """
+    순위 인덱스 뒤에 이어지는 부분: bucket에서 판매액이 0 이하이거나 판매 기록이 없는 상품.
+    (total_sales, product_id) 역순이라 fetch_ranked_products 결과 바로 뒤에 붙이면 전체 순서가 된다.
+    """
+    total_sales = func.coalesce(ProductSalesRollup.total_sales, 0)
+
+    q = (
+        select(
+            Product.product_id.label("product_id"),
+            Product.product_code,
+            Product.product_name,
+            Product.device,
+            func.coalesce(ProductSalesRollup.total_qty, 0).label("total_qty"),
+            total_sales.label("total_sales"),
+            ProductSalesRollup.last_order_date,
+        )
+        .select_from(Product)
+        .join(
+            ProductSalesRollup,
+            and_(
+                ProductSalesRollup.site_id == Product.site_id,
+                ProductSalesRollup.bucket == bucket,
+                ProductSalesRollup.product_id == Product.product_id,
+            ),
+            isouter=True,
+        )
+        .where(Product.site_id.in_(site_ids), total_sales <= 0)
+    )
+    if category_id is not None:
+        q = q.where(Product.category_id == category_id)
+    if after is not None:
+        q = q.where(or_(
+            total_sales < after[0],
+            and_(total_sales == after[0], Product.product_id < after[1]),
+        ))
+    q = q.order_by(desc("total_sales"), desc(Product.product_id)).limit(limit)
+
+    return (await db.execute(q)).mappings().all()
+
+
+async def fetch_top_products(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    limit: int,
+    from_date: Optional[date],
+    to_date: Optional[date],
+    category_id: Optional[int],
+    after: Optional[tuple[int, int]] = None,
+):
+    """
+    기간이 bucket과 맞으면 순위 인덱스 + 판매 없는 상품, 아니면 일별 롤업 합산.
+    어느 쪽을 탈지는 기간만으로 정해지므로 같은 커서로 이어지는 페이지는 항상 같은 경로를 탄다.
+    """
+    bucket = top_products_bucket(from_date, to_date)
+    if bucket is None:
+        q = top_products_query(site_ids, from_date, to_date, category_id, after).limit(limit)
+        return (await db.execute(q)).mappings().all()
+
+    rows = list(await fetch_ranked_products(db, site_ids, bucket, limit, category_id, after))
+    if len(rows) < limit:
+        rows += await fetch_unranked_products(db, site_ids, bucket, limit - len(rows), category_id, after)
+    return rows
+
+
+def top_products_query(
+    site_ids: Sequence[int],
+    from_date: Optional[date],
+    to_date: Optional[date],
+    category_id: Optional[int],
+    after: Optional[tuple[int, int]] = None,
+):
+    """
+    일별 롤업을 상품 단위로 합산해서 상품과 외부 조인. limit 없이 (total_sales, product_id) 역순.
+    원본 쿼리 / product_sales_rollup과 같은 규칙: 카테고리는 현재 Product.category_id, 합계는 그 상품의 전체 판매.
+    """
+    products = select(Product.product_id).where(Product.site_id.in_(site_ids))
+    if category_id is not None:
+        products = products.where(Product.category_id == category_id)
+
+    agg = (
+        select(
+            DailySalesRollup.product_id,
+            func.sum(DailySalesRollup.sales_count).label("total_qty"),
+            func.sum(DailySalesRollup.sales_amount).label("total_sales"),
+            func.nullif(func.max(DailySalesRollup.day), UNDATED).label("last_order_date"),
+        )
+        .where(
+            DailySalesRollup.site_id.in_(site_ids),
+            DailySalesRollup.product_id.in_(products),
+        )
+    )
+    if from_date or to_date:
+        # 원본 쿼리처럼 날짜 조건이 있으면 주문일 없는 행은 빠진다
+        agg = agg.where(DailySalesRollup.day > UNDATED)
+    if from_date:
+        agg = agg.where(DailySalesRollup.day >= from_date)
+    if to_date:
+        agg = agg.where(DailySalesRollup.day <= to_date)
+    agg = agg.group_by(DailySalesRollup.product_id).subquery()
+
+    total_sales = func.coalesce(agg.c.total_sales, 0).label("total_sales")
+
+    q = (
+        select(
+            Product.product_id.label("product_id"),
+            Product.product_code,
+            Product.product_name,
+            Product.device,
+            func.coalesce(agg.c.total_qty, 0).label("total_qty"),
+            total_sales,
+            agg.c.last_order_date,
+        )
+        .select_from(Product)
+        .join(agg, agg.c.product_id == Product.product_id, isouter=True)
+        .where(Product.site_id.in_(site_ids))
+    )
+    if category_id is not None:
+        q = q.where(Product.category_id == category_id)
+    if after is not None:
+        q = q.where(or_(
+            total_sales < after[0],
+            and_(total_sales == after[0], Product.product_id < after[1]),
+        ))
+
+    return q.order_by(desc("total_sales"), desc(Product.product_id))
+
+
+# ---------- Device Share ----------
+async def fetch_device_share(db: AsyncSession, site_ids: Sequence[int], metric: str):
+    value = (
+        func.coalesce(func.sum(DailySalesRollup.sales_amount), 0)
+        if metric == "amount"
+        else func.coalesce(func.sum(DailySalesRollup.sales_count), 0)
+    ).label("value")
+    device = func.nullif(DailySalesRollup.device, "")
+
+    q = (
+        select(device.label("device"), value)
+        .where(DailySalesRollup.site_id.in_(site_ids))
+        .group_by(device)
+        .order_by(desc("value"))
+    )
+
+    return (await db.execute(q)).mappings().all()
+
+
+# ---------- Orders By Category ----------
+async def fetch_orders_by_category(db: AsyncSession, site_ids: Sequence[int], metric: str):
+    value = (
+        func.coalesce(func.sum(DailySalesRollup.sales_amount), 0)
+        if metric == "amount"
+        else func.coalesce(func.sum(DailySalesRollup.sales_count), 0)
+    ).label("value")
+
+    q = (
+        select(Category.category_name, value)
+        .join(DailySalesRollup, DailySalesRollup.category_id == Category.category_id)
+        .where(DailySalesRollup.site_id.in_(site_ids))
+        .group_by(Category.category_name)
+        .order_by(desc("value"))
+    )
+
+    return (await db.execute(q)).mappings().all()
@@ -0,0 +1,66 @@
+# 유입(visit_sources) 조회: 방문수는 (사이트, 일자, 유입경로) 단위로 쌓여 있어서 기간 합계로 읽는다
+# visit_day가 없는 예전 행은 전체 기간 조회(날짜 조건 없음)에만 포함된다.
+
+
+from datetime import date
+from typing import Optional, Sequence
+
+from sqlalchemy import select, func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import VisitSource
+
+
+def visits_between(
+    site_ids: Sequence[int],
+    from_d: Optional[date] = None,
+    to_d: Optional[date] = None,
+    before: Optional[date] = None,
+):
+    """[from_d, to_d] (또는 [from_d, before)) 방문수 합계 select. KPI 쿼리에 스칼라 서브쿼리로 끼워 쓴다."""
+    q = select(func.coalesce(func.sum(VisitSource.visit_count), 0)).where(
+        VisitSource.site_id.in_(site_ids)
+    )
+    if from_d:
+        q = q.where(VisitSource.visit_day >= from_d)
+    if to_d:
+        q = q.where(VisitSource.visit_day <= to_d)
+    if before:
+        q = q.where(VisitSource.visit_day < before)
+    return q
+
+
+async def fetch_visits(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+):
+    return (await db.execute(visits_between(site_ids, from_date, to_date))).scalar_one()
+
+
+async def fetch_top_sources(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    from_date: Optional[date],
+    to_date: Optional[date],
+    limit: int,
+):
+    visits = func.coalesce(func.sum(VisitSource.visit_count), 0).label("visits")
+
+    q = (
+        select(VisitSource.source_type, visits)
+        .where(VisitSource.site_id.in_(site_ids))
+    )
+    if from_date:
+        q = q.where(VisitSource.visit_day >= from_date)
+    if to_date:
+        q = q.where(VisitSource.visit_day <= to_date)
+
+    q = (
+        q.group_by(VisitSource.source_type)
+        .order_by(desc("visits"))
+        .limit(limit)
+    )
+
+    return (await db.execute(q)).mappings().all()
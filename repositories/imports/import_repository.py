@@ -0,0 +1,46 @@
+# 대량 적재: 테넌트 소유 확인 + multi-row INSERT (commit은 서비스에서 청크 단위로)
+
+
+from typing import Iterable, Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Order, OrderProduct, Product, User
+
+
+async def fetch_tenant_user_ids(db: AsyncSession, site_ids: Sequence[int], user_ids: Iterable[int]) -> set[int]:
+    q = select(User.user_id).where(
+        User.user_id.in_(set(user_ids)),
+        User.site_id.in_(site_ids),
+    )
+    return set((await db.execute(q)).scalars().all())
+
+
+async def fetch_tenant_product_ids(db: AsyncSession, site_ids: Sequence[int], product_ids: Iterable[int]) -> set[int]:
+    q = select(Product.product_id).where(
+        Product.product_id.in_(set(product_ids)),
+        Product.site_id.in_(site_ids),
+    )
+    return set((await db.execute(q)).scalars().all())
+
+
+async def fetch_tenant_order_ids(db: AsyncSession, site_ids: Sequence[int], order_ids: Iterable[int]) -> set[int]:
+    q = (
+        select(Order.order_id)
+        .join(User, User.user_id == Order.user_id)
+        .where(
+            Order.order_id.in_(set(order_ids)),
+            User.site_id.in_(site_ids),
+        )
+    )
+    return set((await db.execute(q)).scalars().all())
+
+
+async def insert_orders(db: AsyncSession, rows: list[dict]) -> None:
+    # executemany -> 드라이버가 multi-row VALUES로 묶어서 보낸다
+    await db.execute(insert(Order), rows)
+
+
+async def insert_order_products(db: AsyncSession, rows: list[dict]) -> None:
+    await db.execute(insert(OrderProduct), rows)
@@ -0,0 +1,66 @@
+# 이벤트 카운터 upsert: 수집 버퍼가 모아둔 (일자, 종류, 상품, 사용자) 행을 multi-row INSERT 한 번으로 반영
+# 수집 키(사이트별) 조회/발급도 여기서
+
+
+import hashlib
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import Event, Product, Site, User
+
+
+def hash_ingest_key(key: str) -> bytes:
+    return hashlib.sha256(key.encode()).digest()
+
+
+async def fetch_site_id_by_ingest_key(db: AsyncSession, key: str) -> Optional[int]:
+    q = select(Site.site_id).where(Site.ingest_key_hash == hash_ingest_key(key))
+    return (await db.execute(q)).scalar_one_or_none()
+
+
+async def set_ingest_key(db: AsyncSession, customer_id: int, site_id: int, key: str) -> bool:
+    """customer 소유 사이트의 수집 키를 바꾼다. 소유한 사이트가 아니면 False. commit은 호출하는 쪽에서."""
+    stmt = (
+        update(Site)
+        .where(Site.site_id == site_id, Site.customer_id == customer_id)
+        .values(ingest_key_hash=hash_ingest_key(key))
+    )
+    return (await db.execute(stmt)).rowcount > 0
+
+
+async def fetch_owner_sites(
+    db: AsyncSession,
+    product_ids: Iterable[int],
+    user_ids: Iterable[int],
+) -> tuple[dict[int, int], dict[int, int]]:
+    """
+    상품/사용자 id -> site_id. 없는 id는 빠진다.
+    FK 위반으로 배치 전체가 실패하지 않게, 그리고 다른 사이트의 카운터에 쓰지 못하게 확인하는 용도.
+    """
+    product_ids, user_ids = set(product_ids), set(user_ids)
+    product_sites: dict[int, int] = {}
+    user_sites: dict[int, int] = {}
+
+    if product_ids:
+        q = select(Product.product_id, Product.site_id).where(Product.product_id.in_(product_ids))
+        product_sites = dict((await db.execute(q)).all())
+    if user_ids:
+        q = select(User.user_id, User.site_id).where(User.user_id.in_(user_ids))
+        user_sites = dict((await db.execute(q)).all())
+
+    return product_sites, user_sites
+
+
+async def upsert_event_counts(db: AsyncSession, rows: list[dict]) -> None:
+    """
+    rows: event_day, event_category, product_id, user_id, event_count
+    같은 키가 이미 있으면 event_count를 더한다. commit은 호출하는 쪽에서.
+    """
+    stmt = mysql_insert(Event).values(rows)
+    stmt = stmt.on_duplicate_key_update(
+        event_count=Event.event_count + stmt.inserted.event_count,
+    )
+    await db.execute(stmt)
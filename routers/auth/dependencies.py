@@ -0,0 +1,30 @@
+# routers/auth/dependencies.py : 라우터들이 같이 쓰는 인증 의존성
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+
+from config.settings import settings
+
+
+security = HTTPBearer()
+
+
+async def get_current_customer_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> int:
+    """
+    Authorization 헤더의 Bearer 토큰에서 customer_id 추출.
+    캐시 히트면 CPU 작업이 거의 없어서 스레드풀로 넘기지 않고 async로 실행.
+    """
+    # 인증 스택(jose/passlib)은 호출 시점에 import (수집 전용 워커가 통계 라우트 때문에 올리지 않도록)
+    from services.auth.token_service import TokenService
+
+    token = credentials.credentials  # "Bearer xxx" 중 xxx 부분
+    return TokenService.get_current_customer_id(token)
+
+
+async def require_admin(customer_id: int = Depends(get_current_customer_id)) -> int:
+    """운영용 엔드포인트(캐시/버퍼 통계 등)는 테넌트를 가로지르는 값이라 ADMIN_CUSTOMER_IDS만 허용"""
+    if customer_id not in settings.ADMIN_CUSTOMER_IDS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return customer_id
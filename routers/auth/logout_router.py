@@ -1,29 +1,16 @@
 # routers/auth/logout_repository.py
 
 from fastapi import APIRouter, Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.database import get_db
+from database.session import get_db
+from routers.auth.dependencies import get_current_customer_id
 from schemas.auth.logout_schema import LogoutRequest, LogoutResponse
 from services.auth.logout_service import LogoutService
-from services.auth.token_service import TokenService
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-security = HTTPBearer()
-
-
-def get_current_customer_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> int:
-    """
-    Authorization 헤더의 Bearer 토큰에서 customer_id 추출.
-    """
-    token = credentials.credentials  # "Bearer xxx" 중 xxx 부분
-    return TokenService.get_current_customer_id(token)
-
 
 @router.post(
     "/logout",
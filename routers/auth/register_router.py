@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.database import get_db
+from database.session import get_db
 from schemas.auth.register_shema import SignupRequest, CustomerResponse
 from services.auth.register_service import AuthService
 
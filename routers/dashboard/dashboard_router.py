@@ -9,6 +9,13 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.session import get_db
+from routers.auth.dependencies import require_admin
+from routers.dashboard.dependencies import get_current_site_ids
+from schemas.dashboard.aggregate_schema import AggregateRequest
+from schemas.dashboard.bundle_schema import BundleRequest
+from services.dashboard.aggregate_service import get_aggregate
+from services.dashboard.bundle_service import get_bundle
+from services.dashboard.cache import dashboard_cache, track_cache_status
 from services.dashboard.dashboard_service import (
     get_kpi_summary,
     get_monthly_sales,
@@ -16,27 +23,35 @@ from services.dashboard.dashboard_service import (
     get_device_share,
     get_orders_by_category,
     get_funnel,
+    get_traffic_sources,
 )
 
-router = APIRouter(prefix="/api/v1", tags=["dashboard"])
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["dashboard"],
+    dependencies=[Depends(track_cache_status)],  # X-Cache / Age 헤더
+)
 
 
 # KPI Summary
 @router.get("/kpis/summary")
 async def kpi_summary(
     days: int = Query(7, ge=1, le=30),
+    compare: bool = Query(True, description="직전 동일 기간과 비교"),
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
     db: AsyncSession = Depends(get_db),
 ):
-    return await get_kpi_summary(db, days)
+    return await get_kpi_summary(db, site_ids, days, compare)
 
 
 # Monthly Sales
 @router.get("/charts/monthly-sales")
 async def monthly_sales(
     months: int = Query(12, ge=1, le=36),
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
     db: AsyncSession = Depends(get_db),
 ):
-    return await get_monthly_sales(db, months)
+    return await get_monthly_sales(db, site_ids, months)
 
 
 # Top Products
@@ -46,27 +61,31 @@ async def top_products(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     category_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, max_length=200, description="이전 응답의 next_cursor"),
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
     db: AsyncSession = Depends(get_db),
 ):
-    return await get_top_products(db, limit, from_date, to_date, category_id)
+    return await get_top_products(db, site_ids, limit, from_date, to_date, category_id, cursor)
 
 
 # Device Share
 @router.get("/tables/device-share")
 async def device_share(
     metric: str = Query("amount", pattern="^(amount|count)$"),
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
     db: AsyncSession = Depends(get_db),
 ):
-    return await get_device_share(db, metric)
+    return await get_device_share(db, site_ids, metric)
 
 
 # Orders by Category
 @router.get("/charts/orders-by-category")
 async def orders_by_category(
     metric: str = Query("amount", pattern="^(amount|count)$"),
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
     db: AsyncSession = Depends(get_db),
 ):
-    return await get_orders_by_category(db, metric)
+    return await get_orders_by_category(db, site_ids, metric)
 
 
 # Funnel
@@ -74,6 +93,44 @@ async def orders_by_category(
 async def funnel(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
     db: AsyncSession = Depends(get_db),
 ):
-    return await get_funnel(db, from_date, to_date)
+    return await get_funnel(db, site_ids, from_date, to_date)
+
+
+# Traffic Sources (유입경로별 방문수 상위)
+@router.get("/tables/traffic-sources")
+async def traffic_sources(
+    limit: int = Query(10, ge=1, le=100),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_traffic_sources(db, site_ids, from_date, to_date, limit)
+
+
+# Bundle (여러 위젯을 요청 한 번으로)
+@router.post("/dashboard/bundle")
+async def dashboard_bundle(
+    data: BundleRequest,
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
+):
+    return await get_bundle(site_ids, data)
+
+
+# Aggregate (차원/지표/필터를 골라서 집계, 허용된 조합만)
+@router.post("/aggregate")
+async def aggregate(
+    data: AggregateRequest,
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_aggregate(db, site_ids, **data.model_dump())
+
+
+# Cache Stats (히트율 튜닝용, 운영자만)
+@router.get("/dashboard/cache/stats", dependencies=[Depends(require_admin)])
+async def dashboard_cache_stats():
+    return dashboard_cache.stats()
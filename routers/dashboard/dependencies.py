@@ -0,0 +1,15 @@
+# routers/dashboard/dependencies.py : 대시보드 라우터 공통 의존성
+
+from fastapi import Depends
+
+from routers.auth.dependencies import get_current_customer_id
+from services.dashboard.tenant_service import get_site_ids
+
+
+async def get_current_site_ids(
+    customer_id: int = Depends(get_current_customer_id),
+) -> tuple[int, ...]:
+    """
+    로그인한 customer가 소유한 site_id 목록. 모든 대시보드 쿼리가 이 범위로 제한된다.
+    """
+    return await get_site_ids(customer_id)
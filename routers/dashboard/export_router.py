@@ -0,0 +1,29 @@
+# routers/dashboard/export_router.py : 대시보드 테이블 다운로드 (chunked 응답)
+
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from routers.dashboard.dependencies import get_current_site_ids
+from services.dashboard.export_service import MEDIA_TYPES, stream_top_products
+
+router = APIRouter(prefix="/api/v1/exports", tags=["dashboard"])
+
+
+# Top Products 전체 (limit 없음)
+@router.get("/top-products")
+async def export_top_products(
+    request: Request,
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    category_id: Optional[int] = Query(None),
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
+):
+    return StreamingResponse(
+        stream_top_products(site_ids, format, from_date, to_date, category_id, request.is_disconnected),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="top-products.{format}"'},
+    )
@@ -0,0 +1,55 @@
+# routers/imports/import_router.py : 주문 대량 적재 (요청 바디를 스트림으로 읽음)
+
+import os
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.background import BackgroundTask
+
+from routers.dashboard.dependencies import get_current_site_ids
+from services.imports.import_service import after_import, get_report, run_import
+
+router = APIRouter(prefix="/api/v1/imports", tags=["imports"])
+
+
+# NDJSON 또는 CSV(첫 줄 헤더) 바디를 그대로 올린다. 롤업/캐시 갱신은 응답 후 백그라운드로
+# import_id를 직접 주면 적재 중에 GET /imports/{import_id}로 진행 상황을 볼 수 있다
+@router.post("/{table}")
+async def import_rows(
+    table: Literal["orders", "order_products"],
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    import_id: Optional[str] = Query(None, max_length=64, pattern=r"^[A-Za-z0-9_-]+$"),
+    site_ids: tuple[int, ...] = Depends(get_current_site_ids),
+):
+    if import_id is not None and get_report(import_id) is not None:
+        raise HTTPException(status_code=409, detail="import_id already used")
+
+    report = await run_import(site_ids, table, format, request.stream(), import_id)
+    return JSONResponse(
+        jsonable_encoder(report.as_dict()),
+        background=BackgroundTask(after_import, report),
+    )
+
+
+def _own_report(import_id: str, site_ids: tuple[int, ...]):
+    report = get_report(import_id)
+    if report is None or report.site_ids != site_ids:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return report
+
+
+# 진행 상황 (적재 중에도 조회 가능)
+@router.get("/{import_id}")
+async def import_status(import_id: str, site_ids: tuple[int, ...] = Depends(get_current_site_ids)):
+    return _own_report(import_id, site_ids).as_dict()
+
+
+@router.get("/{import_id}/rejects")
+async def import_rejects(import_id: str, site_ids: tuple[int, ...] = Depends(get_current_site_ids)):
+    report = _own_report(import_id, site_ids)
+    if report.rejects_file is None or not os.path.exists(report.rejects_file):
+        raise HTTPException(status_code=404, detail="No rejected rows")
+    return FileResponse(report.rejects_file, media_type="application/x-ndjson")
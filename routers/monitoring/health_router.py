@@ -0,0 +1,20 @@
+# routers/monitoring/health_router.py : 로드밸런서 / 오케스트레이터용 헬스체크
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+router = APIRouter(prefix="/health", tags=["monitoring"])
+
+
+# 프로세스가 살아 있으면 200
+@router.get("/live", include_in_schema=False)
+async def live():
+    return {"status": "ok"}
+
+
+# 준비 작업(풀 채우기, 쿼리 컴파일 등)이 끝나야 200. 그 전엔 503
+@router.get("/ready", include_in_schema=False)
+async def ready(request: Request):
+    state = request.app.state
+    body = {"ready": state.ready, "startup": state.startup}
+    return JSONResponse(body, status_code=200 if state.ready else 503)
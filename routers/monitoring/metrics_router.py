@@ -0,0 +1,20 @@
+# routers/monitoring/metrics_router.py : Prometheus 스크랩 엔드포인트
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from database.session import pool_stats
+from services.monitoring.metrics import render
+
+router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# 커넥션 풀 상태 (체크아웃 수, overflow, 대기 시간 백분위, 연결 실패)
+@router.get("/metrics/db-pool", include_in_schema=False)
+async def db_pool_stats():
+    return pool_stats()
@@ -0,0 +1,17 @@
+# routers/tracking/dependencies.py : 수집 라우터 공통 의존성
+
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+
+from services.tracking.ingest_key_service import resolve_site_id
+
+
+async def get_ingest_site_id(x_ingest_key: Optional[str] = Header(None)) -> int:
+    """
+    X-Ingest-Key 헤더의 사이트별 수집 키로 사이트를 인증. 이벤트는 이 사이트의 상품/사용자에만 쌓인다.
+    """
+    site_id = await resolve_site_id(x_ingest_key) if x_ingest_key else None
+    if site_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid ingest key")
+    return site_id
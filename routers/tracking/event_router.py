@@ -0,0 +1,45 @@
+# routers/tracking/event_router.py : 스토어프론트 태그가 보내는 클릭/장바구니 이벤트 수집
+
+from typing import Union
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.session import get_db
+from routers.auth.dependencies import get_current_customer_id, require_admin
+from routers.tracking.dependencies import get_ingest_site_id
+from schemas.tracking.event_schema import EventAccepted, EventBatch, EventIn, IngestKeyIssued
+from services.tracking.event_buffer import event_buffer
+from services.tracking.event_service import ingest_events
+from services.tracking.ingest_key_service import issue_ingest_key
+
+router = APIRouter(prefix="/api/v1", tags=["tracking"])
+
+
+# 이벤트 하나 또는 {"events": [...]} 배치. DB 반영은 버퍼에서 비동기로
+@router.post("/events", response_model=EventAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def collect_events(
+    data: Union[EventBatch, EventIn],
+    site_id: int = Depends(get_ingest_site_id),
+):
+    events = data.events if isinstance(data, EventBatch) else [data]
+    return {"accepted": ingest_events(site_id, events)}
+
+
+# 사이트 수집 키 발급/재발급 (스토어프론트 태그 설정용, 원문은 이 응답에서만 보인다)
+@router.post("/sites/{site_id}/ingest-key", response_model=IngestKeyIssued)
+async def rotate_ingest_key(
+    site_id: int,
+    customer_id: int = Depends(get_current_customer_id),
+    db: AsyncSession = Depends(get_db),
+):
+    key = await issue_ingest_key(db, customer_id, site_id)
+    if key is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Site not found")
+    return {"site_id": site_id, "ingest_key": key}
+
+
+# 버퍼 상태 (운영자만)
+@router.get("/events/stats", dependencies=[Depends(require_admin)])
+async def event_stats():
+    return event_buffer.stats()
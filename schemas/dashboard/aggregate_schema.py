@@ -0,0 +1,71 @@
+# schemas/dashboard/aggregate_schema.py
+
+from datetime import date, timedelta
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+Dimension = Literal["device", "category", "product", "day", "week", "month"]
+Metric = Literal["amount", "count"]
+
+TIME_DIMENSIONS = ("day", "week", "month")
+
+# 시간 차원별 최대 조회 기간(일). 그룹 수가 끝없이 늘어나지 않도록 기간을 꼭 받는다.
+MAX_RANGE_DAYS = {"day": 366, "week": 366 * 3}
+MAX_PRODUCT_MONTH_RANGE_DAYS = 366   # 상품 x 월은 상품 수만큼 곱해져서 1년까지만
+
+
+def bucket_count(dim: str, from_date: date, to_date: date) -> int:
+    """[from_date, to_date] 기간의 시간 bucket 수 (주는 월요일 시작)"""
+    if dim == "day":
+        return (to_date - from_date).days + 1
+    if dim == "week":
+        return (to_date - (from_date - timedelta(days=from_date.weekday()))).days // 7 + 1
+    return (to_date.year - from_date.year) * 12 + to_date.month - from_date.month + 1
+
+
+class AggregateRequest(BaseModel):
+    dimensions: list[Dimension] = Field(..., min_length=1, max_length=2)
+    metrics: list[Metric] = Field(["amount"], min_length=1, max_length=2)
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+    category_id: Optional[int] = None
+    device: Optional[str] = Field(None, min_length=1, max_length=20)
+    limit: int = Field(100, ge=1, le=1000)
+
+    @model_validator(mode="after")
+    def check_allowed(self):
+        """허용된 조합만 통과 (무거운 쿼리가 만들어지지 않도록)"""
+        if len(set(self.dimensions)) != len(self.dimensions):
+            raise ValueError("dimensions must be unique")
+        if len(set(self.metrics)) != len(self.metrics):
+            raise ValueError("metrics must be unique")
+        if self.from_date and self.to_date and self.from_date > self.to_date:
+            raise ValueError("from_date must be on or before to_date")
+
+        time_dims = [d for d in self.dimensions if d in TIME_DIMENSIONS]
+        if len(time_dims) > 1:
+            raise ValueError("only one of day/week/month can be used")
+        if "product" in self.dimensions and time_dims and time_dims[0] != "month":
+            raise ValueError("product can only be combined with month")
+
+        for dim in time_dims:
+            max_days = MAX_RANGE_DAYS.get(dim)
+            if "product" in self.dimensions:
+                max_days = MAX_PRODUCT_MONTH_RANGE_DAYS
+            if max_days is None:
+                continue
+            if not (self.from_date and self.to_date):
+                raise ValueError(f"{dim} requires from_date and to_date")
+            if (self.to_date - self.from_date).days + 1 > max_days:
+                raise ValueError(f"{dim} range must be at most {max_days} days")
+
+        # 시간순으로 limit개까지만 읽으므로 bucket 수가 limit을 넘으면 뒤쪽 기간이 잘린다
+        # (다른 차원과 묶으면 그 값 수만큼 더 늘어나는데, 그건 응답의 truncated로 알린다)
+        if time_dims and self.from_date and self.to_date:
+            buckets = bucket_count(time_dims[0], self.from_date, self.to_date)
+            if buckets > self.limit:
+                raise ValueError(f"{time_dims[0]} range has {buckets} buckets, more than limit {self.limit}")
+
+        return self
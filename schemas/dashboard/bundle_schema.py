@@ -0,0 +1,105 @@
+# schemas/dashboard/bundle_schema.py
+
+from datetime import date
+from typing import Annotated, Literal, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from schemas.dashboard.aggregate_schema import AggregateRequest
+
+
+# ---------- 위젯별 파라미터 (dashboard_router의 Query 제약과 동일) ----------
+class KpiSummaryParams(BaseModel):
+    days: int = Field(7, ge=1, le=30)
+    compare: bool = True
+
+
+class MonthlySalesParams(BaseModel):
+    months: int = Field(12, ge=1, le=36)
+
+
+class TopProductsParams(BaseModel):
+    limit: int = Field(10, ge=1, le=100)
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+    category_id: Optional[int] = None
+    cursor: Optional[str] = Field(None, max_length=200)
+
+
+class MetricParams(BaseModel):
+    metric: str = Field("amount", pattern="^(amount|count)$")
+
+
+class FunnelParams(BaseModel):
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+
+
+class TrafficSourcesParams(BaseModel):
+    limit: int = Field(10, ge=1, le=100)
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+
+
+# ---------- 위젯 스펙 ----------
+class _WidgetBase(BaseModel):
+    id: Optional[str] = Field(None, max_length=50, description="응답에서 위젯을 구분할 이름 (기본: widget)")
+
+
+class KpiSummaryWidget(_WidgetBase):
+    widget: Literal["kpis/summary"]
+    params: KpiSummaryParams = KpiSummaryParams()
+
+
+class MonthlySalesWidget(_WidgetBase):
+    widget: Literal["monthly-sales"]
+    params: MonthlySalesParams = MonthlySalesParams()
+
+
+class TopProductsWidget(_WidgetBase):
+    widget: Literal["top-products"]
+    params: TopProductsParams = TopProductsParams()
+
+
+class DeviceShareWidget(_WidgetBase):
+    widget: Literal["device-share"]
+    params: MetricParams = MetricParams()
+
+
+class OrdersByCategoryWidget(_WidgetBase):
+    widget: Literal["orders-by-category"]
+    params: MetricParams = MetricParams()
+
+
+class FunnelWidget(_WidgetBase):
+    widget: Literal["funnel"]
+    params: FunnelParams = FunnelParams()
+
+
+class TrafficSourcesWidget(_WidgetBase):
+    widget: Literal["traffic-sources"]
+    params: TrafficSourcesParams = TrafficSourcesParams()
+
+
+class AggregateWidget(_WidgetBase):
+    widget: Literal["aggregate"]
+    params: AggregateRequest
+
+
+WidgetSpec = Annotated[
+    Union[
+        KpiSummaryWidget,
+        MonthlySalesWidget,
+        TopProductsWidget,
+        DeviceShareWidget,
+        OrdersByCategoryWidget,
+        FunnelWidget,
+        TrafficSourcesWidget,
+        AggregateWidget,
+    ],
+    Field(discriminator="widget"),
+]
+
+
+class BundleRequest(BaseModel):
+    widgets: list[WidgetSpec] = Field(..., min_length=1, max_length=20)
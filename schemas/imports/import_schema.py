@@ -0,0 +1,27 @@
+# schemas/imports/import_schema.py : 대량 적재 행 검증 (models.Order / models.OrderProduct 컬럼과 동일)
+
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class OrderRow(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    order_id: Optional[int] = Field(None, ge=1)   # 없으면 AUTO_INCREMENT
+    order_date: Optional[date] = None
+    order_count: Optional[int] = Field(None, ge=0)
+    order_amount: Optional[int] = Field(None, ge=0)
+    user_id: int = Field(..., ge=1)                # 테넌트 확인용이라 필수
+
+
+class OrderProductRow(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    order_product_id: Optional[int] = Field(None, ge=1)
+    product_id: int = Field(..., ge=1)
+    order_product_date: Optional[date] = None
+    order_product_count: Optional[int] = Field(None, ge=0)
+    order_product_amount: Optional[int] = Field(None, ge=0)
+    order_id: int = Field(..., ge=1)
@@ -0,0 +1,50 @@
+# schemas/tracking/event_schema.py
+
+from datetime import date, timedelta
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from config.settings import settings
+
+
+class EventIn(BaseModel):
+    event_category: str = Field(..., min_length=1, max_length=20, description="click, cart 등")
+    event_day: Optional[date] = Field(None, description="없으면 서버 기준 오늘")
+    product_id: Optional[int] = None
+    user_id: Optional[int] = None
+    count: int = Field(1, ge=1, le=10000)
+
+    @field_validator("event_day")
+    @classmethod
+    def check_event_day(cls, value: Optional[date]) -> Optional[date]:
+        # 오늘 전후 며칠만 (지난 날짜/먼 미래의 카운터를 마음대로 바꾸지 못하게)
+        if value is None:
+            return value
+        today = date.today()
+        if not today - timedelta(days=settings.EVENT_DAY_MAX_PAST_DAYS) <= value <= today + timedelta(days=settings.EVENT_DAY_MAX_FUTURE_DAYS):
+            raise ValueError(
+                f"event_day must be within {settings.EVENT_DAY_MAX_PAST_DAYS} days before "
+                f"and {settings.EVENT_DAY_MAX_FUTURE_DAYS} day after today"
+            )
+        return value
+
+    @model_validator(mode="after")
+    def check_owner(self):
+        # 상품도 사용자도 없으면 어느 사이트 이벤트인지 알 수 없음 (대시보드에서 안 보임)
+        if self.product_id is None and self.user_id is None:
+            raise ValueError("product_id or user_id is required")
+        return self
+
+
+class EventBatch(BaseModel):
+    events: list[EventIn] = Field(..., min_length=1, max_length=1000)
+
+
+class EventAccepted(BaseModel):
+    accepted: int
+
+
+class IngestKeyIssued(BaseModel):
+    site_id: int
+    ingest_key: str   # 이때만 원문을 돌려준다 (저장은 해시만)
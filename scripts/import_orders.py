@@ -0,0 +1,63 @@
+# scripts/import_orders.py : 파일에서 orders / order_products 대량 적재 (API와 같은 서비스 사용)
+#
+# 실행: python -m scripts.import_orders --customer-id 1 --table order_products [--format csv] data.ndjson
+# 파일은 1MB씩 읽어서 스트림으로 처리한다. 진행 상황은 1초마다 출력, 끝나면 롤업/캐시까지 갱신.
+
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+
+from database.session import engine
+from services.dashboard.tenant_service import get_site_ids
+from services.imports.import_service import TABLES, after_import, get_report, run_import
+from services.imports.parsers import FORMATS, read_file_chunks
+
+
+async def print_progress(import_id: str) -> None:
+    while True:
+        await asyncio.sleep(1)
+        report = get_report(import_id)
+        if report is not None:
+            print(
+                f"read={report.rows_read} inserted={report.inserted} "
+                f"rejected={report.rejected} rows/s={report.rows_per_s}",
+                file=sys.stderr,
+            )
+
+
+async def run(args) -> int:
+    site_ids = await get_site_ids(args.customer_id)
+    if not site_ids:
+        print(f"customer {args.customer_id} has no sites", file=sys.stderr)
+        return 1
+
+    import_id = f"cli-{uuid.uuid4().hex}"
+    progress = asyncio.create_task(print_progress(import_id))
+    try:
+        report = await run_import(site_ids, args.table, args.format, read_file_chunks(args.file), import_id)
+    finally:
+        progress.cancel()
+
+    await after_import(report)
+    print(json.dumps(jsonable_encoder(report.as_dict()), ensure_ascii=False, indent=2))
+    await engine.dispose()
+    return 0 if report.status == "done" else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customer-id", type=int, required=True)
+    parser.add_argument("--table", choices=tuple(TABLES), required=True)
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("file")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
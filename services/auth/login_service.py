@@ -4,20 +4,18 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi import HTTPException, status
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import settings
 from repositories.auth.login_repository import LoginRepository
 from repositories.auth.refresh_token_repository import RefreshTokenRepository
 from schemas.auth.login_schema import LoginRequest, TokenPair, RefreshRequest
+from services.auth.password_service import password_hasher
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    # bcrypt 검증은 워커 풀에서 (이벤트 루프 블로킹 방지)
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
 def create_access_token(subject: str) -> str:
@@ -35,8 +33,13 @@ def create_access_token(subject: str) -> str:
     return encoded_jwt
 
 
-def create_refresh_token(subject: str) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+def refresh_token_expires_at() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+def create_refresh_token(subject: str, expire: Optional[datetime] = None) -> str:
+    # DB의 expires_at과 토큰 exp를 맞추려면 같은 expire 값을 넘긴다
+    expire = expire or refresh_token_expires_at()
     to_encode = {
         "sub": subject,
         "type": "refresh",
@@ -77,7 +80,7 @@ class LoginService:
             )
 
         # 2) 비밀번호 검증
-        if not verify_password(data.password, customer.password):
+        if not await verify_password(data.password, customer.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
@@ -86,17 +89,18 @@ class LoginService:
         # 3) JWT 발급 (sub로 customer_id 사용)
         subject = str(customer.customer_id)
         access_token = create_access_token(subject)
-        refresh_token = create_refresh_token(subject)
+        expires_at = refresh_token_expires_at()
+        refresh_token = create_refresh_token(subject, expires_at)
 
-        # 기존에 발급된 RefreshToken들 제거 (선택 사항, 한 계정당 1개만 유지하려는 경우)
+        # 기존 RefreshToken 제거 + 새 토큰 저장을 한 트랜잭션으로 (한 계정당 1개만 유지)
         await RefreshTokenRepository.delete_all_by_customer(db, customer.customer_id)
-
-        # 새 RefreshToken DB에 저장
         await RefreshTokenRepository.create(
             db=db,
             customer_id=customer.customer_id,
             token=refresh_token,
+            expires_at=expires_at,
         )
+        await db.commit()
 
         return TokenPair(access_token=access_token, refresh_token=refresh_token)
 
@@ -120,27 +124,27 @@ class LoginService:
 
         customer_id = int(subject)
 
-        # 2) DB에서 해당 토큰이 실제로 존재하는지 확인
-        stored_token = await RefreshTokenRepository.get_by_token(db, data.refresh_token)
-        if stored_token is None or stored_token.customer_id != customer_id:
+        # 2) 토큰 회전(Token rotation): 사용된 기존 토큰을 DELETE 한 번으로 확인 + 삭제
+        deleted = await RefreshTokenRepository.delete_by_token(db, data.refresh_token, customer_id)
+        if not deleted:
             # DB에 없으면 → 이미 삭제된/탈취된/조작된 토큰
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Refresh token not found or revoked",
             )
 
-        # 3) 토큰 회전(Token rotation): 사용된 기존 토큰 삭제
-        await RefreshTokenRepository.delete_by_id(db, stored_token.refresh_token_id)
-
-        # 4) 새 access + 새 refresh 발급
+        # 3) 새 access + 새 refresh 발급
         new_access = create_access_token(subject)
-        new_refresh = create_refresh_token(subject)
+        expires_at = refresh_token_expires_at()
+        new_refresh = create_refresh_token(subject, expires_at)
 
-        # 5) 새 refresh를 DB에 저장
+        # 4) 새 refresh 저장 후 삭제와 함께 한 번에 commit
         await RefreshTokenRepository.create(
             db=db,
             customer_id=customer_id,
             token=new_refresh,
+            expires_at=expires_at,
         )
+        await db.commit()
 
         return TokenPair(access_token=new_access, refresh_token=new_refresh)
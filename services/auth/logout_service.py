@@ -30,4 +30,5 @@ class LogoutService:
                 detail="Refresh token not found",
             )
 
+        await db.commit()
         return LogoutResponse(detail="Successfully logged out")
@@ -0,0 +1,36 @@
+# services/auth/refresh_token_sweeper.py : 만료된 refresh token을 배치 단위로 정리
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from config.settings import settings
+from database.session import async_session
+from repositories.auth.refresh_token_repository import RefreshTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep_expired_refresh_tokens() -> int:
+    """
+    배치마다 따로 commit 해서 테이블 락을 오래 잡지 않는다.
+    삭제한 전체 행 수를 반환.
+    """
+    batch_size = settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE
+    now = datetime.now(timezone.utc)
+    total = 0
+
+    async with async_session() as db:
+        while True:
+            deleted = await RefreshTokenRepository.delete_expired(db, now, batch_size)
+            await db.commit()
+            total += deleted
+
+            if deleted < batch_size:
+                break
+            # 다른 쓰기 작업(로그인/재발급)에 틈을 준다
+            await asyncio.sleep(settings.REFRESH_TOKEN_SWEEP_PAUSE_SECONDS)
+
+    if total:
+        logger.info("deleted %s expired refresh tokens", total)
+    return total
@@ -3,16 +3,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from schemas.auth.register_shema import SignupRequest, CustomerResponse
 from repositories.auth.register_repository import CustomerRepository
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from services.auth.password_service import password_hasher
+from services.dashboard.tenant_service import forget_customer
 
 
 class AuthService:
 
     @staticmethod
-    def hash_password(password: str) -> str:
-        return pwd_context.hash(password)
+    async def hash_password(password: str) -> str:
+        # bcrypt 해싱은 워커 풀에서 (이벤트 루프 블로킹 방지)
+        return await password_hasher.hash(password)
 
     @staticmethod
     def validate_signup(data: SignupRequest) -> None:
@@ -35,7 +35,7 @@ class AuthService:
             raise ValueError("이미 등록된 이메일입니다.")
 
         # 2) 비밀번호 해싱
-        hashed_pw = AuthService.hash_password(data.password)
+        hashed_pw = await AuthService.hash_password(data.password)
 
         # 3) 이름 조합
         full_name = f"{data.last_name}{data.first_name}"
@@ -62,6 +62,8 @@ class AuthService:
         # 6) commit
         await db.commit()
         await db.refresh(customer)
+        # 사이트 구성이 바뀌었으므로 대시보드 조회 범위 캐시를 비운다
+        forget_customer(customer.customer_id)
 
         # 7) 응답 DTO 변환
         return CustomerResponse.model_validate(customer)
@@ -0,0 +1,78 @@
+# services/auth/token_cache.py : 검증이 끝난 access token claim 캐시
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config.settings import settings
+
+
+class VerifiedTokenCache:
+    """
+    토큰 원문 대신 sha256 digest를 키로 저장.
+    항목 만료 시각은 min(토큰 exp, 저장 시각 + ttl) 이라서 토큰보다 오래 살아남지 않는다.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._digest(token)
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        claims, expires_at = item
+        if time.time() >= expires_at:
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if exp is None:
+            return
+        expires_at = min(float(exp), time.time() + self.ttl_seconds)
+
+        key = self._digest(token)
+        self._data[key] = (claims, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+
+access_token_cache = VerifiedTokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
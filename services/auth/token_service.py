@@ -2,6 +2,7 @@
 
 from fastapi import HTTPException, status
 from services.auth.login_service import decode_token
+from services.auth.token_cache import access_token_cache
 
 
 class TokenService:
@@ -11,8 +12,13 @@ class TokenService:
         """
         Access Token의 서명/유효성 체크 후
         customer_id(sub)를 integer로 변환해서 반환.
+        한 번 검증한 토큰은 캐시된 claim을 재사용한다.
         """
 
+        payload = access_token_cache.get(token)
+        if payload is not None:
+            return int(payload["sub"])
+
         payload = decode_token(token)
 
         if payload.get("type") != "access":
@@ -36,4 +42,6 @@ class TokenService:
                 detail="Invalid subject in token",
             )
 
+        # 모든 검증을 통과한 access token만 캐시
+        access_token_cache.put(token, payload)
         return customer_id
@@ -0,0 +1,100 @@
+# services/dashboard/aggregate_service.py : /aggregate 요청을 어떤 소스(원본/롤업)로 읽을지 정하는 플래너
+
+from datetime import date, timedelta
+from typing import Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from repositories.dashboard import aggregate_repository as agg_repo
+from repositories.dashboard.rollup_repository import top_products_bucket
+from services.dashboard.cache import dashboard_cache
+
+
+# 차원/필터 -> 소스에 있어야 하는 컬럼
+_REQUIRED_COLUMNS = {
+    "device": "device",
+    "category": "category_id",
+    "product": "product_id",
+    "day": "day",
+    "week": "day",
+    "month": "day",
+}
+
+
+def _is_month_aligned(from_date: Optional[date], to_date: Optional[date]) -> bool:
+    """기간이 달 단위로 딱 떨어지는지 (월별 롤업은 달 중간에서 자를 수 없음)"""
+    if from_date and from_date.day != 1:
+        return False
+    if to_date and (to_date + timedelta(days=1)).day != 1:
+        return False
+    return True
+
+
+def _covers(source: agg_repo.Source, dimensions, category_id, device) -> bool:
+    needed = {_REQUIRED_COLUMNS[d] for d in dimensions}
+    if category_id is not None:
+        needed.add("category_id")
+    if device is not None:
+        needed.add("device")
+    return all(getattr(source, column) is not None for column in needed)
+
+
+def plan_source(
+    dimensions: Sequence[str],
+    from_date: Optional[date],
+    to_date: Optional[date],
+    category_id: Optional[int],
+    device: Optional[str],
+) -> agg_repo.Source:
+    """
+    요청을 커버하는 가장 작은 소스를 고른다.
+    월별 롤업 -> 상품별 롤업(bucket이 기간과 맞을 때) -> 일별 롤업 순, 롤업을 안 쓰면 원본.
+    """
+    if not settings.DASHBOARD_USE_ROLLUP:
+        return agg_repo.RAW
+
+    candidates = []
+    # 월별 롤업의 day 컬럼은 그 달 1일이라 일/주 차원은 만들 수 없다
+    if _is_month_aligned(from_date, to_date) and not ({"day", "week"} & set(dimensions)):
+        candidates.append(agg_repo.MONTHLY)
+    # 상품별 롤업은 기간이 bucket에 이미 반영돼 있어서 시간 차원과는 못 묶는다
+    bucket = top_products_bucket(from_date, to_date)
+    if bucket is not None and not any(d in ("day", "week", "month") for d in dimensions):
+        candidates.append(agg_repo.product_bucket_source(bucket))
+    candidates.append(agg_repo.DAILY)
+
+    for source in candidates:
+        if _covers(source, dimensions, category_id, device):
+            return source
+    return agg_repo.RAW
+
+
+@dashboard_cache.cached
+async def get_aggregate(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    dimensions: list[str],
+    metrics: list[str],
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    category_id: Optional[int] = None,
+    device: Optional[str] = None,
+    limit: int = 100,
+):
+    source = plan_source(dimensions, from_date, to_date, category_id, device)
+    # 한 행 더 읽어서 limit에서 잘렸는지 알려준다
+    rows = await agg_repo.fetch_aggregate(
+        db, source, site_ids, dimensions, metrics,
+        from_date, to_date, category_id, device, limit + 1,
+    )
+    truncated = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "source": source.name,
+        "dimensions": dimensions,
+        "metrics": metrics,
+        "rows": [dict(r) for r in rows],
+        "count": len(rows),
+        "truncated": truncated,
+    }
@@ -0,0 +1,86 @@
+# services/dashboard/bundle_service.py : 여러 위젯을 위젯별 세션으로 동시에 실행
+
+import asyncio
+import logging
+from time import perf_counter
+from typing import Sequence
+
+from fastapi import HTTPException
+
+from config.settings import settings
+from database.session import read_session
+from schemas.dashboard.bundle_schema import BundleRequest
+from services.dashboard.aggregate_service import get_aggregate
+from services.dashboard.cache import CacheStatus, cache_status_var
+from services.dashboard.dashboard_service import (
+    get_kpi_summary,
+    get_monthly_sales,
+    get_top_products,
+    get_device_share,
+    get_orders_by_category,
+    get_funnel,
+    get_traffic_sources,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# 위젯 이름 -> (db, site_ids, params)를 받아 서비스 함수를 호출하는 핸들러
+WIDGET_HANDLERS = {
+    "kpis/summary": lambda db, s, p: get_kpi_summary(db, s, p.days, p.compare),
+    "monthly-sales": lambda db, s, p: get_monthly_sales(db, s, p.months),
+    "top-products": lambda db, s, p: get_top_products(
+        db, s, p.limit, p.from_date, p.to_date, p.category_id, p.cursor
+    ),
+    "device-share": lambda db, s, p: get_device_share(db, s, p.metric),
+    "orders-by-category": lambda db, s, p: get_orders_by_category(db, s, p.metric),
+    "funnel": lambda db, s, p: get_funnel(db, s, p.from_date, p.to_date),
+    "traffic-sources": lambda db, s, p: get_traffic_sources(
+        db, s, p.from_date, p.to_date, p.limit
+    ),
+    "aggregate": lambda db, s, p: get_aggregate(db, s, **p.model_dump()),
+}
+
+
+async def _run_widget(spec, site_ids: Sequence[int], semaphore: asyncio.Semaphore) -> dict:
+    handler = WIDGET_HANDLERS[spec.widget]
+    result = {"id": spec.id or spec.widget, "widget": spec.widget}
+
+    async with semaphore:
+        # 위젯마다 따로 stale 여부를 기록 (gather가 컨텍스트를 복사하므로 요청 쪽엔 영향 없음)
+        cache_status = CacheStatus()
+        cache_status_var.set(cache_status)
+        started = perf_counter()
+        try:
+            # AsyncSession은 동시 사용이 안 되므로 위젯마다 풀에서 따로 꺼낸다
+            async with read_session() as db:
+                result["data"] = await handler(db, site_ids, spec.params)
+            result["ok"] = True
+        except HTTPException as e:
+            result.update(ok=False, error=str(e.detail))
+        except Exception:
+            logger.exception("dashboard widget %s failed", spec.widget)
+            result.update(ok=False, error="Internal error")
+        result["elapsed_ms"] = round((perf_counter() - started) * 1000, 2)
+        if cache_status.stale:
+            result["stale"] = True
+            result["age_seconds"] = int(cache_status.age)
+
+    return result
+
+
+async def get_bundle(site_ids: Sequence[int], data: BundleRequest) -> dict:
+    """
+    위젯 하나가 실패해도 나머지 결과는 그대로 돌려준다. (ok=False + error)
+    """
+    semaphore = asyncio.Semaphore(settings.DASHBOARD_BUNDLE_CONCURRENCY)
+    started = perf_counter()
+
+    widgets = await asyncio.gather(
+        *(_run_widget(spec, site_ids, semaphore) for spec in data.widgets)
+    )
+
+    return {
+        "widgets": list(widgets),
+        "elapsed_ms": round((perf_counter() - started) * 1000, 2),
+    }
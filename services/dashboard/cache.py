@@ -0,0 +1,393 @@
+# services/dashboard/cache.py : 대시보드 서비스 응답 캐시
+# 키 = 함수 이름 + 정규화된 파라미터, 데이터 워터마크가 바뀌면 무효화
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import time
+from contextvars import ContextVar
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Optional, Protocol
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from database.session import read_session
+from repositories.dashboard import dashboard_repository as repo
+from services.dashboard.circuit_breaker import CircuitOpenError, dashboard_breaker
+from services.dashboard.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    watermark: tuple
+    stored_at: float       # time.time() 기준 (공유 백엔드에서도 비교 가능하도록)
+
+
+class CacheBackend(Protocol):
+    """
+    캐시 저장소 인터페이스. 공유 캐시(Redis 등)를 붙일 때 이것만 구현하면 된다.
+    tenant는 키 공간을 나누는 단위라서 한 테넌트가 다른 테넌트 항목을 밀어내면 안 된다.
+    """
+
+    async def get(self, tenant: str, key: str) -> Optional[CacheEntry]: ...
+
+    async def set(self, tenant: str, key: str, entry: CacheEntry) -> None: ...
+
+    async def delete(self, tenant: str, key: str) -> None: ...
+
+    async def clear(self, tenant: Optional[str] = None) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class InMemoryLRUBackend:
+    """
+    프로세스 내부 LRU. 테넌트마다 따로 LRU를 두고 (max_entries_per_tenant),
+    테넌트 수가 max_tenants를 넘으면 가장 오래 안 쓴 테넌트를 통째로 제거.
+    """
+
+    def __init__(self, max_entries_per_tenant: int, max_tenants: int):
+        self.max_entries_per_tenant = max_entries_per_tenant
+        self.max_tenants = max_tenants
+        self._tenants: OrderedDict[str, OrderedDict[str, CacheEntry]] = OrderedDict()
+        self.evictions = 0
+        self.tenant_evictions = 0
+
+    async def get(self, tenant: str, key: str) -> Optional[CacheEntry]:
+        data = self._tenants.get(tenant)
+        if data is None:
+            return None
+        entry = data.get(key)
+        if entry is not None:
+            data.move_to_end(key)
+            self._tenants.move_to_end(tenant)
+        return entry
+
+    async def set(self, tenant: str, key: str, entry: CacheEntry) -> None:
+        data = self._tenants.get(tenant)
+        if data is None:
+            data = self._tenants[tenant] = OrderedDict()
+            while len(self._tenants) > self.max_tenants:
+                _, dropped = self._tenants.popitem(last=False)
+                self.tenant_evictions += 1
+                self.evictions += len(dropped)
+        self._tenants.move_to_end(tenant)
+
+        data[key] = entry
+        data.move_to_end(key)
+        while len(data) > self.max_entries_per_tenant:
+            data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, tenant: str, key: str) -> None:
+        data = self._tenants.get(tenant)
+        if data is not None:
+            data.pop(key, None)
+
+    async def clear(self, tenant: Optional[str] = None) -> None:
+        if tenant is None:
+            self._tenants.clear()
+        else:
+            self._tenants.pop(tenant, None)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "tenants": len(self._tenants),
+            "entries": sum(len(data) for data in self._tenants.values()),
+            "max_entries_per_tenant": self.max_entries_per_tenant,
+            "max_tenants": self.max_tenants,
+            "evictions": self.evictions,
+            "tenant_evictions": self.tenant_evictions,
+        }
+
+
+class CacheStatus:
+    """
+    요청 하나 동안 캐시 결과(hit/miss/stale)를 기록.
+    response가 있으면 X-Cache / Age 헤더로 바로 내보낸다.
+    """
+
+    def __init__(self, response: Optional[Response] = None):
+        self.response = response
+        self.state: Optional[str] = None
+        self.age: Optional[float] = None
+
+    @property
+    def stale(self) -> bool:
+        return self.state == "stale"
+
+    def mark(self, state: str, age: Optional[float] = None) -> None:
+        # 한 요청에서 여러 번 조회하면 가장 나쁜 상태(stale)를 남긴다
+        if self.stale:
+            return
+        self.state = state
+        self.age = age
+        if self.response is not None:
+            self.response.headers["X-Cache"] = state.upper()
+            if age is not None:
+                self.response.headers["Age"] = str(int(age))
+
+
+cache_status_var: ContextVar[Optional[CacheStatus]] = ContextVar("dashboard_cache_status", default=None)
+
+
+async def track_cache_status(response: Response) -> None:
+    """라우터 의존성: 이 요청의 캐시 상태를 응답 헤더에 싣는다."""
+    cache_status_var.set(CacheStatus(response))
+
+
+def _mark(state: str, age: Optional[float] = None) -> None:
+    cache_status = cache_status_var.get()
+    if cache_status is not None:
+        cache_status.mark(state, age)
+
+
+def build_backend(name: str) -> CacheBackend:
+    if name == "memory":
+        return InMemoryLRUBackend(
+            settings.DASHBOARD_CACHE_MAX_ENTRIES_PER_TENANT,
+            settings.DASHBOARD_CACHE_MAX_TENANTS,
+        )
+    raise ValueError(f"Unknown dashboard cache backend: {name}")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def make_key(name: str, params: dict) -> str:
+    normalized = {k: _normalize(v) for k, v in params.items()}
+    return f"{name}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+def tenant_of(params: dict) -> str:
+    """site_ids 인자로 테넌트 파티션 이름을 만든다. (없으면 공용 파티션)"""
+    site_ids = params.get("site_ids")
+    if site_ids is None:
+        return "_global"
+    return ",".join(str(site_id) for site_id in sorted(site_ids))
+
+
+class DashboardCache:
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_seconds: float,
+        stale_ttl_seconds: float,
+        watermark_ttl_seconds: float,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.watermark_ttl_seconds = watermark_ttl_seconds
+
+        self.singleflight = SingleFlight()
+        # "tenant|key" -> 실행 중인 백그라운드 갱신 (singleflight 설정과 관계없이 키마다 하나만)
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+
+        self._watermark: Optional[tuple] = None
+        self._watermark_checked_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0     # 워터마크가 바뀌어서 버린 횟수
+        self.stale_served = 0
+        self.background_refreshes = 0
+
+    # ---------- Watermark ----------
+    async def _fetch_watermark(self) -> tuple:
+        # 여러 요청이 같이 기다리므로 어느 요청의 세션도 아닌 자체 세션으로
+        async with read_session() as session:
+            return await dashboard_breaker.call(
+                lambda: repo.fetch_data_watermark(session, settings.DASHBOARD_USE_ROLLUP)
+            )
+
+    async def current_watermark(self) -> Optional[tuple]:
+        """
+        워터마크 조회도 watermark_ttl_seconds 동안은 메모리 값을 재사용해서
+        캐시 히트 시 DB 왕복이 생기지 않게 한다.
+        DB가 응답하지 않으면 마지막으로 알던 값을 그대로 쓴다.
+        """
+        now = time.monotonic()
+        if self._watermark is None or now - self._watermark_checked_at >= self.watermark_ttl_seconds:
+            try:
+                self._watermark = await self.singleflight.do("__watermark__", self._fetch_watermark)
+            except Exception:
+                logger.warning("dashboard watermark lookup failed, using last known value")
+            self._watermark_checked_at = now
+        return self._watermark
+
+    def invalidate(self) -> None:
+        """적재(ingestion) 직후 호출: 다음 조회에서 워터마크를 바로 다시 읽는다."""
+        self._watermark = None
+
+    async def clear(self) -> None:
+        self.invalidate()
+        await self.backend.clear()
+
+    # ---------- Load ----------
+    async def _load(
+        self,
+        tenant: str,
+        key: str,
+        func,
+        args,
+        kwargs,
+        watermark: Optional[tuple],
+        db: Optional[AsyncSession] = None,
+    ):
+        """
+        서킷 브레이커를 거쳐 실제 조회 후 캐시에 저장. 같은 키는 한 번만 실행.
+        여러 요청이 같이 기다리는 조회는 먼저 온 요청이 취소되거나 끝나서 그 세션이 닫혀도
+        계속 돌아야 하므로 자체 세션으로 실행한다. 요청 세션(db)은 혼자 조회할 때만 쓴다.
+        """
+        async def load(session: AsyncSession):
+            value = await dashboard_breaker.call(lambda: func(session, *args, **kwargs))
+            if settings.DASHBOARD_CACHE_ENABLED:
+                await self.backend.set(tenant, key, CacheEntry(value, watermark, time.time()))
+            return value
+
+        async def load_in_own_session():
+            async with read_session() as session:
+                return await load(session)
+
+        if settings.DASHBOARD_SINGLEFLIGHT_ENABLED:
+            # 같은 키로 실행 중인 조회가 있으면 그 결과를 같이 받는다
+            return await self.singleflight.do(f"{tenant}|{key}", load_in_own_session)
+        if db is None:
+            return await load_in_own_session()
+        return await load(db)
+
+    def _refresh_in_background(self, tenant: str, key: str, func, args, kwargs, watermark) -> None:
+        """
+        요청 세션은 곧 닫히므로 백그라운드 갱신은 자체 세션으로 실행.
+        같은 키의 갱신이 이미 돌고 있으면 새로 걸지 않는다. (stale 히트가 몰려도 DB 조회는 한 번)
+        """
+        refresh_key = f"{tenant}|{key}"
+        if refresh_key in self._refresh_tasks:
+            return
+
+        async def run():
+            try:
+                await self._load(tenant, key, func, args, kwargs, watermark)
+            except Exception:
+                logger.warning("background refresh failed for %s", key)
+
+        self.background_refreshes += 1
+        task = asyncio.create_task(run())
+        self._refresh_tasks[refresh_key] = task
+        task.add_done_callback(lambda t: self._refresh_tasks.pop(refresh_key, None))
+
+    # ---------- Decorator ----------
+    def cached(self, func):
+        """
+        첫 번째 인자가 db(AsyncSession)인 서비스 함수용 데코레이터.
+        db를 제외한 나머지 인자(기본값 포함)로 캐시 키를 만들고,
+        site_ids 인자가 있으면 그 테넌트 파티션에 저장한다.
+
+        - fresh 값이 있으면 바로 반환 (X-Cache: HIT)
+        - 만료됐거나 워터마크가 바뀐 값은 stale로 먼저 내주고 백그라운드에서 한 번만 갱신
+        - DB 조회가 실패하면(브레이커 open, 타임아웃 등) 남아있는 값을 stale로 반환
+        """
+        signature = inspect.signature(func)
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(db: AsyncSession, *args, **kwargs):
+            bound = signature.bind(db, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            params.pop("db", None)
+            # KPI처럼 오늘 날짜 기준으로 구간을 잡는 함수가 있어서 날짜도 키에 포함
+            params["_today"] = date.today()
+            tenant = tenant_of(params)
+            key = make_key(name, params)
+
+            entry = None
+            watermark = None
+            if settings.DASHBOARD_CACHE_ENABLED:
+                watermark = await self.current_watermark()
+                entry = await self.backend.get(tenant, key)
+
+                if entry is not None:
+                    age = time.time() - entry.stored_at
+                    if entry.watermark == watermark and age < self.ttl_seconds:
+                        self.hits += 1
+                        _mark("hit", age)
+                        return entry.value
+
+                    if entry.watermark != watermark:
+                        self.invalidated += 1
+                    else:
+                        self.expired += 1
+
+                    if settings.DASHBOARD_CACHE_SWR_ENABLED and age < self.stale_ttl_seconds:
+                        self.stale_served += 1
+                        _mark("stale", age)
+                        self._refresh_in_background(tenant, key, func, args, kwargs, watermark)
+                        return entry.value
+
+                self.misses += 1
+
+            try:
+                value = await self._load(tenant, key, func, args, kwargs, watermark, db)
+            except HTTPException:
+                raise
+            except Exception as e:
+                if entry is not None:
+                    # DB 장애 중: 마지막 정상 결과라도 내준다
+                    self.stale_served += 1
+                    _mark("stale", time.time() - entry.stored_at)
+                    return entry.value
+                if isinstance(e, (CircuitOpenError, asyncio.TimeoutError)):
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="Dashboard data temporarily unavailable",
+                    )
+                raise
+
+            _mark("miss")
+            return value
+
+        return wrapper
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.DASHBOARD_CACHE_ENABLED,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "expired": self.expired,
+            "invalidated": self.invalidated,
+            "stale_served": self.stale_served,
+            "background_refreshes": self.background_refreshes,
+            "refreshing": len(self._refresh_tasks),
+            "ttl_seconds": self.ttl_seconds,
+            "stale_ttl_seconds": self.stale_ttl_seconds,
+            "watermark": self._watermark,
+            "singleflight": self.singleflight.stats(),
+            "circuit_breaker": dashboard_breaker.stats(),
+            **self.backend.stats(),
+        }
+
+
+dashboard_cache = DashboardCache(
+    backend=build_backend(settings.DASHBOARD_CACHE_BACKEND),
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    stale_ttl_seconds=settings.DASHBOARD_CACHE_STALE_TTL_SECONDS,
+    watermark_ttl_seconds=settings.DASHBOARD_CACHE_WATERMARK_TTL_SECONDS,
+)
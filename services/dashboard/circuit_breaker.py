@@ -0,0 +1,121 @@
+# services/dashboard/circuit_breaker.py : DB 장애 시 대시보드 조회를 빠르게 실패시키는 서킷 브레이커
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException
+
+from config.settings import settings
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어서 DB를 호출하지 않고 바로 실패"""
+
+
+class CircuitBreaker:
+    """
+    closed    : 정상. 연속 실패(에러/타임아웃/느린 호출)가 임계치를 넘으면 open
+    open      : open_seconds 동안 DB를 호출하지 않고 CircuitOpenError
+    half_open : 시험 호출 1건만 통과시켜서 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        slow_call_seconds: float,
+        open_seconds: float,
+        timeout_seconds: float,
+    ):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.timeout_seconds = timeout_seconds
+
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.open_seconds:
+            self.state = "half_open"
+            self._trial_in_flight = False
+
+        if self.state == "open":
+            return False
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def _on_success(self) -> None:
+        self.consecutive_failures = 0
+        self.state = "closed"
+        self._trial_in_flight = False
+
+    def _on_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    async def call(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        if not self._allow():
+            self.rejected += 1
+            raise CircuitOpenError("dashboard circuit is open")
+
+        self.calls += 1
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(factory(), self.timeout_seconds)
+        except HTTPException:
+            # 요청 자체의 문제(4xx 등)는 DB 상태와 무관
+            self._on_success()
+            raise
+        except Exception:
+            self._on_failure()
+            raise
+        except BaseException:
+            # 호출한 쪽이 취소된 경우: 판정 없이 시험 호출 자리만 돌려놓는다
+            self._trial_in_flight = False
+            raise
+
+        if time.monotonic() - started >= self.slow_call_seconds:
+            self.slow_calls += 1
+            self._on_failure()
+        else:
+            self._on_success()
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+
+dashboard_breaker = CircuitBreaker(
+    failure_threshold=settings.DASHBOARD_BREAKER_FAILURE_THRESHOLD,
+    slow_call_seconds=settings.DASHBOARD_BREAKER_SLOW_CALL_SECONDS,
+    open_seconds=settings.DASHBOARD_BREAKER_OPEN_SECONDS,
+    timeout_seconds=settings.DASHBOARD_DB_TIMEOUT_SECONDS,
+)
@@ -2,10 +2,16 @@
 
 
 from datetime import date, timedelta
-from typing import Optional
+from typing import Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.settings import settings
 from repositories.dashboard import dashboard_repository as repo
+from repositories.dashboard import rollup_repository
+from repositories.dashboard import columnar_repository
+from repositories.dashboard import visit_repository as visit_repo
+from services.dashboard.cache import dashboard_cache
+from services.pagination import decode_cursor, paginate
 
 
 def range_from_days(days: int) -> tuple[date, date]:
@@ -14,62 +20,163 @@ def range_from_days(days: int) -> tuple[date, date]:
     return from_d, to_d
 
 
+def sql_sales_repo():
+    """매출 집계를 롤업에서 읽을지, 원본 테이블에서 읽을지 선택"""
+    return rollup_repository if settings.DASHBOARD_USE_ROLLUP else repo
+
+
+async def sales_version() -> Optional[int]:
+    """현재 매출 version (워터마크의 두 번째 값). 워터마크를 모르면 None."""
+    watermark = await dashboard_cache.current_watermark()
+    return watermark[1] if watermark is not None else None
+
+
+async def sales_repo(site_ids: Sequence[int]):
+    """
+    요청마다 집계 엔진 선택.
+    columnar 설정이고 현재 매출 version의 테넌트 store가 메모리에 준비돼 있으면 columnar, 아니면 SQL.
+    (store 적재는 백그라운드에서 진행되고 요청은 기다리지 않는다)
+    """
+    if settings.DASHBOARD_ENGINE == "columnar":
+        if columnar_repository.get_store(site_ids, await sales_version()) is not None:
+            return columnar_repository
+    return sql_sales_repo()
+
+
+def month_range(months: int) -> list[date]:
+    """이번 달을 포함한 최근 months개 달의 1일 목록 (오래된 달부터)"""
+    today = date.today()
+    index = today.year * 12 + today.month - 1
+    return [
+        date(i // 12, i % 12 + 1, 1)
+        for i in range(index - months + 1, index + 1)
+    ]
+
+
 # KPI Summary
-async def get_kpi_summary(db: AsyncSession, days: int):
+def _delta(current: int, previous: int) -> dict:
+    pct = round((current - previous) / previous * 100, 2) if previous else None
+    return {"abs": current - previous, "pct": pct}
+
+
+@dashboard_cache.cached
+async def get_kpi_summary(db: AsyncSession, site_ids: Sequence[int], days: int, compare: bool = True):
     from_d, to_d = range_from_days(days)
-    sales, items, visits = await repo.fetch_kpi_summary(db, from_d, to_d)
+    # 직전 기간: 현재 구간 바로 앞의 같은 길이 구간
+    prev_from_d = from_d - timedelta(days=days) if compare else None
+
+    source = await sales_repo(site_ids)
+    row = await source.fetch_kpi_summary(db, site_ids, from_d, to_d, prev_from_d)
 
-    return {
+    result = {
         "days": days,
-        "sales": int(sales or 0),
-        "items": int(items or 0),
-        "visits": int(visits or 0),
+        "sales": int(row["sales"] or 0),
+        "items": int(row["items"] or 0),
+        "visits": int(row["visits"] or 0),
     }
 
+    if compare:
+        previous = {
+            "from": prev_from_d,
+            "to": from_d - timedelta(days=1),
+            "sales": int(row["prev_sales"] or 0),
+            "items": int(row["prev_items"] or 0),
+            "visits": int(row["prev_visits"] or 0),
+        }
+        result["previous"] = previous
+        result["delta"] = {
+            "sales": _delta(result["sales"], previous["sales"]),
+            "items": _delta(result["items"], previous["items"]),
+            "visits": _delta(result["visits"], previous["visits"]),
+        }
+
+    return result
+
 
 # Monthly Sales
-async def get_monthly_sales(db: AsyncSession, months: int):
-    rows = await repo.fetch_monthly_sales(db, months)
-    return list(reversed([dict(r) for r in rows]))
+@dashboard_cache.cached
+async def get_monthly_sales(db: AsyncSession, site_ids: Sequence[int], months: int):
+    buckets = month_range(months)
+    source = await sales_repo(site_ids)
+    rows = await source.fetch_monthly_sales(db, site_ids, buckets[0], buckets[-1])
+    sales = {r["ym"]: int(r["sales"] or 0) for r in rows}
+
+    # 매출이 없는 달도 0으로 채워서 항상 months개를 돌려준다
+    return [
+        {"ym": ym, "sales": sales.get(ym, 0)}
+        for ym in (m.strftime("%Y-%m") for m in buckets)
+    ]
 
 
 # Top Products
+@dashboard_cache.cached
 async def get_top_products(
     db: AsyncSession,
+    site_ids: Sequence[int],
     limit: int,
     from_date: Optional[date],
     to_date: Optional[date],
     category_id: Optional[int],
+    cursor: Optional[str] = None,
 ):
-    rows = await repo.fetch_top_products(
-        db, limit, from_date, to_date, category_id
+    """next_cursor를 다음 요청의 cursor로 넘기면 이어지는 페이지 (같은 필터일 때만 유효)"""
+    scope = {
+        "view": "top-products",
+        "sites": list(site_ids),
+        "from": from_date,
+        "to": to_date,
+        "category": category_id,
+    }
+    after = decode_cursor(cursor, scope)
+
+    source = await sales_repo(site_ids)
+    # 하나 더 읽어서 다음 페이지가 있는지 판단
+    rows = await source.fetch_top_products(
+        db, site_ids, limit + 1, from_date, to_date, category_id, after
     )
-    return {"items": [dict(r) for r in rows], "count": len(rows)}
+    return paginate(rows, limit, lambda r: (int(r["total_sales"]), r["product_id"]), scope)
 
 
 # Device Share
-async def get_device_share(db: AsyncSession, metric: str):
-    rows = await repo.fetch_device_share(db, metric)
+@dashboard_cache.cached
+async def get_device_share(db: AsyncSession, site_ids: Sequence[int], metric: str):
+    source = await sales_repo(site_ids)
+    rows = await source.fetch_device_share(db, site_ids, metric)
     return [dict(r) for r in rows]
 
 
 # Orders By Category
-async def get_orders_by_category(db: AsyncSession, metric: str):
-    rows = await repo.fetch_orders_by_category(db, metric)
+@dashboard_cache.cached
+async def get_orders_by_category(db: AsyncSession, site_ids: Sequence[int], metric: str):
+    source = await sales_repo(site_ids)
+    rows = await source.fetch_orders_by_category(db, site_ids, metric)
     return [dict(r) for r in rows]
 
 
 # Funnel
+@dashboard_cache.cached
 async def get_funnel(
     db: AsyncSession,
+    site_ids: Sequence[int],
     from_date: Optional[date],
     to_date: Optional[date],
 ):
-    rows = await repo.fetch_funnel(db, from_date, to_date)
-    data = [{"step": r["step"], "count": int(r["count"])} for r in rows]
+    rows = await repo.fetch_funnel(db, site_ids, from_date, to_date)
+    visits = await visit_repo.fetch_visits(db, site_ids, from_date, to_date)
+
+    return [{"step": "visit", "count": int(visits)}] + [
+        {"step": r["step"], "count": int(r["count"])} for r in rows
+    ]
 
-    if not from_date and not to_date:
-        visits = await repo.fetch_visits(db)
-        data.insert(0, {"step": "visit", "count": int(visits)})
 
-    return data
+# Traffic Sources
+@dashboard_cache.cached
+async def get_traffic_sources(
+    db: AsyncSession,
+    site_ids: Sequence[int],
+    from_date: Optional[date],
+    to_date: Optional[date],
+    limit: int,
+):
+    rows = await visit_repo.fetch_top_sources(db, site_ids, from_date, to_date, limit)
+    return [{"source_type": r["source_type"], "visits": int(r["visits"])} for r in rows]
@@ -0,0 +1,103 @@
+# services/dashboard/export_service.py : 대시보드 테이블 전체를 CSV / NDJSON으로 스트리밍
+# 서버 사이드 커서(stream + yield_per)로 EXPORT_CHUNK_ROWS행씩 받아서 바로 인코딩해 보내므로
+# 내보내는 행 수와 상관없이 메모리는 청크 하나 크기로 유지된다.
+
+import csv
+import io
+import json
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import AsyncIterator, Awaitable, Callable, Optional, Sequence
+
+from config.settings import settings
+from database.session import read_session
+from services.dashboard.dashboard_service import sql_sales_repo
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+TOP_PRODUCTS_COLUMNS = (
+    "product_id",
+    "product_code",
+    "product_name",
+    "device",
+    "total_qty",
+    "total_sales",
+    "last_order_date",
+)
+
+
+def _plain(value):
+    # MySQL SUM은 Decimal로 온다
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows, columns: Sequence[str]) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerows([_plain(r[c]) for c in columns] for r in rows)
+    return buf.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(rows, columns: Sequence[str]) -> bytes:
+    return "".join(
+        json.dumps({c: _plain(r[c]) for c in columns}, ensure_ascii=False) + "\n"
+        for r in rows
+    ).encode("utf-8")
+
+
+async def _stream_query(
+    q,
+    columns: Sequence[str],
+    fmt: str,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[bytes]:
+    """
+    요청 세션과 별개로 자체 세션을 연다. (응답을 보내는 동안 요청 의존성은 이미 정리됨)
+    클라이언트가 끊으면 남은 행을 읽어 버리지 않고 연결을 invalidate 해서 서버 쪽 쿼리도 멈춘다.
+    """
+    encode = _encode_csv if fmt == "csv" else _encode_ndjson
+    if fmt == "csv":
+        # 엑셀에서 한글이 깨지지 않도록 BOM
+        yield ("\ufeff" + ",".join(columns) + "\n").encode("utf-8")
+
+    async with read_session() as db:
+        conn = await db.connection()
+        result = await conn.stream(q.execution_options(yield_per=settings.EXPORT_CHUNK_ROWS))
+        finished = False
+        exported = 0
+        try:
+            async for rows in result.mappings().partitions():
+                if await is_disconnected():
+                    logger.info("export cancelled by client after %s rows", exported)
+                    return
+                yield encode(rows, columns)
+                exported += len(rows)
+            finished = True
+        finally:
+            if finished:
+                await result.close()
+            else:
+                await conn.invalidate()
+
+
+def stream_top_products(
+    site_ids: Sequence[int],
+    fmt: str,
+    from_date: Optional[date],
+    to_date: Optional[date],
+    category_id: Optional[int],
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[bytes]:
+    """상위 상품 테이블 전체 (limit 없음, 화면과 같은 정렬). columnar 설정이어도 SQL 커서로 읽는다."""
+    q = sql_sales_repo().top_products_query(site_ids, from_date, to_date, category_id)
+    return _stream_query(q, TOP_PRODUCTS_COLUMNS, fmt, is_disconnected)
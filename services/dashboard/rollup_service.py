@@ -0,0 +1,71 @@
+# services/dashboard/rollup_service.py : 롤업 증분 갱신 (배치 단위 트랜잭션)
+
+import logging
+from typing import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from database.session import async_session
+from repositories.dashboard import data_version_repository as version_repo
+from repositories.dashboard import rollup_repository as rollup_repo
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_daily_sales(db: AsyncSession, batch_size: int | None = None) -> int:
+    """
+    워터마크 이후의 order_products를 배치 단위로 일별/월별/상품별 롤업에 반영.
+    배치마다 (롤업 upsert + 워터마크 이동)을 한 트랜잭션으로 커밋하므로
+    중간에 실패해도 같은 행이 두 번 더해지지 않는다.
+    아직 커밋 중일 수 있는 최근 id는 ROLLUP_SETTLE_SECONDS가 지난 다음 갱신에서 반영한다.
+    반영한 마지막 order_product_id를 반환.
+    """
+    batch_size = batch_size or settings.ROLLUP_REFRESH_BATCH_SIZE
+
+    last_id = await rollup_repo.lock_watermark(db, rollup_repo.DAILY_SALES)
+    limit_id = await rollup_repo.advance_settle_mark(
+        db, rollup_repo.DAILY_SALES, settings.ROLLUP_SETTLE_SECONDS
+    )
+    await db.commit()
+    if limit_id is None:
+        return last_id
+
+    while True:
+        last_id = await rollup_repo.lock_watermark(db, rollup_repo.DAILY_SALES)
+        upper_id = await rollup_repo.fetch_batch_upper_bound(db, last_id, batch_size, limit_id)
+
+        if upper_id is None:
+            await db.commit()
+            return last_id
+
+        await rollup_repo.upsert_daily_sales(db, last_id, upper_id)
+        await rollup_repo.upsert_monthly_sales(db, last_id, upper_id)
+        await rollup_repo.upsert_product_sales(db, last_id, upper_id)
+        await rollup_repo.set_watermark(db, rollup_repo.DAILY_SALES, upper_id)
+        await db.commit()
+        logger.info("daily_sales rollup advanced %s -> %s", last_id, upper_id)
+
+
+async def rebuild_sites(db: AsyncSession, site_ids: Sequence[int]) -> int:
+    """
+    사이트 단위 재구축: 워터마크까지의 order_products로 그 사이트의 롤업을 다시 만든다.
+    과거 id로 적재했거나 행이 수정/삭제된 경우처럼 증분 갱신으로 잡히지 않는 변경이 있을 때 사용.
+    지우기/다시 채우기/매출 version 올리기를 한 트랜잭션으로 커밋하므로
+    다른 테넌트는 영향이 없고, 이 사이트도 조회 중에 0이 보이지 않는다.
+    """
+    last_id = await rollup_repo.lock_watermark(db, rollup_repo.DAILY_SALES)
+    await rollup_repo.clear_sites(db, site_ids)
+    await rollup_repo.upsert_daily_sales(db, 0, last_id, site_ids)
+    await rollup_repo.upsert_monthly_sales(db, 0, last_id, site_ids)
+    await rollup_repo.upsert_product_sales(db, 0, last_id, site_ids)
+    await version_repo.bump_version(db, version_repo.SALES)
+    await db.commit()
+    logger.info("sales rollups rebuilt for sites %s up to %s", tuple(site_ids), last_id)
+    return last_id
+
+
+async def refresh_rollups() -> None:
+    """스케줄러용: 자체 세션을 열어서 갱신"""
+    async with async_session() as db:
+        await refresh_daily_sales(db)
@@ -0,0 +1,45 @@
+# services/dashboard/singleflight.py : 같은 키로 동시에 들어온 호출을 하나의 실행으로 합치기
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """
+    먼저 들어온 호출(leader)만 실제로 실행하고,
+    실행 중에 같은 키로 들어온 호출(follower)은 그 결과나 예외를 그대로 받는다.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.deduplicated = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.deduplicated += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+
+        # 호출한 쪽 하나가 취소돼도 공유 작업은 끝까지 진행되도록 shield
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 아무도 기다리지 않을 때 "exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        calls = self.leaders + self.deduplicated
+        return {
+            "inflight": len(self._inflight),
+            "executed": self.leaders,
+            "deduplicated": self.deduplicated,
+            "dedup_rate": round(self.deduplicated / calls, 4) if calls else None,
+        }
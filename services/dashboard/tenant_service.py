@@ -0,0 +1,39 @@
+# services/dashboard/tenant_service.py : 로그인한 customer -> 대시보드 조회 범위(site_id 목록)
+
+import time
+from collections import OrderedDict
+
+from config.settings import settings
+from database.session import async_session
+from repositories.dashboard import dashboard_repository as repo
+
+
+# customer_id -> (site_ids, 조회 시각). 사이트 구성은 거의 안 바뀌어서 짧게 캐시
+_site_ids_cache: OrderedDict[int, tuple[tuple[int, ...], float]] = OrderedDict()
+
+
+async def get_site_ids(customer_id: int) -> tuple[int, ...]:
+    """
+    조회 범위는 primary에서 읽는다. replica가 가입/사이트 추가를 아직 못 받았으면
+    빈 범위가 캐시 TTL 동안 남기 때문. 빈 결과는 캐시하지 않는다.
+    """
+    now = time.monotonic()
+    cached = _site_ids_cache.get(customer_id)
+    if cached is not None and now - cached[1] < settings.TENANT_SITE_CACHE_TTL_SECONDS:
+        _site_ids_cache.move_to_end(customer_id)
+        return cached[0]
+
+    async with async_session() as db:
+        site_ids = tuple(await repo.fetch_customer_site_ids(db, customer_id))
+    if not site_ids:
+        return site_ids
+    _site_ids_cache[customer_id] = (site_ids, now)
+    _site_ids_cache.move_to_end(customer_id)
+    while len(_site_ids_cache) > settings.TENANT_SITE_CACHE_MAX_CUSTOMERS:
+        _site_ids_cache.popitem(last=False)
+    return site_ids
+
+
+def forget_customer(customer_id: int) -> None:
+    """사이트가 추가/삭제됐을 때 다음 조회에서 바로 반영되도록"""
+    _site_ids_cache.pop(customer_id, None)
@@ -0,0 +1,267 @@
+# services/imports/import_service.py : orders / order_products 대량 적재
+# 스트림을 한 줄씩 검증 -> IMPORT_CHUNK_ROWS개씩 multi-row INSERT + commit (청크 단위 트랜잭션)
+# 거부된 행은 사유와 함께 IMPORT_REJECTS_DIR/{import_id}.ndjson에 남긴다.
+
+import json
+import logging
+import os
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import AsyncIterator, Awaitable, Callable, Optional, Sequence, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from database.session import async_session
+from repositories.dashboard import data_version_repository as version_repo
+from repositories.dashboard.dashboard_repository import fetch_data_watermark
+from repositories.imports import import_repository as import_repo
+from schemas.imports.import_schema import OrderProductRow, OrderRow
+from services.dashboard.cache import dashboard_cache
+from services.dashboard.rollup_service import rebuild_sites, refresh_daily_sales
+from services.imports.parsers import iter_lines, iter_records
+
+logger = logging.getLogger(__name__)
+
+
+class ImportAborted(Exception):
+    """거부 행이 IMPORT_MAX_REJECTED_ROWS를 넘음"""
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    schema: Type[BaseModel]
+    pk: str
+    insert: Callable[[AsyncSession, list[dict]], Awaitable[None]]
+
+
+TABLES = {
+    "orders": TableSpec(OrderRow, "order_id", import_repo.insert_orders),
+    "order_products": TableSpec(OrderProductRow, "order_product_id", import_repo.insert_order_products),
+}
+
+
+@dataclass
+class ImportReport:
+    import_id: str
+    table: str
+    format: str
+    site_ids: tuple[int, ...]
+    status: str = "running"          # running / done / aborted / failed
+    rows_read: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    chunks: int = 0
+    rows_per_s: float = 0
+    error: Optional[str] = None
+    rejects_file: Optional[str] = None
+    min_explicit_id: Optional[int] = None   # 직접 지정한 PK 중 최소값 (롤업 재구축 판단용)
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("min_explicit_id")
+        return data
+
+
+# 진행 상황 조회용 (프로세스 메모리, 최근 것만)
+_reports: dict[str, ImportReport] = {}
+MAX_REPORTS = 100
+
+
+def get_report(import_id: str) -> Optional[ImportReport]:
+    return _reports.get(import_id)
+
+
+def _register(report: ImportReport) -> None:
+    _reports[report.import_id] = report
+    while len(_reports) > MAX_REPORTS:
+        _reports.pop(next(iter(_reports)))
+
+
+class _RejectWriter:
+    """처음 거부가 생길 때 파일을 연다. 한 줄에 {line, reason, record}"""
+
+    def __init__(self, report: ImportReport):
+        self.report = report
+        self._file = None
+
+    def write(self, line_no: int, record, reason) -> None:
+        if self._file is None:
+            os.makedirs(settings.IMPORT_REJECTS_DIR, exist_ok=True)
+            path = os.path.join(settings.IMPORT_REJECTS_DIR, f"{self.report.import_id}.ndjson")
+            self._file = open(path, "w", encoding="utf-8")
+            self.report.rejects_file = path
+        self._file.write(json.dumps(
+            {"line": line_no, "reason": reason, "record": record},
+            ensure_ascii=False,
+            default=str,
+        ) + "\n")
+
+        self.report.rejected += 1
+        if self.report.rejected > settings.IMPORT_MAX_REJECTED_ROWS:
+            raise ImportAborted(f"more than {settings.IMPORT_MAX_REJECTED_ROWS} rejected rows")
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+def _validation_reason(e: ValidationError) -> list[dict]:
+    return [
+        {"loc": ".".join(str(p) for p in err["loc"]), "msg": err["msg"]}
+        for err in e.errors(include_url=False)
+    ]
+
+
+async def _owned_rows(db: AsyncSession, table: str, site_ids: Sequence[int], batch, rejects: _RejectWriter):
+    """다른 테넌트의 사용자/상품/주문을 가리키는 행은 거부"""
+    if table == "orders":
+        users = await import_repo.fetch_tenant_user_ids(db, site_ids, (r["user_id"] for _, r in batch))
+        checks = (("user_id", users),)
+    else:
+        products = await import_repo.fetch_tenant_product_ids(db, site_ids, (r["product_id"] for _, r in batch))
+        orders = await import_repo.fetch_tenant_order_ids(db, site_ids, (r["order_id"] for _, r in batch))
+        checks = (("product_id", products), ("order_id", orders))
+
+    owned = []
+    for line_no, row in batch:
+        missing = [col for col, ids in checks if row[col] not in ids]
+        if missing:
+            rejects.write(line_no, row, [{"loc": col, "msg": "not found for this customer"} for col in missing])
+        else:
+            owned.append((line_no, row))
+    return owned
+
+
+async def _write_chunk(
+    db: AsyncSession,
+    report: ImportReport,
+    spec: TableSpec,
+    batch: list[tuple[int, dict]],
+    rejects: _RejectWriter,
+) -> None:
+    rows = await _owned_rows(db, report.table, report.site_ids, batch, rejects)
+    if rows:
+        try:
+            await spec.insert(db, [r for _, r in rows])
+            await db.commit()
+            inserted = rows
+        except IntegrityError:
+            # 중복 PK 등: 청크를 되돌리고 savepoint로 한 행씩 넣어서 문제 행만 거부
+            await db.rollback()
+            inserted = []
+            for line_no, row in rows:
+                try:
+                    async with db.begin_nested():
+                        await spec.insert(db, [row])
+                    inserted.append((line_no, row))
+                except IntegrityError as e:
+                    rejects.write(line_no, row, [{"loc": spec.pk, "msg": str(e.orig)}])
+            await db.commit()
+
+        report.inserted += len(inserted)
+        explicit = [r[spec.pk] for _, r in inserted if r[spec.pk] is not None]
+        if explicit:
+            low = min(explicit)
+            report.min_explicit_id = low if report.min_explicit_id is None else min(report.min_explicit_id, low)
+
+    report.chunks += 1
+    elapsed = (datetime.now(timezone.utc) - report.started_at).total_seconds()
+    report.rows_per_s = round(report.rows_read / elapsed) if elapsed else 0
+
+
+async def run_import(
+    site_ids: Sequence[int],
+    table: str,
+    fmt: str,
+    chunks: AsyncIterator[bytes],
+    import_id: Optional[str] = None,
+) -> ImportReport:
+    """
+    바이트 스트림을 적재하고 리포트를 반환.
+    이미 commit한 청크는 중간에 실패해도 남는다. (다시 돌릴 땐 거부 파일의 행만 고쳐서 넣으면 됨)
+    """
+    spec = TABLES[table]
+    report = ImportReport(
+        import_id=import_id or uuid.uuid4().hex,
+        table=table,
+        format=fmt,
+        site_ids=tuple(site_ids),
+    )
+    _register(report)
+    rejects = _RejectWriter(report)
+    started = perf_counter()
+
+    try:
+        async with async_session() as db:
+            batch: list[tuple[int, dict]] = []
+            async for line_no, record, error in iter_records(iter_lines(chunks), fmt):
+                report.rows_read += 1
+                if error:
+                    rejects.write(line_no, record, error)
+                    continue
+                try:
+                    row = spec.schema.model_validate(record).model_dump()
+                except ValidationError as e:
+                    rejects.write(line_no, record, _validation_reason(e))
+                    continue
+
+                batch.append((line_no, row))
+                if len(batch) >= settings.IMPORT_CHUNK_ROWS:
+                    await _write_chunk(db, report, spec, batch, rejects)
+                    batch = []
+
+            if batch:
+                await _write_chunk(db, report, spec, batch, rejects)
+        report.status = "done"
+    except ImportAborted as e:
+        report.status = "aborted"
+        report.error = str(e)
+    except Exception as e:
+        report.status = "failed"
+        report.error = str(e)
+        logger.exception("import %s failed", report.import_id)
+    finally:
+        rejects.close()
+        report.finished_at = datetime.now(timezone.utc)
+
+    logger.info(
+        "import %s %s: read=%s inserted=%s rejected=%s in %.1fs",
+        report.import_id, report.status, report.rows_read, report.inserted, report.rejected,
+        perf_counter() - started,
+    )
+    return report
+
+
+async def after_import(report: ImportReport) -> None:
+    """
+    적재 후처리: 롤업 반영 -> 매출 version 올리기.
+    PK를 직접 지정해서 워터마크보다 앞에 들어간 행은 증분 갱신으로 잡히지 않으므로 그 사이트만 재구축한다.
+    과거 id 행은 워터마크(max id)를 바꾸지 못하므로 DB의 매출 version을 올려서
+    모든 워커의 대시보드 캐시 키와 columnar store가 바뀌게 한다. (이 프로세스 메모리만 비우면 다른 워커는 모름)
+    """
+    if report.inserted == 0:
+        return
+
+    if report.table == "order_products":
+        async with async_session() as db:
+            rebuilt = False
+            if settings.DASHBOARD_USE_ROLLUP:
+                watermark = (await fetch_data_watermark(db, True))[0]
+                if report.min_explicit_id is not None and report.min_explicit_id <= watermark:
+                    logger.info("import %s backfilled below rollup watermark, rebuilding sites %s", report.import_id, report.site_ids)
+                    await rebuild_sites(db, report.site_ids)  # 매출 version도 같은 트랜잭션에서 올린다
+                    rebuilt = True
+                else:
+                    await refresh_daily_sales(db)
+            if report.min_explicit_id is not None and not rebuilt:
+                await version_repo.bump_version(db, version_repo.SALES)
+                await db.commit()
+
+    dashboard_cache.invalidate()
@@ -0,0 +1,67 @@
+# services/imports/parsers.py : 바이트 청크 -> 줄 -> 레코드 (파일 전체를 메모리에 올리지 않음)
+# CSV는 한 행이 한 줄이라고 가정 (따옴표 안 줄바꿈은 지원하지 않음)
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Iterable, Optional, Union
+
+FORMATS = ("ndjson", "csv")
+
+# (줄 번호, 레코드 또는 원문, 에러)
+Record = tuple[int, Union[dict, str], Optional[str]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.rstrip("\r")
+
+
+async def iter_records(lines: AsyncIterator[str], fmt: str) -> AsyncIterator[Record]:
+    header: Optional[list[str]] = None
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+
+        if fmt == "ndjson":
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, line, f"invalid json: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, line, "each line must be a JSON object"
+                continue
+            yield line_no, record, None
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        if len(values) != len(header):
+            yield line_no, line, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        # 빈 칸은 NULL
+        yield line_no, {k: (v if v != "" else None) for k, v in zip(header, values)}, None
+
+
+async def read_file_chunks(path: str, size: int = 1 << 20) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+async def iter_bytes(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
@@ -0,0 +1,192 @@
+# services/monitoring/metrics.py : Prometheus 텍스트 포맷 지표 (외부 라이브러리 없이)
+# 라벨은 method / route 템플릿 / status 정도로만 두어서 시계열 수가 라우트 수에 비례하게 유지한다.
+
+import contextvars
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+# 요청 밖(스케줄러, 버퍼 flush 등)에서 실행된 쿼리의 route 라벨
+BACKGROUND_ROUTE = "<background>"
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass
+class RequestStats:
+    """요청 하나 동안 SQLAlchemy 이벤트 훅이 채우는 값"""
+    scope: dict
+    statements: int = 0
+    db_seconds: float = 0.0
+
+    @property
+    def route(self) -> str:
+        # 실제 경로가 아니라 템플릿(/api/v1/imports/{import_id})을 라벨로 써야 시계열 수가 늘지 않는다
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+    @property
+    def tags(self) -> list[str]:
+        return list(getattr(self.scope.get("route"), "tags", None) or ())
+
+
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [버킷별 개수..., +Inf 개수], 합계
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(self._sums[labels])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+# ---------- 요청 / DB 지표 ----------
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests", ("method", "route", "status"),
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"),
+)
+http_request_db_statements = Histogram(
+    "http_request_db_statements", "SQL statements executed per request", ("route",), COUNT_BUCKETS,
+)
+http_request_db_seconds = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request", ("route",),
+)
+db_pool_checkout_seconds = Histogram(
+    "db_pool_checkout_seconds", "Time waiting for a pooled connection", ("route",),
+)
+db_statements_total = Counter(
+    "db_statements_total", "SQL statements executed", ("route",),
+)
+
+_METRICS = (
+    http_requests_total,
+    http_request_duration_seconds,
+    http_request_db_statements,
+    http_request_db_seconds,
+    db_pool_checkout_seconds,
+    db_statements_total,
+)
+
+
+def observe_request(method: str, status: int, seconds: float, stats: RequestStats) -> None:
+    route = stats.route
+    http_requests_total.inc((method, route, str(status)))
+    http_request_duration_seconds.observe((method, route), seconds)
+    http_request_db_statements.observe((route,), stats.statements)
+    http_request_db_seconds.observe((route,), stats.db_seconds)
+
+
+def route_label() -> str:
+    stats = current_request.get()
+    return BACKGROUND_ROUTE if stats is None else stats.route
+
+
+# ---------- 컴포넌트 stats() -> gauge ----------
+# name -> stats dict를 돌려주는 함수. 숫자는 app_{name}_{key} gauge, 문자열은 {value="..."} 1
+_collectors: dict[str, Callable[[], dict]] = {}
+
+
+def register_collector(name: str, collect: Callable[[], dict]) -> None:
+    _collectors[name] = collect
+
+
+def _flatten(prefix: str, stats: dict):
+    for key, value in stats.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict):
+            yield from _flatten(name, value)
+        elif isinstance(value, bool):
+            yield name, None, int(value)
+        elif isinstance(value, (int, float)):
+            yield name, None, value
+        elif isinstance(value, str):
+            yield name, value, 1
+
+
+def _render_collectors() -> list[str]:
+    lines = []
+    for name, collect in _collectors.items():
+        try:
+            stats = collect()
+        except Exception:
+            continue
+        for metric, label, value in _flatten(f"app_{name}", stats):
+            lines.append(f"# TYPE {metric} gauge")
+            labels = f'{{value="{_escape(label)}"}}' if label is not None else ""
+            lines.append(f"{metric}{labels} {_number(value)}")
+    return lines
+
+
+def render() -> str:
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    lines.extend(_render_collectors())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,32 @@
+# services/monitoring/middleware.py : 요청별 지연/SQL 지표 수집 (순수 ASGI라 스트리밍 응답도 끝까지 잰다)
+
+from time import perf_counter
+
+from services.monitoring.metrics import RequestStats, current_request, observe_request
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+        started = perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            observe_request(scope["method"], status_code, perf_counter() - started, stats)
+            current_request.reset(token)
@@ -0,0 +1,51 @@
+# services/pagination.py : 키셋(커서) 페이지네이션 공통
+# 커서는 마지막 행의 정렬 키를 담은 불투명 토큰. OFFSET 없이 "이 키 다음부터"로 읽으므로
+# 몇 번째 페이지든 첫 페이지와 비용이 같다.
+# 필터(scope)까지 서명에 넣어서 다른 조건의 요청에 커서를 재사용하면 400.
+
+import base64
+import hashlib
+import hmac
+import json
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+from config.settings import settings
+
+_SIG_BYTES = 12
+
+
+def _sign(payload: bytes, scope: dict) -> bytes:
+    message = payload + b"|" + json.dumps(scope, sort_keys=True, default=str).encode()
+    return hmac.new(settings.JWT_SECRET_KEY.encode(), message, hashlib.sha256).digest()[:_SIG_BYTES]
+
+
+def encode_cursor(key: Sequence[Any], scope: dict) -> str:
+    payload = json.dumps(list(key), separators=(",", ":"), default=str).encode()
+    token = _sign(payload, scope) + payload
+    return base64.urlsafe_b64encode(token).rstrip(b"=").decode()
+
+
+def decode_cursor(token: Optional[str], scope: dict) -> Optional[tuple]:
+    """None이면 첫 페이지. 위조됐거나 scope가 다르면 400."""
+    if token is None:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        sig, payload = raw[:_SIG_BYTES], raw[_SIG_BYTES:]
+        if not hmac.compare_digest(sig, _sign(payload, scope)):
+            raise ValueError("bad signature")
+        return tuple(json.loads(payload))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def paginate(rows: Sequence, limit: int, key_of, scope: dict) -> dict:
+    """limit + 1개를 읽은 결과를 받아서 한 페이지와 다음 커서로 나눈다."""
+    items = [dict(r) for r in rows[:limit]]
+    next_cursor = encode_cursor(key_of(items[-1]), scope) if len(rows) > limit else None
+    return {"items": items, "count": len(items), "next_cursor": next_cursor}
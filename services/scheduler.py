@@ -0,0 +1,47 @@
+# services/scheduler.py : 앱 수명 동안 주기적으로 도는 백그라운드 작업 관리
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+_tasks: dict[str, asyncio.Task] = {}
+
+
+async def _run_periodic(
+    name: str,
+    interval_seconds: float,
+    job: Callable[[], Awaitable[object]],
+) -> None:
+    while True:
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # 한 번 실패해도 다음 주기에 다시 시도
+            logger.exception("periodic job %s failed", name)
+        await asyncio.sleep(interval_seconds)
+
+
+def start_periodic(
+    name: str,
+    interval_seconds: float,
+    job: Callable[[], Awaitable[object]],
+) -> None:
+    """이름당 하나의 작업만 띄운다. (이미 돌고 있으면 무시)"""
+    task = _tasks.get(name)
+    if task is not None and not task.done():
+        return
+    _tasks[name] = asyncio.create_task(
+        _run_periodic(name, interval_seconds, job), name=name
+    )
+
+
+async def stop_periodic_tasks() -> None:
+    tasks = list(_tasks.values())
+    _tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,192 @@
+# services/tracking/event_buffer.py : 수집한 이벤트를 메모리에서 합쳐두었다가 multi-row upsert로 flush
+
+import asyncio
+import logging
+from datetime import date
+from time import perf_counter
+from typing import Awaitable, Callable, Iterable, Optional
+
+from config.settings import settings
+from database.session import async_session
+from repositories.dashboard import data_version_repository as version_repo
+from repositories.tracking import event_repository as event_repo
+
+logger = logging.getLogger(__name__)
+
+# (event_day, event_category, product_id, user_id, site_id). site_id는 수집 키로 인증한 사이트 (소유 확인용)
+EventKey = tuple[date, str, Optional[int], Optional[int], int]
+
+
+class EventBufferFull(Exception):
+    """대기 중인 키가 너무 많거나 종료 중이라 더 받을 수 없음 (→ 503)"""
+
+
+async def write_events(rows: list[dict]) -> int:
+    """
+    기본 writer: 자체 세션으로 upsert 하고 commit.
+    없거나 인증한 사이트 소유가 아닌 상품/사용자를 가리키는 행은 버리고, 버린 행 수를 반환.
+    upsert는 event_id를 늘리지 않아서 같은 트랜잭션에서 이벤트 version을 올려 대시보드 캐시를 무효화한다.
+    """
+    async with async_session() as db:
+        products, users = await event_repo.fetch_owner_sites(
+            db,
+            (r["product_id"] for r in rows if r["product_id"] is not None),
+            (r["user_id"] for r in rows if r["user_id"] is not None),
+        )
+        valid = [
+            {k: v for k, v in r.items() if k != "site_id"}
+            for r in rows
+            if (r["product_id"] is None or products.get(r["product_id"]) == r["site_id"])
+            and (r["user_id"] is None or users.get(r["user_id"]) == r["site_id"])
+        ]
+        if valid:
+            await event_repo.upsert_event_counts(db, valid)
+            await version_repo.bump_version(db, version_repo.EVENTS)
+            await db.commit()
+    return len(rows) - len(valid)
+
+
+def _sort_key(row: dict):
+    # 여러 워커가 동시에 flush 할 때 같은 순서로 잠그도록 유니크 키 순서로 정렬 (데드락 방지)
+    return (row["event_day"], row["event_category"], row["product_id"] or 0, row["user_id"] or 0)
+
+
+class EventBuffer:
+    """
+    같은 키의 이벤트는 count만 더해서 메모리에 모아둔다.
+    키가 flush_rows개 쌓이거나 flush_interval이 지나면 백그라운드 task가 flush.
+    쓰기에 실패하면 다음 flush에서 다시 시도하도록 되돌려 놓는다.
+    """
+
+    def __init__(
+        self,
+        flush_rows: int,
+        flush_interval: float,
+        max_pending: int,
+        writer: Callable[[list[dict]], Awaitable[int]] = write_events,
+    ):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.writer = writer
+
+        self._pending: dict[EventKey, int] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.accepted = 0
+        self.rejected = 0
+        self.flushed_rows = 0
+        self.flushed_events = 0
+        self.dropped_rows = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+
+    def add(self, events: Iterable[tuple[EventKey, int]]) -> int:
+        """이벤트를 버퍼에 더한다. 받은 이벤트 수를 반환. 꽉 찼으면 EventBufferFull."""
+        events = list(events)
+        if self._closing or len(self._pending) >= self.max_pending:
+            self.rejected += len(events)
+            raise EventBufferFull()
+
+        for key, count in events:
+            self._pending[key] = self._pending.get(key, 0) + count
+        self.accepted += len(events)
+
+        if len(self._pending) >= self.flush_rows:
+            self._wakeup.set()
+        return len(events)
+
+    def _requeue(self, rows: list[dict]) -> None:
+        for r in rows:
+            key = (r["event_day"], r["event_category"], r["product_id"], r["user_id"], r["site_id"])
+            self._pending[key] = self._pending.get(key, 0) + r["event_count"]
+
+    async def flush(self) -> int:
+        """지금까지 모인 키를 flush_rows개씩 upsert. 반영한 행 수를 반환."""
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, {}
+        rows = sorted(
+            (
+                {
+                    "event_day": day,
+                    "event_category": category,
+                    "product_id": product_id,
+                    "user_id": user_id,
+                    "event_count": count,
+                    "site_id": site_id,
+                }
+                for (day, category, product_id, user_id, site_id), count in batch.items()
+            ),
+            key=_sort_key,
+        )
+
+        started = perf_counter()
+        written = 0
+        for i in range(0, len(rows), self.flush_rows):
+            chunk = rows[i:i + self.flush_rows]
+            try:
+                dropped = await self.writer(chunk)
+            except Exception:
+                self.flush_failures += 1
+                logger.exception("event flush failed, requeueing %s rows", len(rows) - i)
+                self._requeue(rows[i:])
+                break
+            written += len(chunk) - dropped
+            self.dropped_rows += dropped
+            self.flushed_events += sum(r["event_count"] for r in chunk)
+
+        self.flushed_rows += written
+        self.last_flush_ms = round((perf_counter() - started) * 1000, 2)
+        return written
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.create_task(self._run(), name="event-buffer-flush")
+
+    async def stop(self, timeout: float) -> None:
+        """새 이벤트를 막고, 진행 중인 flush를 기다린 뒤 남은 이벤트까지 쓴다."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error("event buffer drain timed out")
+        if self._pending:
+            logger.error("event buffer stopped with %s unwritten rows", len(self._pending))
+
+    def stats(self) -> dict:
+        return {
+            "pending_rows": len(self._pending),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "flushed_rows": self.flushed_rows,
+            "flushed_events": self.flushed_events,
+            "dropped_rows": self.dropped_rows,
+            "flush_failures": self.flush_failures,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+event_buffer = EventBuffer(
+    flush_rows=settings.EVENT_BUFFER_FLUSH_ROWS,
+    flush_interval=settings.EVENT_BUFFER_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.EVENT_BUFFER_MAX_PENDING,
+)
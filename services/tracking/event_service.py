@@ -0,0 +1,26 @@
+# services/tracking/event_service.py : 수집 요청 -> 버퍼 키로 변환
+
+from datetime import date
+from typing import Sequence
+
+from fastapi import HTTPException, status
+
+from schemas.tracking.event_schema import EventIn
+from services.tracking.event_buffer import EventBufferFull, event_buffer
+
+
+def ingest_events(site_id: int, events: Sequence[EventIn]) -> int:
+    """site_id: 수집 키로 인증한 사이트. 상품/사용자가 이 사이트 소유인지는 flush 때 확인한다."""
+    today = date.today()
+    try:
+        return event_buffer.add(
+            ((e.event_day or today, e.event_category, e.product_id, e.user_id, site_id), e.count)
+            for e in events
+        )
+    except EventBufferFull:
+        # 태그 쪽에서 잠시 뒤 재전송하도록
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event buffer is full",
+            headers={"Retry-After": "1"},
+        )
@@ -0,0 +1,46 @@
+# services/tracking/ingest_key_service.py : 사이트별 이벤트 수집 키 (스토어프론트 태그가 X-Ingest-Key 헤더로 보냄)
+
+import secrets
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from database.session import async_session
+from repositories.tracking import event_repository as event_repo
+
+
+# 키 해시 -> (site_id 또는 None, 조회 시각). 수집 요청마다 DB를 보지 않도록 짧게 캐시
+_site_cache: OrderedDict[bytes, tuple[Optional[int], float]] = OrderedDict()
+
+
+async def resolve_site_id(key: str) -> Optional[int]:
+    """수집 키의 사이트. 없는 키면 None (없는 키도 캐시해서 잘못된 키가 반복돼도 DB를 두드리지 않는다)"""
+    key_hash = event_repo.hash_ingest_key(key)
+    now = time.monotonic()
+    cached = _site_cache.get(key_hash)
+    if cached is not None and now - cached[1] < settings.EVENT_INGEST_KEY_CACHE_TTL_SECONDS:
+        _site_cache.move_to_end(key_hash)
+        return cached[0]
+
+    async with async_session() as db:
+        site_id = await event_repo.fetch_site_id_by_ingest_key(db, key)
+    _site_cache[key_hash] = (site_id, now)
+    _site_cache.move_to_end(key_hash)
+    while len(_site_cache) > settings.EVENT_INGEST_KEY_CACHE_MAX:
+        _site_cache.popitem(last=False)
+    return site_id
+
+
+async def issue_ingest_key(db: AsyncSession, customer_id: int, site_id: int) -> Optional[str]:
+    """
+    새 수집 키를 만들어 저장하고 원문을 반환. 이전 키는 바로 무효 (다른 워커 캐시는 TTL까지 통과).
+    customer 소유 사이트가 아니면 None.
+    """
+    key = secrets.token_urlsafe(32)
+    if not await event_repo.set_ingest_key(db, customer_id, site_id, key):
+        return None
+    await db.commit()
+    return key
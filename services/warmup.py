@@ -0,0 +1,105 @@
+# services/warmup.py : 워커 시작 시 준비 작업 (첫 요청이 느려지지 않게)
+# - 대시보드 쿼리를 빈 테넌트로 한 번씩 실행 -> 엔진별 SQL 컴파일 캐시 채움
+# - 인증 스택(jose, bcrypt 백엔드, 해시 executor) 초기화
+# - 설정한 customer의 기본 대시보드를 미리 캐시에 올림
+
+import logging
+from time import perf_counter
+from typing import Sequence
+
+from config.settings import settings
+from database.session import async_session, engine, read_session, replica_router
+
+logger = logging.getLogger(__name__)
+
+# 존재하지 않는 사이트: 결과는 비어 있지만 SQL은 실제와 같은 형태로 컴파일된다
+WARMUP_SITE_IDS = (0,)
+
+# bcrypt 백엔드 로딩용 (rounds=4라 검증 비용이 거의 없음)
+WARMUP_PASSWORD_HASH = "$2b$04$LvhKeC4iP5QqHwsWN.pV7ucamU11uRvfUSsqb6pe4SIea6OVPOTDK"
+
+
+def _default_widgets():
+    """대시보드 첫 화면의 위젯들 (dashboard_router의 Query 기본값과 같은 인자)"""
+    from services.dashboard import dashboard_service as ds
+
+    return [
+        (ds.get_kpi_summary, (7, True)),
+        (ds.get_monthly_sales, (12,)),
+        (ds.get_top_products, (10, None, None, None)),
+        (ds.get_device_share, ("amount",)),
+        (ds.get_orders_by_category, ("amount",)),
+        (ds.get_funnel, (None, None)),
+        (ds.get_traffic_sources, (None, None, 10)),
+    ]
+
+
+async def warm_dashboard_statements() -> int:
+    """
+    캐시를 거치지 않고(__wrapped__) 위젯 쿼리를 실행. 컴파일 캐시는 엔진마다 따로라서
+    primary와 replica 모두 돌린다. 실행한 위젯 수를 반환.
+    """
+    from repositories.dashboard import columnar_repository
+
+    executed = 0
+    for target in [engine] + [r.engine for r in replica_router.replicas]:
+        async with async_session(bind=target) as db:
+            for func, args in _default_widgets():
+                await func.__wrapped__(db, WARMUP_SITE_IDS, *args)
+                executed += 1
+    # columnar 설정이면 빈 테넌트 store 적재가 걸리므로 치운다
+    columnar_repository.forget(WARMUP_SITE_IDS)
+    return executed
+
+
+async def warm_auth() -> None:
+    from services.auth.login_service import create_access_token, decode_token
+    from services.auth.password_service import password_hasher
+
+    decode_token(create_access_token("0"))
+    await password_hasher.verify("warmup", WARMUP_PASSWORD_HASH)
+
+
+async def prime_dashboard_caches(customer_ids: Sequence[int]) -> int:
+    """
+    customer별 기본 위젯을 캐시에 올린다. 올린 customer 수를 반환.
+    columnar 설정이면 그 테넌트 store도 먼저 올려둔다. (요청 중에는 백그라운드로만 적재되므로)
+    대시보드 요청과 같은 읽기 세션을 쓴다. (replica 상태 확인은 워밍업 전에 한 번 끝나 있음)
+    """
+    from repositories.dashboard import columnar_repository
+    from services.dashboard.dashboard_service import sales_version
+    from services.dashboard.tenant_service import get_site_ids
+
+    primed = 0
+    for customer_id in customer_ids:
+        site_ids = await get_site_ids(customer_id)
+        if not site_ids:
+            continue
+        async with read_session() as db:
+            if settings.DASHBOARD_ENGINE == "columnar":
+                await columnar_repository.refresh_store(db, site_ids, await sales_version())
+            for func, args in _default_widgets():
+                await func(db, site_ids, *args)
+        primed += 1
+    return primed
+
+
+async def run_warmup(groups: Sequence[str]) -> dict:
+    """켜진 라우터 그룹에 맞는 준비 작업을 실행하고 단계별 소요 시간(ms)을 반환. 실패해도 시작은 계속."""
+    steps = []
+    if "dashboard" in groups:
+        steps.append(("dashboard_statements", warm_dashboard_statements))
+        if settings.APP_WARMUP_PRIME_CUSTOMER_IDS:
+            steps.append(("dashboard_cache", lambda: prime_dashboard_caches(settings.APP_WARMUP_PRIME_CUSTOMER_IDS)))
+    if "auth" in groups and settings.APP_WARMUP_AUTH:
+        steps.append(("auth", warm_auth))
+
+    timings = {}
+    for name, step in steps:
+        started = perf_counter()
+        try:
+            await step()
+        except Exception:
+            logger.exception("warmup step %s failed", name)
+        timings[name] = round((perf_counter() - started) * 1000, 1)
+    return timings